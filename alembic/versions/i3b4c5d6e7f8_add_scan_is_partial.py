@@ -0,0 +1,37 @@
+"""add is_partial column to scans
+
+Revision ID: i3b4c5d6e7f8
+Revises: h2a3b4c5d6e7
+Create Date: 2026-10-16 10:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "i3b4c5d6e7f8"
+down_revision: Union[str, None] = "h2a3b4c5d6e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from sqlalchemy import inspect as sa_inspect
+    conn = op.get_bind()
+    inspector = sa_inspect(conn)
+
+    # Incremental scans only port-scan changed hosts
+    scans_cols = {c["name"] for c in inspector.get_columns("scans")}
+    if "is_partial" not in scans_cols:
+        op.add_column(
+            "scans",
+            sa.Column("is_partial", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_column("scans", "is_partial")
@@ -0,0 +1,43 @@
+"""add cert_fingerprint column to certificates
+
+Revision ID: j4c5d6e7f8a9
+Revises: i3b4c5d6e7f8
+Create Date: 2026-10-16 11:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "j4c5d6e7f8a9"
+down_revision: Union[str, None] = "i3b4c5d6e7f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from sqlalchemy import inspect as sa_inspect
+    conn = op.get_bind()
+    inspector = sa_inspect(conn)
+
+    # SHA-256 of the DER certificate, indexed for shared-cert lookups
+    cert_cols = {c["name"] for c in inspector.get_columns("certificates")}
+    if "cert_fingerprint" not in cert_cols:
+        op.add_column(
+            "certificates",
+            sa.Column("cert_fingerprint", sa.String(), nullable=True),
+        )
+        op.create_index(
+            "ix_certificates_cert_fingerprint",
+            "certificates",
+            ["cert_fingerprint"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_certificates_cert_fingerprint", table_name="certificates")
+    op.drop_column("certificates", "cert_fingerprint")
@@ -0,0 +1,43 @@
+"""add indexes for network summaries and agent listings
+
+Revision ID: k5d6e7f8a9b0
+Revises: j4c5d6e7f8a9
+Create Date: 2026-10-16 12:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "k5d6e7f8a9b0"
+down_revision: Union[str, None] = "j4c5d6e7f8a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from sqlalchemy import inspect as sa_inspect
+    conn = op.get_bind()
+    inspector = sa_inspect(conn)
+
+    # Per-network asset counts group by assets.network_id
+    asset_indexes = {i["name"] for i in inspector.get_indexes("assets")}
+    if "ix_assets_network_id" not in asset_indexes:
+        op.create_index("ix_assets_network_id", "assets", ["network_id"])
+
+    # Latest network per agent
+    network_indexes = {i["name"] for i in inspector.get_indexes("networks")}
+    if "ix_networks_agent_id_last_seen" not in network_indexes:
+        op.create_index(
+            "ix_networks_agent_id_last_seen",
+            "networks",
+            ["agent_id", "last_seen"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_networks_agent_id_last_seen", table_name="networks")
+    op.drop_index("ix_assets_network_id", table_name="assets")
@@ -0,0 +1,33 @@
+"""add (last_seen, id) index on assets for keyset pagination
+
+Revision ID: l6e7f8a9b0c1
+Revises: k5d6e7f8a9b0
+Create Date: 2026-10-16 13:00:00.000000
+"""
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "l6e7f8a9b0c1"
+down_revision: Union[str, None] = "k5d6e7f8a9b0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from sqlalchemy import inspect as sa_inspect
+    conn = op.get_bind()
+    inspector = sa_inspect(conn)
+
+    # /api/assets pages on (last_seen DESC, id DESC)
+    asset_indexes = {i["name"] for i in inspector.get_indexes("assets")}
+    if "ix_assets_last_seen_id" not in asset_indexes:
+        op.create_index("ix_assets_last_seen_id", "assets", ["last_seen", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_last_seen_id", table_name="assets")
@@ -0,0 +1,74 @@
+"""add ip_int / ip_v6 range-query columns to assets
+
+Revision ID: m7f8a9b0c1d2
+Revises: l6e7f8a9b0c1
+Create Date: 2026-10-16 14:00:00.000000
+"""
+from __future__ import annotations
+
+import ipaddress
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "m7f8a9b0c1d2"
+down_revision: Union[str, None] = "l6e7f8a9b0c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from sqlalchemy import inspect as sa_inspect
+    conn = op.get_bind()
+    inspector = sa_inspect(conn)
+
+    # Subnet filters become BETWEEN scans on these instead of per-row parsing
+    asset_cols = {c["name"] for c in inspector.get_columns("assets")}
+    if "ip_int" not in asset_cols:
+        op.add_column("assets", sa.Column("ip_int", sa.BigInteger(), nullable=True))
+        op.create_index("ix_assets_ip_int", "assets", ["ip_int"])
+    if "ip_v6" not in asset_cols:
+        op.add_column("assets", sa.Column("ip_v6", sa.LargeBinary(16), nullable=True))
+        op.create_index("ix_assets_ip_v6", "assets", ["ip_v6"])
+
+    # Backfill existing rows
+    assets = sa.table(
+        "assets",
+        sa.column("id", sa.String()),
+        sa.column("ip", sa.String()),
+        sa.column("ip_int", sa.BigInteger()),
+        sa.column("ip_v6", sa.LargeBinary()),
+    )
+    rows = conn.execute(
+        sa.select(assets.c.id, assets.c.ip).where(
+            assets.c.ip_int.is_(None), assets.c.ip_v6.is_(None)
+        )
+    ).all()
+    updates = []
+    for asset_id, ip in rows:
+        try:
+            addr = ipaddress.ip_address(ip or "")
+        except ValueError:
+            continue
+        updates.append({
+            "b_id": asset_id,
+            "ip_int": int(addr) if addr.version == 4 else None,
+            "ip_v6": addr.packed if addr.version == 6 else None,
+        })
+    if updates:
+        conn.execute(
+            assets.update()
+            .where(assets.c.id == sa.bindparam("b_id"))
+            .values(ip_int=sa.bindparam("ip_int"), ip_v6=sa.bindparam("ip_v6")),
+            updates,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_assets_ip_v6", table_name="assets")
+    op.drop_index("ix_assets_ip_int", table_name="assets")
+    op.drop_column("assets", "ip_v6")
+    op.drop_column("assets", "ip_int")
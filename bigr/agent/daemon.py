@@ -71,6 +71,8 @@ class AgentDaemon:
         self._running = False
         self._logger = self._setup_logger()
         self._queue = OfflineQueue(self._dir / "queue")
+        # Last known ports per target, for incremental rescans
+        self._port_baselines: dict[str, dict[str, dict]] = {}
         self._client = httpx.Client(
             timeout=60.0,
             headers={"Authorization": f"Bearer {self._token}"},
@@ -155,7 +157,11 @@ class AgentDaemon:
     _COMMAND_POLL_INTERVAL = 10  # Check for remote commands every 10s between cycles
 
     def _run_loop(self) -> None:
+        from bigr.scanner.mdns import start_mdns_listener, stop_mdns_listener
+
         cycle_count = 0
+        # Persistent mDNS listener: scans read its snapshot instantly
+        start_mdns_listener()
         try:
             while self._running:
                 self._run_single_cycle()
@@ -169,6 +175,7 @@ class AgentDaemon:
         except KeyboardInterrupt:
             self._logger.info("Keyboard interrupt.")
         finally:
+            stop_mdns_listener()
             self.stop()
 
     def _interruptible_sleep(self, total_seconds: int) -> None:
@@ -219,10 +226,12 @@ class AgentDaemon:
         for target in targets:
             self._logger.info("Scanning %s ...", target)
             try:
-                scan_result = self._scan_target(target)
+                baseline = self._port_baselines.setdefault(target, {})
+                scan_result = self._scan_target(target, baseline=baseline or None)
             except Exception as exc:
                 self._logger.error("Scan failed for %s: %s", target, exc)
                 continue
+            self._update_baseline(baseline, scan_result)
 
             # Inject network fingerprint before pushing
             if fingerprint:
@@ -267,13 +276,18 @@ class AgentDaemon:
     # Scanning (reuses existing bigr modules)
     # ------------------------------------------------------------------
 
-    @staticmethod
-    def _scan_target(target: str) -> dict:
-        """Run hybrid scan + classify on a target. Returns dict for ingest."""
+    def _scan_target(self, target: str, baseline: dict[str, dict] | None = None) -> dict:
+        """Run hybrid scan + classify on a target. Returns dict for ingest.
+
+        With a ``baseline`` only new or changed hosts (plus a rotating
+        share of stable ones) are port-scanned; the result is partial.
+        """
         from bigr.classifier.bigr_mapper import classify_assets
-        from bigr.scanner.hybrid import run_hybrid_scan
+        from bigr.scanner.hybrid import ScanProgressLogger, run_hybrid_scan
 
-        result = run_hybrid_scan(target)
+        result = run_hybrid_scan(
+            target, baseline=baseline, on_batch=ScanProgressLogger(target, self._logger),
+        )
         classify_assets(result.assets, do_fingerprint=True)
 
         return {
@@ -282,9 +296,18 @@ class AgentDaemon:
             "started_at": result.started_at.isoformat() if result.started_at else None,
             "completed_at": result.completed_at.isoformat() if result.completed_at else None,
             "is_root": result.is_root,
+            "is_partial": result.is_partial,
             "assets": [a.to_dict() for a in result.assets],
         }
 
+    @staticmethod
+    def _update_baseline(baseline: dict[str, dict], scan_result: dict) -> None:
+        """Record a scan's port state as the next cycle's baseline."""
+        from bigr.scanner.hybrid import update_port_baseline
+
+        checked_at = scan_result.get("started_at") or datetime.now(timezone.utc).isoformat()
+        update_port_baseline(baseline, scan_result.get("assets", []), checked_at)
+
     @staticmethod
     def _run_shield(target: str) -> dict:
         """Run shield security modules on a target."""
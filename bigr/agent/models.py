@@ -48,6 +48,7 @@ class IngestDiscoveryRequest(BaseModel):
     started_at: str
     completed_at: str | None = None
     is_root: bool = False
+    is_partial: bool = False
     assets: list[dict] = Field(default_factory=list)
     network_fingerprint: NetworkFingerprintPayload | None = None
 
@@ -24,6 +24,7 @@ from bigr.agent.models import (
 )
 from bigr.core import services
 from bigr.core.database import get_db
+from bigr.core.events import publish
 from bigr.agent.alerts import alert_critical_finding, alert_service, alert_stale_agent
 from bigr.agent.ratelimit import ingest_limiter
 from bigr.core.models_db import AgentCommandDB, AgentDB, NetworkDB, ShieldFindingDB, ShieldScanDB
@@ -137,13 +138,24 @@ async def list_agents(db: AsyncSession = Depends(get_db)) -> dict:
     agents = []
     now = datetime.now(timezone.utc)
 
-    # Pre-fetch latest network per agent (most recent last_seen)
-    net_stmt = select(NetworkDB).order_by(NetworkDB.last_seen.desc())
-    net_result = await db.execute(net_stmt)
-    latest_network_by_agent: dict[str, NetworkDB] = {}
-    for net in net_result.scalars().all():
-        if net.agent_id and net.agent_id not in latest_network_by_agent:
-            latest_network_by_agent[net.agent_id] = net
+    # Latest network per agent (most recent last_seen), one row per agent
+    ranked = (
+        select(
+            NetworkDB.id,
+            NetworkDB.agent_id,
+            NetworkDB.ssid,
+            NetworkDB.gateway_ip,
+            NetworkDB.friendly_name,
+            func.row_number().over(
+                partition_by=NetworkDB.agent_id,
+                order_by=NetworkDB.last_seen.desc(),
+            ).label("recency"),
+        )
+        .where(NetworkDB.agent_id.is_not(None))
+        .subquery()
+    )
+    net_result = await db.execute(select(ranked).where(ranked.c.recency == 1))
+    latest_network_by_agent = {net.agent_id: net for net in net_result.all()}
 
     for a in result.scalars().all():
         # Compute effective status based on last_seen
@@ -255,6 +267,7 @@ async def ingest_discovery(
         "started_at": body.started_at,
         "completed_at": body.completed_at,
         "is_root": body.is_root,
+        "is_partial": body.is_partial,
         "assets": body.assets,
         "agent_id": agent.id,
         "site_name": agent.site_name,
@@ -325,6 +338,26 @@ async def ingest_shield(
     await db.execute(stmt)
     await db.commit()
 
+    for finding in body.findings:
+        publish("shield.finding", {
+            "scan_id": scan_id,
+            "module": finding.get("module", "unknown"),
+            "severity": finding.get("severity", "info"),
+            "title": finding.get("title"),
+            "target_ip": finding.get("target_ip"),
+            "target": body.target,
+            "site_name": agent.site_name,
+            "agent_id": agent.id,
+        })
+    publish("shield.scan", {
+        "scan_id": scan_id,
+        "status": "completed",
+        "target": body.target,
+        "site_name": agent.site_name,
+        "agent_id": agent.id,
+        "findings_count": len(body.findings),
+    })
+
     # Alert on critical findings
     for finding in body.findings:
         if finding.get("severity") in ("critical", "high"):
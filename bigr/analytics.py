@@ -64,7 +64,7 @@ class AnalyticsResult:
 
 
 def _get_conn(db_path: Path | None = None) -> sqlite3.Connection:
-    """Open a connection using the same logic as bigr.db."""
+    """Return the shared per-thread connection used by bigr.db."""
     from bigr.db import _connect, init_db
 
     init_db(db_path)
@@ -29,10 +29,17 @@ from bigr.db import (
     update_subnet_stats,
 )
 from bigr.diff import diff_scans, get_changes_from_db
-from bigr.models import BigrCategory, ScanResult
+from bigr.models import BigrCategory, ScanEvent, ScanEventKind, ScanResult
 from bigr.output import write_csv, write_json
-from bigr.scanner.active import is_root
+from bigr.scanner.active import (
+    DEFAULT_HOST_PARALLELISM,
+    DEFAULT_PORT_PARALLELISM,
+    DEFAULT_SYN_PPS,
+    PORT_SCAN_METHODS,
+    is_root,
+)
 from bigr.scanner.hybrid import run_hybrid_scan
+from bigr.scanner.targets import TargetSet
 from bigr.watcher import WatcherDaemon, get_watcher_status
 
 app = typer.Typer(
@@ -45,11 +52,25 @@ console = Console()
 
 @app.command()
 def scan(
-    targets: list[str] = typer.Argument(None, help="Target subnet(s) in CIDR notation (e.g., 192.168.1.0/24)"),
+    targets: list[str] = typer.Argument(
+        None,
+        help="Target subnet(s) in CIDR notation (e.g., 192.168.1.0/24). "
+        "Comma-separated CIDRs/ranges and !exclusions are accepted (e.g., 10.0.0.0/16,!10.0.5.0/24)",
+    ),
     scan_all: bool = typer.Option(False, "--all", help="Scan all registered subnets from DB"),
     mode: str = typer.Option("hybrid", "--mode", "-m", help="Scan mode: passive, active, or hybrid"),
     ports: Optional[str] = typer.Option(None, "--ports", "-p", help="Comma-separated port list"),
     timeout: float = typer.Option(2.0, "--timeout", "-t", help="Per-port scan timeout in seconds"),
+    host_parallelism: int = typer.Option(
+        DEFAULT_HOST_PARALLELISM, "--host-parallelism", help="Number of hosts port-scanned at once",
+    ),
+    port_parallelism: int = typer.Option(
+        DEFAULT_PORT_PARALLELISM, "--port-parallelism", help="Concurrent port probes per host",
+    ),
+    port_scan: str = typer.Option("connect", "--port-scan", help="Port scan technique: connect or syn (root)"),
+    pps: int = typer.Option(
+        DEFAULT_SYN_PPS, "--pps", help="Packets-per-second ceiling for SYN scanning",
+    ),
     output: str = typer.Option("assets.json", "--output", "-o", help="Output file path"),
     fmt: str = typer.Option("json", "--format", "-f", help="Output format: json or csv"),
     diff: bool = typer.Option(True, "--diff/--no-diff", help="Show diff against previous scan"),
@@ -72,11 +93,22 @@ def scan(
         console.print("[red]Error:[/red] Provide target subnet(s) or use --all.")
         raise typer.Exit(1)
 
+    for target in target_list:
+        try:
+            TargetSet.resolve(target)
+        except ValueError as exc:
+            console.print(f"[red]Error:[/red] Invalid target '{target}': {exc}")
+            raise typer.Exit(1)
+
     # Parse ports if provided
     port_list = None
     if ports:
         port_list = [int(p.strip()) for p in ports.split(",")]
 
+    if port_scan not in PORT_SCAN_METHODS:
+        console.print(f"[red]Error:[/red] Invalid port scan technique '{port_scan}'. Use connect or syn.")
+        raise typer.Exit(1)
+
     # Root check warning
     if not is_root() and mode in ("active", "hybrid"):
         console.print(
@@ -84,6 +116,11 @@ def scan(
             "Active scanning (ARP sweep) will be skipped. "
             "Running in passive mode with port scanning.",
         )
+    if not is_root() and port_scan == "syn":
+        console.print(
+            "[yellow]Warning:[/yellow] SYN scanning requires root. "
+            "Falling back to TCP connect scanning.",
+        )
 
     total_assets = 0
     last_result: ScanResult | None = None
@@ -98,8 +135,26 @@ def scan(
                 pass
 
         # Run scan
-        with console.status(f"[bold green]Scanning {target}..."):
-            result = run_hybrid_scan(target, mode=mode, ports=port_list, timeout=timeout)
+        with console.status(f"[bold green]Scanning {target}...") as status:
+            progress = {"hosts": set(), "scanned": 0}
+
+            def _on_event(event: ScanEvent, target: str = target) -> None:
+                if event.kind == ScanEventKind.HOST_DISCOVERED:
+                    progress["hosts"].add(event.asset.ip)
+                elif event.kind == ScanEventKind.PORTS_FOUND:
+                    progress["scanned"] += 1
+                else:
+                    return
+                status.update(
+                    f"[bold green]Scanning {target}... "
+                    f"{len(progress['hosts'])} hosts, {progress['scanned']} port-scanned"
+                )
+
+            result = run_hybrid_scan(
+                target, mode=mode, ports=port_list, timeout=timeout,
+                host_parallelism=host_parallelism, port_parallelism=port_parallelism,
+                port_scan=port_scan, pps=pps, on_event=_on_event,
+            )
 
         # Classify
         with console.status("[bold blue]Classifying assets..."):
@@ -124,7 +179,7 @@ def scan(
         # Show diff against previous scan
         if diff and previous_scan and previous_scan.get("assets"):
             current_assets = [a.to_dict() for a in result.assets]
-            diff_result = diff_scans(current_assets, previous_scan["assets"])
+            diff_result = diff_scans(current_assets, previous_scan["assets"], ordered=True)
             if diff_result.has_changes:
                 _print_diff(diff_result)
             else:
@@ -396,6 +451,7 @@ def watch(
     config: bool = typer.Option(False, "--config", help="Watch all targets from config file"),
     stop: bool = typer.Option(False, "--stop", help="Stop running watcher"),
     status: bool = typer.Option(False, "--status", help="Check watcher status"),
+    workers: int = typer.Option(4, "--workers", "-w", help="Max targets scanned concurrently"),
 ) -> None:
     """Watch network targets with periodic scans."""
     # --status: check if watcher is running
@@ -454,7 +510,7 @@ def watch(
     for t in targets:
         console.print(f"  - {t['subnet']} (every {t['interval_seconds']}s)")
 
-    watcher = WatcherDaemon(targets=targets)
+    watcher = WatcherDaemon(targets=targets, max_workers=workers)
     try:
         watcher.start()
     except RuntimeError as exc:
@@ -665,32 +721,38 @@ def certs_scan(
     db_path_opt: Optional[str] = typer.Option(None, "--db-path", hidden=True, help="Database path (for testing)"),
 ) -> None:
     """Scan assets for TLS certificates. Optionally specify a single host."""
-    from bigr.db import get_all_assets, save_certificate
-    from bigr.scanner.tls import scan_host_certificates
+    from bigr.db import get_all_assets, get_port_baseline, save_certificate
+    from bigr.scanner.tls import scan_all_certificates
 
     resolved_db = Path(db_path_opt) if db_path_opt else None
 
-    # Build IP list: single host or all known assets
+    # Build target list: single host or all known assets (with last known
+    # and probed ports, so ports a port scan found closed are skipped)
     if host:
-        ip_list = [host]
+        targets = [{"ip": host}]
     else:
         all_assets = get_all_assets(db_path=resolved_db)
         if not all_assets:
             console.print("[yellow]No assets found.[/yellow] Run 'bigr scan' first.")
             return
-        ip_list = [a.get("ip", "") for a in all_assets if a.get("ip")]
-
-    console.print(f"[bold]Scanning {len(ip_list)} host(s) for TLS certificates...[/bold]")
-
-    total_found = 0
-    for ip in ip_list:
-        with console.status(f"[bold green]Checking {ip}..."):
-            certs = scan_host_certificates(ip)
-        for cert in certs:
-            save_certificate(cert, db_path=resolved_db)
-            total_found += 1
-
-    console.print(f"[green]Scan complete![/green] Found [bold]{total_found}[/bold] certificate(s).")
+        baseline = get_port_baseline(db_path=resolved_db)
+        targets = [
+            {
+                "ip": a["ip"],
+                "open_ports": baseline.get(a["ip"], {}).get("open_ports", []),
+                "scanned_ports": baseline.get(a["ip"], {}).get("scanned_ports", []),
+            }
+            for a in all_assets if a.get("ip")
+        ]
+
+    console.print(f"[bold]Scanning {len(targets)} host(s) for TLS certificates...[/bold]")
+
+    with console.status("[bold green]Collecting certificates..."):
+        result = scan_all_certificates(targets)
+    for cert in result.certificates:
+        save_certificate(cert, db_path=resolved_db)
+
+    console.print(f"[green]Scan complete![/green] Found [bold]{result.total_certs_found}[/bold] certificate(s).")
 
 
 @certs_app.command("list")
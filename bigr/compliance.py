@@ -244,10 +244,29 @@ def generate_action_items(assets: list[dict]) -> list[dict]:
 def calculate_subnet_compliance(
     assets: list[dict], subnets: list[dict]
 ) -> list[SubnetCompliance]:
-    """Calculate per-subnet compliance scores."""
+    """Calculate per-subnet compliance scores.
+
+    Each asset IP is parsed once and matched against precomputed integer
+    ranges. Database-backed callers should prefer
+    ``bigr.core.services.get_subnet_compliance_async``, which does the
+    grouping in SQL.
+    """
     if not subnets:
         return []
 
+    # (version, packed int) per asset; None when tagged or unparseable
+    keys: list[tuple[int, int] | None] = []
+    for asset in assets:
+        if asset.get("subnet_cidr"):
+            keys.append(None)
+            continue
+        try:
+            addr = ipaddress.ip_address(asset.get("ip", ""))
+        except ValueError:
+            keys.append(None)
+            continue
+        keys.append((addr.version, int(addr)))
+
     results: list[SubnetCompliance] = []
 
     for subnet_info in subnets:
@@ -258,23 +277,17 @@ def calculate_subnet_compliance(
             network = ipaddress.ip_network(cidr, strict=False)
         except ValueError:
             continue
-
-        # Filter assets belonging to this subnet
-        subnet_assets = []
-        for asset in assets:
-            asset_ip = asset.get("ip", "")
-            asset_subnet = asset.get("subnet_cidr")
-
-            # Prefer explicit subnet_cidr tag, otherwise check IP in range
-            if asset_subnet:
-                if asset_subnet == cidr:
-                    subnet_assets.append(asset)
-            else:
-                try:
-                    if ipaddress.ip_address(asset_ip) in network:
-                        subnet_assets.append(asset)
-                except ValueError:
-                    pass
+        version = network.version
+        first = int(network.network_address)
+        last = int(network.broadcast_address)
+
+        # Prefer explicit subnet_cidr tag, otherwise check IP in range
+        subnet_assets = [
+            asset
+            for asset, key in zip(assets, keys)
+            if (asset.get("subnet_cidr") == cidr if key is None
+                else key[0] == version and first <= key[1] <= last)
+        ]
 
         # Calculate compliance for this subnet's assets
         sub_report = calculate_compliance(subnet_assets)
@@ -0,0 +1,158 @@
+"""In-process response cache for the dashboard read endpoints.
+
+Dashboard endpoints such as ``/api/topology`` and ``/api/compliance`` are
+recomputed from the whole inventory, but the inventory only changes when
+something writes to it. Writers call :func:`bump_inventory_generation`;
+cached responses are keyed by endpoint and parameters and remembered
+together with the generation they were computed at, so a bump makes
+every cached response stale at once.
+
+:class:`ResponseCache` also collapses concurrent requests for the same
+key into one computation (single-flight) and derives an ``ETag`` from
+the response body so pollers can revalidate with ``If-None-Match``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+_generation = 0
+_generation_lock = threading.Lock()
+
+
+def inventory_generation() -> int:
+    """Return the current inventory generation."""
+    return _generation
+
+
+def bump_inventory_generation() -> int:
+    """Mark the inventory as changed; returns the new generation.
+
+    Safe to call from any thread (local scans write from worker threads).
+    """
+    global _generation
+    with _generation_lock:
+        _generation += 1
+        return _generation
+
+
+@dataclass
+class CachedResponse:
+    """A rendered response body and its validator."""
+
+    body: bytes
+    etag: str
+    generation: int
+    created_at: float
+
+
+class ResponseCache:
+    """LRU cache of rendered responses with single-flight recomputation.
+
+    Args:
+        max_entries: Least recently used entries beyond this are dropped.
+        max_age: Seconds an entry is trusted even without a generation
+            bump; covers writers in other processes (e.g. CLI scans
+            against the same SQLite file).
+    """
+
+    def __init__(self, max_entries: int = 256, max_age: float = 60.0) -> None:
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries: OrderedDict[Hashable, CachedResponse] = OrderedDict()
+        self._inflight: dict[tuple[Hashable, int], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable) -> CachedResponse | None:
+        """Return the entry for *key* if it is still current."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if (
+            entry.generation != inventory_generation()
+            or time.monotonic() - entry.created_at > self.max_age
+        ):
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    async def get(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[Any]],
+        render: Callable[[Any], bytes | None],
+    ) -> CachedResponse | Any:
+        """Return the cached response for *key*, computing it if needed.
+
+        ``compute()`` produces a result and ``render(result)`` turns it
+        into body bytes; if ``render`` returns None the result (e.g. an
+        error response) is handed back uncached. Concurrent callers for
+        the same key and generation share one ``compute()``.
+        """
+        entry = self.lookup(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+
+        generation = inventory_generation()
+        flight = (key, generation)
+        task = self._inflight.get(flight)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fill(key, generation, compute, render))
+            task.add_done_callback(_consume_exception)
+            self._inflight[flight] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(flight, None))
+        # Shielded: a caller that disconnects must not cancel the others
+        return await asyncio.shield(task)
+
+    async def _fill(
+        self,
+        key: Hashable,
+        generation: int,
+        compute: Callable[[], Awaitable[Any]],
+        render: Callable[[Any], bytes | None],
+    ) -> CachedResponse | Any:
+        result = await compute()
+        body = render(result)
+        if body is None:
+            return result
+        entry = CachedResponse(
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            generation=generation,
+            created_at=time.monotonic(),
+        )
+        # Only remember it if nothing was written while computing
+        if generation == inventory_generation():
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # Waiters re-raise it; this only silences "never retrieved" warnings
+    if not task.cancelled():
+        task.exception()
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an ``If-None-Match`` header value matches *etag*."""
+    if not if_none_match:
+        return False
+    candidates = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
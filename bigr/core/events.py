@@ -0,0 +1,245 @@
+"""In-process change feed for dashboard clients.
+
+Writers (scan ingest, shield scans, the guardian stats tracker) call
+:func:`publish` with a dotted topic such as ``"asset.changed"`` or
+``"shield.scan"`` and a JSON-serialisable payload. ``/api/stream``
+subscribes to :data:`event_bus` and forwards the events as Server-Sent
+Events, so dashboards receive deltas instead of re-polling the read
+endpoints.
+
+Every event gets a monotonically increasing id, sent over SSE as
+``<epoch>-<id>`` where the epoch is random per process. The bus keeps a
+short backlog so a reconnecting client can resume from
+``Last-Event-ID``; if the id has already left the backlog, comes from
+another process (ids restart at 1 after a restart) or a slow
+subscriber's queue overflows, the client is sent a single ``resync``
+event and should refetch its views. Delta topics such as ``asset.changed`` must therefore
+always be published; only full-snapshot topics (``guardian.stats``) may
+be skipped via :meth:`EventBus.has_subscribers`, since the next snapshot
+supersedes a missed one.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import secrets
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Events kept for Last-Event-ID replay
+BACKLOG_SIZE = 512
+# Undelivered events per subscriber before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = 1024
+
+RESYNC_TOPIC = "resync"
+
+
+@dataclass
+class Event:
+    """One change notification."""
+
+    id: int
+    topic: str
+    data: dict[str, Any]
+    created_at: float = field(default_factory=time.time)
+    epoch: str = ""
+
+    @property
+    def sse_id(self) -> str:
+        """The id sent to clients: ``<epoch>-<id>``."""
+        return f"{self.epoch}-{self.id}" if self.epoch else str(self.id)
+
+    def to_sse(self) -> bytes:
+        """Encode as a ``text/event-stream`` message."""
+        payload = json.dumps(self.data, default=str, separators=(",", ":"))
+        return f"id: {self.sse_id}\nevent: {self.topic}\ndata: {payload}\n\n".encode()
+
+
+def topic_matches(topic: str, prefixes: Iterable[str] | None) -> bool:
+    """True if *topic* equals or is nested under one of *prefixes*.
+
+    ``None`` (no filter) matches everything; ``resync`` always matches.
+    """
+    if prefixes is None or topic == RESYNC_TOPIC:
+        return True
+    return any(topic == p or topic.startswith(p + ".") for p in prefixes)
+
+
+class Subscription:
+    """A subscriber's bounded queue; iterate it to receive events."""
+
+    def __init__(
+        self,
+        bus: EventBus,
+        loop: asyncio.AbstractEventLoop,
+        topics: frozenset[str] | None,
+    ) -> None:
+        self._bus = bus
+        self._loop = loop
+        self.topics = topics
+        self._queue: asyncio.Queue[Event | None] = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        self._overflowed = False
+
+    def _deliver(self, event: Event | None) -> None:
+        # Runs on the subscriber's loop
+        if self._overflowed:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog; the client refetches instead of replaying it
+            self._overflowed = True
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(self._bus._resync_event())
+
+    def offer(self, event: Event | None) -> None:
+        if event is not None and not topic_matches(event.topic, self.topics):
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._deliver(event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, event)
+
+    async def get(self, timeout: float | None = None) -> Event | None:
+        """Next event; None when the bus disconnects us.
+
+        Raises:
+            TimeoutError: Nothing arrived within *timeout* seconds.
+        """
+        event = await asyncio.wait_for(self._queue.get(), timeout)
+        if event is not None and event.topic == RESYNC_TOPIC:
+            self._overflowed = False
+        return event
+
+    def close(self) -> None:
+        self._bus._unsubscribe(self)
+
+    async def __aiter__(self) -> AsyncIterator[Event]:
+        while (event := await self.get()) is not None:
+            yield event
+
+
+class EventBus:
+    """Fan-out of published events to subscribers on any event loop.
+
+    :meth:`publish` is safe to call from any thread; delivery is
+    scheduled onto each subscriber's own loop.
+    """
+
+    def __init__(self, backlog_size: int = BACKLOG_SIZE) -> None:
+        self._lock = threading.Lock()
+        # Tells this process's ids apart from those of a previous run
+        self.epoch = secrets.token_hex(4)
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._backlog: deque[Event] = deque(maxlen=backlog_size)
+        self._subscribers: list[Subscription] = []
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, topic: str, data: dict[str, Any] | None = None) -> Event:
+        """Record an event and hand it to every matching subscriber."""
+        with self._lock:
+            event = Event(id=next(self._ids), topic=topic, data=data or {}, epoch=self.epoch)
+            self._last_id = event.id
+            self._backlog.append(event)
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            sub.offer(event)
+        return event
+
+    def subscribe(
+        self,
+        topics: Iterable[str] | None = None,
+        last_event_id: int | str | None = None,
+    ) -> Subscription:
+        """Subscribe on the running loop, optionally resuming after an id.
+
+        ``last_event_id`` is an event id or an SSE id (``<epoch>-<id>``).
+        Events after it still in the backlog are queued first. A
+        ``resync`` event is queued instead if some were already dropped,
+        or if the id is not one this bus issued (another process's
+        epoch, an id beyond :attr:`last_id`, or garbage).
+        """
+        loop = asyncio.get_running_loop()
+        sub = Subscription(self, loop, frozenset(topics) if topics is not None else None)
+        with self._lock:
+            if last_event_id is not None:
+                resume_id = self._resume_id(last_event_id)
+                if resume_id is None or resume_id > self._last_id:
+                    sub._deliver(self._resync_event())
+                elif resume_id < self._last_id:
+                    oldest = self._backlog[0].id if self._backlog else self._last_id + 1
+                    if resume_id + 1 < oldest:
+                        sub._deliver(self._resync_event())
+                    else:
+                        for event in self._backlog:
+                            if event.id > resume_id:
+                                sub.offer(event)
+            self._subscribers.append(sub)
+        return sub
+
+    def _resume_id(self, last_event_id: int | str) -> int | None:
+        """This bus's event id for *last_event_id*, or None if it isn't ours."""
+        if isinstance(last_event_id, int):
+            return last_event_id
+        epoch, sep, value = last_event_id.rpartition("-")
+        if sep and epoch != self.epoch:
+            return None
+        return int(value) if value.isdigit() else None
+
+    def _unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def _resync_event(self) -> Event:
+        # Carries the current id so the client resumes from here after refetching
+        return Event(id=self._last_id, topic=RESYNC_TOPIC, data={}, epoch=self.epoch)
+
+    def disconnect_all(self) -> None:
+        """End every current subscription (used on application shutdown)."""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for sub in subscribers:
+            sub.offer(None)
+
+    def has_subscribers(self, topic: str) -> bool:
+        """True if anyone would receive *topic*.
+
+        Lets emitters of full snapshots skip work; deltas must be
+        published regardless so they can be replayed.
+        """
+        return any(topic_matches(topic, s.topics) for s in self._subscribers)
+
+
+event_bus = EventBus()
+
+
+def publish(topic: str, data: dict[str, Any] | None = None) -> Event | None:
+    """Publish on the process-wide bus; never raises into the writer."""
+    try:
+        return event_bus.publish(topic, data)
+    except Exception:
+        logger.exception("Failed to publish %s event", topic)
+        return None
@@ -2,9 +2,14 @@
 
 from __future__ import annotations
 
+import ipaddress
+
 from sqlalchemy import (
+    BigInteger,
     Float,
+    Index,
     Integer,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -19,6 +24,9 @@ class NetworkDB(Base):
     """Known network identity (fingerprinted by gateway MAC + SSID)."""
 
     __tablename__ = "networks"
+    __table_args__ = (
+        Index("ix_networks_agent_id_last_seen", "agent_id", "last_seen"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     fingerprint_hash: Mapped[str] = mapped_column(
@@ -64,6 +72,7 @@ class ScanDB(Base):
     completed_at: Mapped[str | None] = mapped_column(String, nullable=True)
     total_assets: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     is_root: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    is_partial: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     agent_id: Mapped[str | None] = mapped_column(
         String, ForeignKey("agents.id"), nullable=True
     )
@@ -77,12 +86,47 @@ class ScanDB(Base):
     )
 
 
+def ip_range_keys(ip: str | None) -> tuple[int | None, bytes | None]:
+    """Return the ``(ip_int, ip_v6)`` range-query keys for an address.
+
+    IPv4 addresses map to an integer; IPv6 addresses to their 16-byte
+    big-endian form, which sorts like the address. Unparseable values
+    get neither.
+    """
+    try:
+        addr = ipaddress.ip_address(ip or "")
+    except ValueError:
+        return None, None
+    if addr.version == 4:
+        return int(addr), None
+    return None, addr.packed
+
+
+def _default_ip_int(context) -> int | None:
+    return ip_range_keys(context.get_current_parameters().get("ip"))[0]
+
+
+def _default_ip_v6(context) -> bytes | None:
+    return ip_range_keys(context.get_current_parameters().get("ip"))[1]
+
+
 class AssetDB(Base):
     __tablename__ = "assets"
-    __table_args__ = (UniqueConstraint("ip", "mac", name="uq_asset_ip_mac"),)
+    __table_args__ = (
+        UniqueConstraint("ip", "mac", name="uq_asset_ip_mac"),
+        # Keyset pagination order for /api/assets
+        Index("ix_assets_last_seen_id", "last_seen", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     ip: Mapped[str] = mapped_column(String, nullable=False)
+    # Derived from ip on insert, for subnet range scans
+    ip_int: Mapped[int | None] = mapped_column(
+        BigInteger, nullable=True, index=True, default=_default_ip_int
+    )
+    ip_v6: Mapped[bytes | None] = mapped_column(
+        LargeBinary(16), nullable=True, index=True, default=_default_ip_v6
+    )
     mac: Mapped[str | None] = mapped_column(String, nullable=True)
     hostname: Mapped[str | None] = mapped_column(String, nullable=True)
     vendor: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -108,7 +152,7 @@ class AssetDB(Base):
     )
     site_name: Mapped[str | None] = mapped_column(String, nullable=True)
     network_id: Mapped[str | None] = mapped_column(
-        String, ForeignKey("networks.id"), nullable=True
+        String, ForeignKey("networks.id"), nullable=True, index=True
     )
 
     scan_assets: Mapped[list[ScanAssetDB]] = relationship(
@@ -199,6 +243,7 @@ class CertificateDB(Base):
     days_until_expiry: Mapped[int | None] = mapped_column(Integer, nullable=True)
     san: Mapped[str | None] = mapped_column(Text, nullable=True)
     last_checked: Mapped[str] = mapped_column(String, nullable=False)
+    cert_fingerprint: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
 
 
 class ShieldScanDB(Base):
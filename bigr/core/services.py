@@ -7,14 +7,34 @@ the existing API response shapes.
 
 from __future__ import annotations
 
+import base64
+import ipaddress
 import json
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import delete, desc, func, select, update
+from sqlalchemy import (
+    BigInteger,
+    LargeBinary,
+    String,
+    and_,
+    case,
+    delete,
+    desc,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from bigr.compliance import CategoryDistribution, ComplianceBreakdown, SubnetCompliance
+from bigr.core.cache import bump_inventory_generation
+from bigr.core.events import publish
 from bigr.core.models_db import (
     AssetChangeDB,
     AssetDB,
@@ -65,6 +85,7 @@ def _scan_to_dict(
         "completed_at": scan.completed_at,
         "total_assets": scan.total_assets,
         "is_root": bool(scan.is_root),
+        "is_partial": bool(scan.is_partial),
     }
 
     # Compute duration
@@ -140,49 +161,144 @@ async def get_latest_scan(
     return _scan_to_dict(result, include_assets=True)
 
 
+# Columns of the living asset record, in API response order
+ASSET_FIELDS: tuple[str, ...] = (
+    "id", "ip", "mac", "hostname", "vendor", "os_hint", "bigr_category",
+    "confidence_score", "scan_method", "first_seen", "last_seen",
+    "sensitivity_level", "manual_category", "manual_note", "is_ignored",
+    "switch_host", "switch_port", "switch_port_index", "agent_id",
+    "site_name", "network_id",
+)
+
+DEFAULT_ASSET_PAGE_SIZE = 500
+MAX_ASSET_PAGE_SIZE = 5000
+
+
+def encode_asset_cursor(last_seen: str, asset_id: str) -> str:
+    """Encode a keyset position (last_seen, id) as an opaque cursor."""
+    raw = json.dumps([last_seen, asset_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_asset_cursor(cursor: str) -> tuple[str, str]:
+    """Decode a cursor from :func:`encode_asset_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_seen, asset_id = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from exc
+    if not isinstance(last_seen, str) or not isinstance(asset_id, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return last_seen, asset_id
+
+
+def parse_asset_fields(fields: str | None) -> tuple[str, ...]:
+    """Parse a comma-separated ``fields=`` projection.
+
+    Returns all :data:`ASSET_FIELDS` when *fields* is empty.
+
+    Raises:
+        ValueError: If a field name is unknown.
+    """
+    if not fields:
+        return ASSET_FIELDS
+    names = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in names if f not in ASSET_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown asset fields: {', '.join(unknown)}")
+    return names or ASSET_FIELDS
+
+
+def subnet_clause(subnet: str):
+    """Return a range-scan WHERE clause matching assets inside *subnet*.
+
+    Uses the indexed ``ip_int`` (IPv4) or ``ip_v6`` column.
+
+    Raises:
+        ValueError: If *subnet* is not a valid network.
+    """
+    network = ipaddress.ip_network(subnet, strict=False)
+    first, last = network.network_address, network.broadcast_address
+    if network.version == 4:
+        return AssetDB.ip_int.between(int(first), int(last))
+    return AssetDB.ip_v6.between(first.packed, last.packed)
+
+
+async def get_assets_page(
+    session: AsyncSession,
+    *,
+    fields: tuple[str, ...] = ASSET_FIELDS,
+    site_name: str | None = None,
+    network_id: str | None = None,
+    category: str | None = None,
+    subnet: str | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_ASSET_PAGE_SIZE,
+) -> tuple[list[dict], str | None]:
+    """Return one page of assets, newest ``last_seen`` first.
+
+    Pages are keyset-paginated on ``(last_seen, id)``: pass the returned
+    cursor back to fetch the next page; it is None after the last page.
+    Only the requested *fields* are selected.
+
+    Raises:
+        ValueError: If *cursor* or *subnet* is malformed.
+    """
+    columns = dict.fromkeys(fields + ("last_seen", "id"))
+    stmt = (
+        select(*(getattr(AssetDB, c) for c in columns))
+        .order_by(desc(AssetDB.last_seen), desc(AssetDB.id))
+        .limit(limit)
+    )
+    if cursor:
+        stmt = stmt.where(
+            tuple_(AssetDB.last_seen, AssetDB.id) < decode_asset_cursor(cursor)
+        )
+    if site_name:
+        stmt = stmt.where(AssetDB.site_name == site_name)
+    if network_id:
+        stmt = stmt.where(AssetDB.network_id == network_id)
+    if category:
+        stmt = stmt.where(AssetDB.bigr_category == category)
+    if subnet:
+        stmt = stmt.where(subnet_clause(subnet))
+
+    rows = (await session.execute(stmt)).mappings().all()
+    page = [{f: row[f] for f in fields} for row in rows]
+    if len(rows) < limit:
+        return page, None
+    return page, encode_asset_cursor(rows[-1]["last_seen"], rows[-1]["id"])
+
+
 async def get_all_assets(
     session: AsyncSession,
     *,
     site_name: str | None = None,
     network_id: str | None = None,
+    subnet: str | None = None,
 ) -> list[dict]:
     """Return all known assets from the living inventory.
 
     If *site_name* is provided, only assets from that site are returned.
     If *network_id* is provided, only assets from that network are returned.
+    If *subnet* is provided, only assets inside that CIDR are returned.
+    For large inventories prefer :func:`get_assets_page`.
     """
-    stmt = select(AssetDB).order_by(desc(AssetDB.last_seen))
+    stmt = select(*(getattr(AssetDB, f) for f in ASSET_FIELDS)).order_by(
+        desc(AssetDB.last_seen)
+    )
     if site_name:
         stmt = stmt.where(AssetDB.site_name == site_name)
     if network_id:
         stmt = stmt.where(AssetDB.network_id == network_id)
+    if subnet:
+        stmt = stmt.where(subnet_clause(subnet))
     result = await session.execute(stmt)
-    return [
-        {
-            "id": a.id,
-            "ip": a.ip,
-            "mac": a.mac,
-            "hostname": a.hostname,
-            "vendor": a.vendor,
-            "os_hint": a.os_hint,
-            "bigr_category": a.bigr_category,
-            "confidence_score": a.confidence_score,
-            "scan_method": a.scan_method,
-            "first_seen": a.first_seen,
-            "last_seen": a.last_seen,
-            "sensitivity_level": a.sensitivity_level,
-            "manual_category": a.manual_category,
-            "manual_note": a.manual_note,
-            "is_ignored": a.is_ignored,
-            "switch_host": a.switch_host,
-            "switch_port": a.switch_port,
-            "switch_port_index": a.switch_port_index,
-            "agent_id": a.agent_id,
-            "site_name": a.site_name,
-            "network_id": a.network_id,
-        }
-        for a in result.scalars().all()
-    ]
+    return [dict(row) for row in result.mappings()]
 
 
 async def get_scan_list(
@@ -267,6 +383,132 @@ async def get_subnets_async(session: AsyncSession) -> list[dict]:
     ]
 
 
+async def get_subnet_compliance_async(
+    session: AsyncSession,
+    subnets: list[dict],
+    *,
+    scan_id: str | None = None,
+) -> list[SubnetCompliance]:
+    """Per-subnet compliance, counted in SQL with one GROUP BY per family.
+
+    Subnet CIDRs are turned into ``[first, last]`` ranges and LEFT JOINed
+    against the assets' ``ip_int`` / ``ip_v6`` columns. With *scan_id*
+    the assets of that scan are scored using the per-scan category and
+    confidence (as in :func:`get_latest_scan`); otherwise the living
+    inventory is scored, including manual overrides. Results follow the
+    order of *subnets*; invalid CIDRs are skipped.
+    """
+    ranges: dict[int, list[tuple[int, int | bytes, int | bytes]]] = {4: [], 6: []}
+    for pos, info in enumerate(subnets):
+        try:
+            network = ipaddress.ip_network(info["cidr"], strict=False)
+        except ValueError:
+            continue
+        first, last = network.network_address, network.broadcast_address
+        if network.version == 4:
+            ranges[4].append((pos, int(first), int(last)))
+        else:
+            ranges[6].append((pos, first.packed, last.packed))
+
+    if scan_id:
+        confidence = case(
+            (func.coalesce(ScanAssetDB.confidence_score, 0) != 0, ScanAssetDB.confidence_score),
+            else_=AssetDB.confidence_score,
+        )
+        source = (
+            select(
+                AssetDB.ip_int,
+                AssetDB.ip_v6,
+                func.coalesce(
+                    func.nullif(ScanAssetDB.bigr_category, ""), AssetDB.bigr_category
+                ).label("category"),
+                confidence.label("confidence"),
+                literal(None, String).label("manual"),
+            )
+            .join(AssetDB, AssetDB.id == ScanAssetDB.asset_id)
+            .where(ScanAssetDB.scan_id == scan_id)
+        )
+    else:
+        source = select(
+            AssetDB.ip_int,
+            AssetDB.ip_v6,
+            AssetDB.bigr_category.label("category"),
+            AssetDB.confidence_score.label("confidence"),
+            AssetDB.manual_category.label("manual"),
+        )
+    src = source.subquery()
+
+    has_manual = and_(src.c.manual.is_not(None), src.c.manual != "")
+    effective = case((has_manual, src.c.manual), else_=src.c.category)
+
+    def _count(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    counts: dict[int, dict] = {}
+    for version, rows in ranges.items():
+        if not rows:
+            continue
+        bound_type = BigInteger if version == 4 else LargeBinary
+        rng = union_all(*(
+            select(
+                literal(pos).label("pos"),
+                literal(lo, bound_type).label("lo"),
+                literal(hi, bound_type).label("hi"),
+            )
+            for pos, lo, hi in rows
+        )).subquery("subnet_ranges")
+        key = src.c.ip_int if version == 4 else src.c.ip_v6
+        stmt = (
+            select(
+                rng.c.pos,
+                func.count(key).label("total"),
+                _count(has_manual).label("manual"),
+                _count(and_(~has_manual, src.c.confidence >= 0.7)).label("fully"),
+                _count(and_(
+                    ~has_manual, src.c.confidence >= 0.3, src.c.confidence < 0.7,
+                )).label("partially"),
+                _count(and_(
+                    key.is_not(None), ~has_manual, src.c.confidence < 0.3,
+                )).label("unclassified"),
+                *(
+                    _count(effective == cat).label(cat)
+                    for cat in ("ag_ve_sistemler", "uygulamalar", "iot", "tasinabilir")
+                ),
+            )
+            .select_from(rng)
+            .outerjoin(src, key.between(rng.c.lo, rng.c.hi))
+            .group_by(rng.c.pos)
+        )
+        for row in (await session.execute(stmt)).mappings():
+            counts[row["pos"]] = dict(row)
+
+    results: list[SubnetCompliance] = []
+    for pos in sorted(counts):
+        row = counts[pos]
+        named = sum(
+            row[cat] or 0 for cat in ("ag_ve_sistemler", "uygulamalar", "iot", "tasinabilir")
+        )
+        results.append(SubnetCompliance(
+            cidr=subnets[pos]["cidr"],
+            label=subnets[pos].get("label", ""),
+            breakdown=ComplianceBreakdown(
+                total_assets=row["total"],
+                fully_classified=row["fully"] or 0,
+                partially_classified=row["partially"] or 0,
+                unclassified=row["unclassified"] or 0,
+                manual_overrides=row["manual"] or 0,
+            ),
+            distribution=CategoryDistribution(
+                ag_ve_sistemler=row["ag_ve_sistemler"] or 0,
+                uygulamalar=row["uygulamalar"] or 0,
+                iot=row["iot"] or 0,
+                tasinabilir=row["tasinabilir"] or 0,
+                unclassified=row["total"] - named,
+            ),
+        ))
+    return results
+
+
 async def get_switches_async(session: AsyncSession) -> list[dict]:
     """Return all registered switches."""
     stmt = select(SwitchDB).order_by(SwitchDB.host)
@@ -284,9 +526,13 @@ async def get_switches_async(session: AsyncSession) -> list[dict]:
     ]
 
 
-async def get_certificates_async(session: AsyncSession) -> list[dict]:
-    """Return all stored certificates."""
+async def get_certificates_async(
+    session: AsyncSession, *, fingerprint: str | None = None
+) -> list[dict]:
+    """Return stored certificates, optionally only those with a SHA-256 fingerprint."""
     stmt = select(CertificateDB).order_by(desc(CertificateDB.last_checked))
+    if fingerprint:
+        stmt = stmt.where(CertificateDB.cert_fingerprint == fingerprint)
     result = await session.execute(stmt)
     certs = []
     for c in result.scalars().all():
@@ -311,6 +557,7 @@ async def get_certificates_async(session: AsyncSession) -> list[dict]:
             "days_until_expiry": c.days_until_expiry,
             "san": san,
             "last_checked": c.last_checked,
+            "cert_fingerprint": c.cert_fingerprint,
         })
     return certs
 
@@ -351,6 +598,7 @@ async def get_expiring_certs_async(
             "days_until_expiry": c.days_until_expiry,
             "san": san,
             "last_checked": c.last_checked,
+            "cert_fingerprint": c.cert_fingerprint,
         })
     return certs
 
@@ -419,12 +667,18 @@ async def save_scan_async(
     """Save an entire scan result, upserting assets and detecting changes.
 
     Accepts a dict with keys: target, scan_method, started_at, completed_at,
-    assets (list of asset dicts), is_root.
+    assets (list of asset dicts), is_root and optionally is_partial.
+
+    The write is set-based: one prefetch of the batch's existing assets,
+    one bulk UPDATE for known assets, one ``INSERT ... ON CONFLICT DO
+    UPDATE ... RETURNING`` for new ones, and bulk inserts for
+    ``scan_assets`` and ``asset_changes``.
 
     Returns the generated scan_id.
     """
     scan_id = str(uuid.uuid4())
     now_iso = datetime.now(timezone.utc).isoformat()
+    assets = scan_result.get("assets", [])
 
     scan = ScanDB(
         id=scan_id,
@@ -432,8 +686,9 @@ async def save_scan_async(
         scan_method=scan_result["scan_method"],
         started_at=scan_result["started_at"],
         completed_at=scan_result.get("completed_at"),
-        total_assets=len(scan_result.get("assets", [])),
+        total_assets=len(assets),
         is_root=int(scan_result.get("is_root", False)),
+        is_partial=int(scan_result.get("is_partial", False)),
         agent_id=scan_result.get("agent_id"),
         site_name=scan_result.get("site_name"),
         network_id=scan_result.get("network_id"),
@@ -441,122 +696,238 @@ async def save_scan_async(
     session.add(scan)
     await session.flush()
 
-    _agent_id = scan_result.get("agent_id")
-    _site_name = scan_result.get("site_name")
-    _network_id = scan_result.get("network_id")
-
-    for asset_data in scan_result.get("assets", []):
-        asset_id = await _upsert_asset_async(
-            session, asset_data, scan_id, now_iso,
-            agent_id=_agent_id, site_name=_site_name,
-            network_id=_network_id,
-        )
-
-        sa = ScanAssetDB(
-            scan_id=scan_id,
-            asset_id=asset_id,
-            open_ports=json.dumps(asset_data.get("open_ports", [])),
-            confidence_score=asset_data.get("confidence_score", 0.0),
-            bigr_category=asset_data.get("bigr_category", "unclassified"),
-            raw_evidence=json.dumps(asset_data.get("raw_evidence", {})),
+    changes: list[tuple] = []
+    if assets:
+        changes = await _bulk_upsert_assets(
+            session, assets, scan_id, now_iso,
+            agent_id=scan_result.get("agent_id"),
+            site_name=scan_result.get("site_name"),
+            network_id=scan_result.get("network_id"),
         )
-        session.add(sa)
 
     await session.commit()
+    bump_inventory_generation()
+    _publish_scan_deltas(scan, changes)
     return scan_id
 
 
-async def _upsert_asset_async(
-    session: AsyncSession,
-    asset_data: dict,
-    scan_id: str,
-    now_iso: str,
-    *,
-    agent_id: str | None = None,
-    site_name: str | None = None,
-    network_id: str | None = None,
-) -> str:
-    """Insert or update an asset. Detects and logs changes. Returns asset_id."""
-    ip = asset_data["ip"]
-    mac = asset_data.get("mac")
-
-    # Look up existing
-    stmt = select(AssetDB).where(AssetDB.ip == ip)
-    if mac is None:
-        stmt = stmt.where(AssetDB.mac.is_(None))
-    else:
-        stmt = stmt.where(AssetDB.mac == mac)
+# Per-asset change events sent for one scan; larger scans send only the summary
+MAX_ASSET_EVENTS = 500
 
-    existing = (await session.execute(stmt)).scalar_one_or_none()
 
-    if existing is None:
-        asset_id = str(uuid.uuid4())
-        new_asset = AssetDB(
-            id=asset_id,
-            ip=ip,
-            mac=mac,
-            hostname=asset_data.get("hostname"),
-            vendor=asset_data.get("vendor"),
-            os_hint=asset_data.get("os_hint"),
-            bigr_category=asset_data.get("bigr_category", "unclassified"),
-            confidence_score=asset_data.get("confidence_score", 0.0),
-            scan_method=asset_data.get("scan_method", "passive"),
-            first_seen=asset_data.get("first_seen", now_iso),
-            last_seen=asset_data.get("last_seen", now_iso),
-            agent_id=agent_id,
-            site_name=site_name,
-            network_id=network_id,
+def _publish_scan_deltas(scan: ScanDB, changes: list[tuple]) -> None:
+    """Publish ``asset.changed`` events (one per asset) and ``scan.saved``."""
+    per_asset: dict[tuple[str, str | None], dict] = {}
+    for (ip, mac), change_type, field_name, old_value, new_value in changes:
+        delta = per_asset.setdefault(
+            (ip, mac), {"ip": ip, "mac": mac, "change_type": change_type, "fields": {}}
         )
-        session.add(new_asset)
-        await session.flush()
-
-        # Log new-asset change
-        session.add(AssetChangeDB(
-            asset_id=asset_id,
-            scan_id=scan_id,
-            change_type="new_asset",
-            detected_at=now_iso,
-        ))
-        return asset_id
+        if field_name is not None:
+            delta["fields"][field_name] = {"old": old_value, "new": new_value}
+
+    # Published even with nobody listening: deltas must reach the backlog
+    # so a client resuming from Last-Event-ID replays them
+    truncated = len(per_asset) > MAX_ASSET_EVENTS
+    if not truncated:
+        for delta in per_asset.values():
+            publish("asset.changed", {"scan_id": scan.id, "site_name": scan.site_name, **delta})
+
+    publish("scan.saved", {
+        "scan_id": scan.id,
+        "target": scan.target,
+        "scan_method": scan.scan_method,
+        "total_assets": scan.total_assets,
+        "new_assets": sum(1 for d in per_asset.values() if d["change_type"] == "new_asset"),
+        "changed_assets": sum(1 for d in per_asset.values() if d["change_type"] != "new_asset"),
+        "site_name": scan.site_name,
+        "agent_id": scan.agent_id,
+        "asset_events_truncated": truncated,
+    })
+
+
+# Asset columns compared (as strings) to produce field_changed rows
+_TRACKED_ASSET_FIELDS = (
+    "hostname", "vendor", "os_hint", "bigr_category", "confidence_score", "scan_method",
+)
+
+# Bound parameters per prefetch query (well under SQLite/asyncpg limits)
+_PREFETCH_CHUNK = 500
 
-    # Existing asset — detect field changes
-    asset_id = existing.id
-    tracked_fields = {
+
+def _tracked_asset_values(asset_data: dict) -> dict:
+    """Values written to the living asset record for one scanned asset."""
+    return {
         "hostname": asset_data.get("hostname"),
         "vendor": asset_data.get("vendor"),
         "os_hint": asset_data.get("os_hint"),
         "bigr_category": asset_data.get("bigr_category", "unclassified"),
-        "confidence_score": str(asset_data.get("confidence_score", 0.0)),
+        "confidence_score": asset_data.get("confidence_score", 0.0),
         "scan_method": asset_data.get("scan_method", "passive"),
     }
 
-    for field_name, new_value in tracked_fields.items():
-        old_value = getattr(existing, field_name)
+
+def _field_changes(old: dict, new: dict) -> list[tuple[str, str | None, str | None]]:
+    """Return ``(field, old_str, new_str)`` for each tracked field that differs."""
+    changes = []
+    for field_name in _TRACKED_ASSET_FIELDS:
+        old_value, new_value = old[field_name], new[field_name]
         old_str = str(old_value) if old_value is not None else None
         new_str = str(new_value) if new_value is not None else None
         if old_str != new_str:
-            session.add(AssetChangeDB(
-                asset_id=asset_id,
-                scan_id=scan_id,
-                change_type="field_changed",
-                field_name=field_name,
-                old_value=old_str,
-                new_value=new_str,
-                detected_at=now_iso,
-            ))
-
-    # Update living record
-    existing.hostname = asset_data.get("hostname")
-    existing.vendor = asset_data.get("vendor")
-    existing.os_hint = asset_data.get("os_hint")
-    existing.bigr_category = asset_data.get("bigr_category", "unclassified")
-    existing.confidence_score = asset_data.get("confidence_score", 0.0)
-    existing.scan_method = asset_data.get("scan_method", "passive")
-    existing.last_seen = asset_data.get("last_seen", now_iso)
-    if network_id:
-        existing.network_id = network_id
+            changes.append((field_name, old_str, new_str))
+    return changes
 
-    return asset_id
+
+async def _fetch_existing_assets(
+    session: AsyncSession, ips: list[str]
+) -> dict[tuple[str, str | None], dict]:
+    """Load id and tracked fields of existing assets, keyed by (ip, mac)."""
+    columns = [AssetDB.id, AssetDB.ip, AssetDB.mac] + [
+        getattr(AssetDB, name) for name in _TRACKED_ASSET_FIELDS
+    ]
+    existing: dict[tuple[str, str | None], dict] = {}
+    for start in range(0, len(ips), _PREFETCH_CHUNK):
+        chunk = ips[start:start + _PREFETCH_CHUNK]
+        result = await session.execute(select(*columns).where(AssetDB.ip.in_(chunk)))
+        for row in result.mappings():
+            existing[(row["ip"], row["mac"])] = dict(row)
+    return existing
+
+
+def _asset_insert(session: AsyncSession):
+    """Dialect-specific INSERT construct with ON CONFLICT support, if any."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert(AssetDB)
+
+
+async def _insert_new_assets(
+    session: AsyncSession, rows: list[dict]
+) -> dict[tuple[str, str | None], str]:
+    """Insert new assets; return the stored id for each (ip, mac).
+
+    An asset inserted concurrently by another writer (same ip and mac)
+    is updated in place and its existing id returned instead.
+    """
+    ids = {(row["ip"], row["mac"]): row["id"] for row in rows}
+    stmt = _asset_insert(session)
+    if stmt is None:
+        await session.execute(insert(AssetDB), rows)
+        return ids
+
+    refreshed = {name: stmt.excluded[name] for name in _TRACKED_ASSET_FIELDS}
+    refreshed["last_seen"] = stmt.excluded.last_seen
+    refreshed["network_id"] = func.coalesce(stmt.excluded.network_id, AssetDB.network_id)
+    stmt = stmt.on_conflict_do_update(index_elements=["ip", "mac"], set_=refreshed)
+
+    if not session.get_bind().dialect.insert_executemany_returning:
+        await session.execute(stmt, rows)
+        return ids
+    result = await session.execute(
+        stmt.returning(AssetDB.id, AssetDB.ip, AssetDB.mac), rows
+    )
+    for asset_id, ip, mac in result.all():
+        ids[(ip, mac)] = asset_id
+    return ids
+
+
+async def _bulk_upsert_assets(
+    session: AsyncSession,
+    assets: list[dict],
+    scan_id: str,
+    now_iso: str,
+    *,
+    agent_id: str | None = None,
+    site_name: str | None = None,
+    network_id: str | None = None,
+) -> list[tuple]:
+    """Upsert a scan's assets, log their changes and link them to the scan.
+
+    Produces the same ``asset_changes`` rows as processing the assets one
+    by one: ``new_asset`` for unknown (ip, mac) pairs and one
+    ``field_changed`` row per tracked field that differs. An asset listed
+    twice in one scan is compared against its earlier entry.
+
+    Returns the detected changes as ``((ip, mac), change_type,
+    field_name, old_value, new_value)`` tuples.
+    """
+    existing = await _fetch_existing_assets(session, list({a["ip"] for a in assets}))
+
+    inserts: dict[tuple[str, str | None], dict] = {}
+    updates: dict[tuple[str, str | None], dict] = {}
+    # (key, change_type, field_name, old_value, new_value) in detection order
+    changes: list[tuple[tuple[str, str | None], str, str | None, str | None, str | None]] = []
+    scan_links: dict[tuple[str, str | None], dict] = {}
+
+    for asset_data in assets:
+        key = (asset_data["ip"], asset_data.get("mac"))
+        values = _tracked_asset_values(asset_data)
+        last_seen = asset_data.get("last_seen", now_iso)
+
+        current = existing.get(key)
+        if current is None:
+            existing[key] = current = {"id": str(uuid.uuid4()), **values}
+            inserts[key] = {
+                "id": current["id"],
+                "ip": key[0],
+                "mac": key[1],
+                **values,
+                "first_seen": asset_data.get("first_seen", now_iso),
+                "last_seen": last_seen,
+                "agent_id": agent_id,
+                "site_name": site_name,
+                "network_id": network_id,
+            }
+            changes.append((key, "new_asset", None, None, None))
+        else:
+            for field_name, old_str, new_str in _field_changes(current, values):
+                changes.append((key, "field_changed", field_name, old_str, new_str))
+            current.update(values)
+            row = inserts.get(key)
+            if row is None:
+                row = updates.setdefault(key, {"id": current["id"]})
+                if network_id:
+                    row["network_id"] = network_id
+            row.update(values, last_seen=last_seen)
+
+        scan_links.pop(key, None)
+        scan_links[key] = {
+            "scan_id": scan_id,
+            "open_ports": json.dumps(asset_data.get("open_ports", [])),
+            "confidence_score": asset_data.get("confidence_score", 0.0),
+            "bigr_category": asset_data.get("bigr_category", "unclassified"),
+            "raw_evidence": json.dumps(asset_data.get("raw_evidence", {})),
+        }
+
+    ids = {key: current["id"] for key, current in existing.items()}
+    if updates:
+        await session.execute(update(AssetDB), list(updates.values()))
+    if inserts:
+        ids.update(await _insert_new_assets(session, list(inserts.values())))
+
+    await session.execute(
+        insert(ScanAssetDB),
+        [{"asset_id": ids[key], **link} for key, link in scan_links.items()],
+    )
+    if changes:
+        await session.execute(insert(AssetChangeDB), [
+            {
+                "asset_id": ids[key],
+                "scan_id": scan_id,
+                "change_type": change_type,
+                "field_name": field_name,
+                "old_value": old_value,
+                "new_value": new_value,
+                "detected_at": now_iso,
+            }
+            for key, change_type, field_name, old_value, new_value in changes
+        ])
+    return changes
 
 
 async def tag_asset_async(
@@ -573,6 +944,7 @@ async def tag_asset_async(
     )
     await session.execute(stmt)
     await session.commit()
+    bump_inventory_generation()
 
 
 async def update_asset_sensitivity(
@@ -591,6 +963,7 @@ async def update_asset_sensitivity(
     )
     result = await session.execute(stmt)
     await session.commit()
+    bump_inventory_generation()
     return result.rowcount > 0
 
 
@@ -603,6 +976,7 @@ async def untag_asset_async(session: AsyncSession, ip: str) -> None:
     )
     await session.execute(stmt)
     await session.commit()
+    bump_inventory_generation()
 
 
 async def add_subnet_async(
@@ -619,6 +993,7 @@ async def add_subnet_async(
     else:
         session.add(SubnetDB(cidr=cidr, label=label, vlan_id=vlan_id))
     await session.commit()
+    bump_inventory_generation()
 
 
 async def remove_subnet_async(session: AsyncSession, cidr: str) -> None:
@@ -626,14 +1001,20 @@ async def remove_subnet_async(session: AsyncSession, cidr: str) -> None:
     stmt = delete(SubnetDB).where(SubnetDB.cidr == cidr)
     await session.execute(stmt)
     await session.commit()
+    bump_inventory_generation()
 
 
 async def save_certificate_async(
     session: AsyncSession, cert_data: dict
 ) -> None:
-    """Save or update a TLS certificate (upsert on ip+port)."""
+    """Save or update a TLS certificate (upsert on ip+port).
+
+    An unchanged certificate (same ``cert_fingerprint``) only gets its
+    ``last_checked`` and expiry countdown bumped.
+    """
     ip = cert_data["ip"]
     port = cert_data["port"]
+    fingerprint = cert_data.get("cert_fingerprint")
     now_iso = datetime.now(timezone.utc).isoformat()
 
     stmt = select(CertificateDB).where(
@@ -641,7 +1022,11 @@ async def save_certificate_async(
     )
     existing = (await session.execute(stmt)).scalar_one_or_none()
 
-    if existing:
+    if existing and fingerprint and existing.cert_fingerprint == fingerprint:
+        existing.is_expired = int(cert_data.get("is_expired", False))
+        existing.days_until_expiry = cert_data.get("days_until_expiry")
+        existing.last_checked = now_iso
+    elif existing:
         for field in (
             "cn", "issuer", "issuer_org", "valid_from", "valid_to",
             "serial", "key_size", "key_algorithm",
@@ -653,6 +1038,7 @@ async def save_certificate_async(
         existing.days_until_expiry = cert_data.get("days_until_expiry")
         existing.san = json.dumps(cert_data.get("san", []))
         existing.last_checked = now_iso
+        existing.cert_fingerprint = fingerprint
     else:
         session.add(CertificateDB(
             ip=ip,
@@ -670,6 +1056,7 @@ async def save_certificate_async(
             days_until_expiry=cert_data.get("days_until_expiry"),
             san=json.dumps(cert_data.get("san", [])),
             last_checked=now_iso,
+            cert_fingerprint=fingerprint,
         ))
 
     await session.commit()
@@ -740,16 +1127,20 @@ async def resolve_network(
 
 async def get_networks_summary(session: AsyncSession) -> list[dict]:
     """Return all known networks with asset counts."""
-    stmt = select(NetworkDB).order_by(desc(NetworkDB.last_seen))
+    counts = (
+        select(AssetDB.network_id, func.count(AssetDB.id).label("asset_count"))
+        .where(AssetDB.network_id.is_not(None))
+        .group_by(AssetDB.network_id)
+        .subquery()
+    )
+    stmt = (
+        select(NetworkDB, func.coalesce(counts.c.asset_count, 0))
+        .outerjoin(counts, counts.c.network_id == NetworkDB.id)
+        .order_by(desc(NetworkDB.last_seen))
+    )
     result = await session.execute(stmt)
     networks = []
-    for n in result.scalars().all():
-        # Count assets linked to this network
-        count_stmt = select(func.count(AssetDB.id)).where(
-            AssetDB.network_id == n.id
-        )
-        asset_count = (await session.execute(count_stmt)).scalar() or 0
-
+    for n, asset_count in result.all():
         networks.append({
             "id": n.id,
             "fingerprint_hash": n.fingerprint_hash,
@@ -8,9 +8,9 @@ import os
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import Depends, FastAPI
+from fastapi import Depends, FastAPI, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,7 +18,9 @@ from bigr.agent.routes import router as agent_router
 from bigr.ai.api import router as ai_router
 from bigr.collective.api import router as collective_router
 from bigr.core import services
-from bigr.core.database import get_db
+from bigr.core.cache import CachedResponse, ResponseCache, bump_inventory_generation, etag_matches
+from bigr.core.database import get_db, get_session_factory
+from bigr.core.events import event_bus
 from bigr.core.models_db import AssetDB
 from bigr.core.settings import settings
 from bigr.family.api import router as family_router
@@ -48,6 +50,12 @@ def _ip_in_subnet(ip: str, network, subnet_cidr: str | None = None) -> bool:
         return False
 
 
+# Seconds of silence before /api/stream sends a keep-alive comment
+STREAM_HEARTBEAT = 15.0
+# Client reconnect delay advertised to EventSource (milliseconds)
+STREAM_RETRY_MS = 3000
+
+
 def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> FastAPI:
     """Create dashboard FastAPI app.
 
@@ -69,6 +77,8 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
                     "Alembic migration failed — continuing with existing schema"
                 )
         yield
+        # Let open /api/stream responses finish so shutdown is not held up
+        event_bus.disconnect_all()
 
     app = FastAPI(title="BİGR Discovery API", lifespan=lifespan)
 
@@ -123,43 +133,80 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
                 return json.load(f)
         return {"assets": [], "category_summary": {}, "total_assets": 0}
 
+    # Rendered read-endpoint responses, invalidated by inventory writes
+    response_cache = ResponseCache()
+    app.state.response_cache = response_cache
+
+    def _render_cacheable(result) -> bytes | None:
+        if isinstance(result, Response):
+            return None  # Error responses are not cached
+        return JSONResponse(result).body
+
+    async def _cached_response(request: Request, key: tuple, compute) -> Response:
+        """Serve *compute(session)* from the response cache with ETag revalidation.
+
+        The computation is shared by every request waiting on *key* and
+        may outlive the one that started it, so it runs on its own
+        session rather than any request's.
+        """
+        async def _compute():
+            async with get_session_factory()() as session:
+                return await compute(session)
+
+        result = await response_cache.get(key, _compute, _render_cacheable)
+        if not isinstance(result, CachedResponse):
+            return result
+        headers = {"ETag": result.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), result.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(result.body, media_type="application/json", headers=headers)
+
     @app.get("/api/data", response_class=JSONResponse)
     async def api_data(
+        request: Request,
         subnet: str | None = None,
         site: str | None = None,
         network: str | None = None,
-        db: AsyncSession = Depends(get_db),
     ):
-        # Try DB first (always up-to-date from ingest pipeline)
-        try:
-            assets = await services.get_all_assets(
-                db, site_name=site, network_id=network,
-            )
-            if assets:
-                data = {"assets": assets, "total_assets": len(assets)}
-            else:
-                data = await _load_data_async(db)
-        except Exception:
-            data = await _load_data_async(db)
-        # Enrich assets with manual_override flag
-        try:
-            tagged = await services.get_tags_async(db)
-            tagged_ips = {t["ip"] for t in tagged}
-        except Exception:
-            tagged_ips = set()
-        for asset in data.get("assets", []):
-            asset["manual_override"] = asset.get("ip", "") in tagged_ips
-        # Filter by subnet if requested
-        if subnet:
+        """Return the asset inventory, optionally filtered."""
+        async def compute(db: AsyncSession):
             try:
-                network = ipaddress.ip_network(subnet, strict=False)
-                data["assets"] = [
-                    a for a in data.get("assets", [])
-                    if _ip_in_subnet(a.get("ip", ""), network, a.get("subnet_cidr"))
-                ]
+                subnet_net = ipaddress.ip_network(subnet, strict=False) if subnet else None
             except ValueError:
+                subnet_net = None  # Ignore an unparseable filter
+            # Try DB first (always up-to-date from ingest pipeline); the subnet
+            # filter is a range scan on the indexed ip_int / ip_v6 columns.
+            # A subnet with no inventory assets is a real empty result; only
+            # an empty unfiltered inventory falls back to scan / file data
+            data = None
+            try:
+                assets = await services.get_all_assets(
+                    db, site_name=site, network_id=network,
+                    subnet=str(subnet_net) if subnet_net else None,
+                )
+                if assets or subnet_net is not None:
+                    data = {"assets": assets, "total_assets": len(assets)}
+            except Exception:
                 pass
-        return data
+            if data is None:
+                data = await _load_data_async(db)
+                # The DB query failed: filter the fallback data here
+                if subnet_net is not None:
+                    data["assets"] = [
+                        a for a in data.get("assets", [])
+                        if _ip_in_subnet(a.get("ip", ""), subnet_net, a.get("subnet_cidr"))
+                    ]
+            # Enrich assets with manual_override flag
+            try:
+                tagged = await services.get_tags_async(db)
+                tagged_ips = {t["ip"] for t in tagged}
+            except Exception:
+                tagged_ips = set()
+            for asset in data.get("assets", []):
+                asset["manual_override"] = asset.get("ip", "") in tagged_ips
+            return data
+
+        return await _cached_response(request, ("data", subnet, site, network), compute)
 
     @app.get("/api/subnets", response_class=JSONResponse)
     async def api_subnets(db: AsyncSession = Depends(get_db)):
@@ -179,6 +226,103 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
         except Exception:
             return {"scans": []}
 
+    @app.get("/api/stream")
+    async def api_stream(
+        request: Request,
+        topics: str | None = None,
+        last_event_id: str | None = None,
+    ):
+        """Server-Sent Events feed of inventory and scan changes.
+
+        ``topics`` is a comma-separated list of topic prefixes (e.g.
+        ``asset,shield.scan``); by default every topic is sent. A
+        reconnecting client resumes after ``Last-Event-ID`` (header or
+        ``last_event_id`` query parameter); a ``resync`` event means
+        events were missed (or the id predates a server restart) and
+        views should be refetched.
+        """
+        if last_event_id is None:
+            last_event_id = request.headers.get("last-event-id") or None
+        prefixes = [t.strip() for t in topics.split(",") if t.strip()] if topics else None
+
+        async def _events():
+            # Subscribed here so a stream that never starts cannot leak it;
+            # the server cancels the generator when the client goes away
+            subscription = event_bus.subscribe(prefixes, last_event_id)
+            try:
+                yield f"retry: {STREAM_RETRY_MS}\n\n".encode()
+                while True:
+                    try:
+                        event = await subscription.get(timeout=STREAM_HEARTBEAT)
+                    except TimeoutError:
+                        yield b": keep-alive\n\n"
+                        continue
+                    if event is None:
+                        return
+                    yield event.to_sse()
+            finally:
+                subscription.close()
+
+        return StreamingResponse(
+            _events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/api/assets", response_class=JSONResponse)
+    async def api_assets(
+        fields: str | None = None,
+        site: str | None = None,
+        network: str | None = None,
+        category: str | None = None,
+        subnet: str | None = None,
+        cursor: str | None = None,
+        limit: int = Query(
+            services.DEFAULT_ASSET_PAGE_SIZE, ge=1, le=services.MAX_ASSET_PAGE_SIZE,
+        ),
+        format: str = Query("json", pattern="^(json|ndjson)$"),
+        db: AsyncSession = Depends(get_db),
+    ):
+        """Keyset-paginated asset listing with projection and filters.
+
+        ``format=ndjson`` streams every matching asset, one JSON object
+        per line, starting at ``cursor`` (if given).
+        """
+        try:
+            columns = services.parse_asset_fields(fields)
+            if cursor:
+                services.decode_asset_cursor(cursor)
+            if subnet:
+                ipaddress.ip_network(subnet, strict=False)
+        except ValueError as exc:
+            return JSONResponse({"error": str(exc)}, status_code=400)
+        filters = {
+            "fields": columns, "site_name": site, "network_id": network,
+            "category": category, "subnet": subnet,
+        }
+
+        if format == "ndjson":
+            async def _export():
+                # The request session closes with the handler; stream on our own
+                async with get_session_factory()() as session:
+                    page_cursor = cursor
+                    while True:
+                        page, page_cursor = await services.get_assets_page(
+                            session, cursor=page_cursor,
+                            limit=services.MAX_ASSET_PAGE_SIZE, **filters,
+                        )
+                        if page:
+                            yield "".join(json.dumps(a) + "\n" for a in page)
+                        if page_cursor is None:
+                            return
+
+            return StreamingResponse(_export(), media_type="application/x-ndjson")
+
+        page, next_cursor = await services.get_assets_page(
+            db, cursor=cursor, limit=limit, **filters,
+        )
+        return {"assets": page, "next_cursor": next_cursor}
+
     @app.get("/api/assets/{ip}", response_class=JSONResponse)
     async def api_asset_detail(ip: str, db: AsyncSession = Depends(get_db)):
         """Return single asset details and scan history."""
@@ -234,6 +378,7 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
                 )
                 await db.execute(stmt)
                 await db.commit()
+                bump_inventory_generation()
             else:
                 # Fallback to IP if no MAC (rare edge case)
                 await services.tag_asset_async(db, ip, "acknowledged", "Kullanici tarafindan tanindi")
@@ -254,6 +399,7 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
             )
             result = await db.execute(stmt)
             await db.commit()
+            bump_inventory_generation()
             if result.rowcount == 0:
                 return JSONResponse({"error": "Asset not found"}, status_code=404)
             return {"status": "ok", "ip": ip, "message": "Cihaz engellendi."}
@@ -292,12 +438,15 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
             return {"switches": []}
 
     @app.get("/api/topology", response_class=JSONResponse)
-    async def api_topology(db: AsyncSession = Depends(get_db)):
+    async def api_topology(request: Request):
         """Return network topology graph data."""
-        data = await _load_data_async(db)
-        assets = data.get("assets", [])
-        graph = build_topology(assets)
-        return graph.to_dict()
+        async def compute(db: AsyncSession):
+            data = await _load_data_async(db)
+            assets = data.get("assets", [])
+            graph = build_topology(assets)
+            return graph.to_dict()
+
+        return await _cached_response(request, ("topology",), compute)
 
     @app.get("/api/topology/subnet/{cidr:path}", response_class=JSONResponse)
     async def api_topology_subnet(cidr: str, db: AsyncSession = Depends(get_db)):
@@ -308,33 +457,48 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
         return graph.to_dict()
 
     @app.get("/api/certificates", response_class=JSONResponse)
-    async def api_certificates(db: AsyncSession = Depends(get_db)):
-        """Return all discovered TLS certificates."""
+    async def api_certificates(
+        fingerprint: str | None = None,
+        db: AsyncSession = Depends(get_db),
+    ):
+        """Return discovered TLS certificates.
+
+        With ``fingerprint`` (SHA-256 of the DER cert), only the hosts
+        serving that certificate.
+        """
         try:
-            cert_list = await services.get_certificates_async(db)
+            cert_list = await services.get_certificates_async(db, fingerprint=fingerprint)
             return {"certificates": cert_list}
         except Exception:
             return {"certificates": []}
 
     @app.get("/api/compliance", response_class=JSONResponse)
-    async def api_compliance(db: AsyncSession = Depends(get_db)):
+    async def api_compliance(request: Request):
         """Return compliance metrics."""
         from bigr.compliance import calculate_compliance, calculate_subnet_compliance
 
-        data = await _load_data_async(db)
-        assets = data.get("assets", [])
+        async def compute(db: AsyncSession):
+            data = await _load_data_async(db)
+            assets = data.get("assets", [])
 
-        report = calculate_compliance(assets)
+            report = calculate_compliance(assets)
 
-        # Calculate subnet compliance if subnets are registered
-        try:
-            subnet_list = await services.get_subnets_async(db)
-            if subnet_list:
-                report.subnet_compliance = calculate_subnet_compliance(assets, subnet_list)
-        except Exception:
-            pass
+            # Calculate subnet compliance if subnets are registered; scans from
+            # the database are grouped in SQL, fallback JSON data in Python
+            try:
+                subnet_list = await services.get_subnets_async(db)
+                if subnet_list and data.get("id"):
+                    report.subnet_compliance = await services.get_subnet_compliance_async(
+                        db, subnet_list, scan_id=data["id"],
+                    )
+                elif subnet_list:
+                    report.subnet_compliance = calculate_subnet_compliance(assets, subnet_list)
+            except Exception:
+                pass
+
+            return report.to_dict()
 
-        return report.to_dict()
+        return await _cached_response(request, ("compliance",), compute)
 
     @app.get("/api/analytics", response_class=JSONResponse)
     async def api_analytics(days: int = 30, db: AsyncSession = Depends(get_db)):
@@ -348,63 +512,69 @@ def create_app(data_path: str = "assets.json", db_path: Path | None = None) -> F
             return JSONResponse({"error": str(exc)}, status_code=500)
 
     @app.get("/api/risk", response_class=JSONResponse)
-    async def api_risk(db: AsyncSession = Depends(get_db)):
+    async def api_risk(request: Request):
         """Return risk assessment data."""
         from bigr.risk.scorer import assess_network_risk
 
-        try:
-            all_assets = await services.get_all_assets(db)
-        except Exception:
-            all_assets = []
+        async def compute(db: AsyncSession):
+            try:
+                all_assets = await services.get_all_assets(db)
+            except Exception:
+                all_assets = []
 
-        # Fall back to file-based data if DB has no assets
-        if not all_assets:
-            data = await _load_data_async(db)
-            all_assets = data.get("assets", [])
-
-        asset_dicts = []
-        for a in all_assets:
-            asset_dicts.append({
-                "ip": a.get("ip", ""),
-                "mac": a.get("mac"),
-                "hostname": a.get("hostname"),
-                "vendor": a.get("vendor"),
-                "bigr_category": a.get("bigr_category", "unclassified"),
-                "confidence_score": a.get("confidence_score", 0.0),
-                "open_ports": a.get("open_ports", []),
-                "first_seen": a.get("first_seen"),
-            })
-
-        report = assess_network_risk(asset_dicts)
-        return report.to_dict()
+            # Fall back to file-based data if DB has no assets
+            if not all_assets:
+                data = await _load_data_async(db)
+                all_assets = data.get("assets", [])
+
+            asset_dicts = []
+            for a in all_assets:
+                asset_dicts.append({
+                    "ip": a.get("ip", ""),
+                    "mac": a.get("mac"),
+                    "hostname": a.get("hostname"),
+                    "vendor": a.get("vendor"),
+                    "bigr_category": a.get("bigr_category", "unclassified"),
+                    "confidence_score": a.get("confidence_score", 0.0),
+                    "open_ports": a.get("open_ports", []),
+                    "first_seen": a.get("first_seen"),
+                })
+
+            report = assess_network_risk(asset_dicts)
+            return report.to_dict()
+
+        return await _cached_response(request, ("risk",), compute)
 
     @app.get("/api/vulnerabilities", response_class=JSONResponse)
-    async def api_vulnerabilities(db: AsyncSession = Depends(get_db)):
+    async def api_vulnerabilities(request: Request):
         """Return vulnerability scan results for all known assets."""
         from bigr.vuln.cve_db import get_cve_stats, init_cve_db
         from bigr.vuln.matcher import scan_all_vulnerabilities
         from bigr.vuln.nvd_sync import seed_cve_database
 
-        try:
-            # Initialize and seed CVE DB if needed
-            init_cve_db(None)
-            stats = get_cve_stats(db_path=None)
-            if stats["total"] == 0:
-                seed_cve_database(db_path=None)
-
-            # Get assets
-            data = await _load_data_async(db)
-            assets = data.get("assets", [])
+        async def compute(db: AsyncSession):
+            try:
+                # Initialize and seed CVE DB if needed
+                init_cve_db(None)
+                stats = get_cve_stats(db_path=None)
+                if stats["total"] == 0:
+                    seed_cve_database(db_path=None)
 
-            summaries = scan_all_vulnerabilities(assets, db_path=None)
-            return {
-                "summaries": [s.to_dict() for s in summaries],
-                "total_assets_scanned": len(assets),
-                "total_vulnerable": len(summaries),
-                "cve_db_stats": get_cve_stats(db_path=None),
-            }
-        except Exception as exc:
-            return JSONResponse({"error": str(exc)}, status_code=500)
+                # Get assets
+                data = await _load_data_async(db)
+                assets = data.get("assets", [])
+
+                summaries = scan_all_vulnerabilities(assets, db_path=None)
+                return {
+                    "summaries": [s.to_dict() for s in summaries],
+                    "total_assets_scanned": len(assets),
+                    "total_vulnerable": len(summaries),
+                    "cve_db_stats": get_cve_stats(db_path=None),
+                }
+            except Exception as exc:
+                return JSONResponse({"error": str(exc)}, status_code=500)
+
+        return await _cached_response(request, ("vulnerabilities",), compute)
 
     @app.get("/api/health")
     async def health(db: AsyncSession = Depends(get_db)):
@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
 
+from bigr.core.cache import bump_inventory_generation
 from bigr.models import Asset, BigrCategory, ScanMethod, ScanResult
+from bigr.sqlite_pool import get_connection
 
 _DEFAULT_DIR = Path.home() / ".bigr"
 
@@ -20,17 +23,35 @@ def get_db_path() -> Path:
 
 
 def _connect(db_path: Path | None = None) -> sqlite3.Connection:
-    """Open a connection with row factory enabled."""
-    path = db_path or get_db_path()
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    """Return this thread's pooled connection (row factory enabled).
+
+    ``close()`` hands the connection back to the pool; see
+    :mod:`bigr.sqlite_pool` for the pragma profile.
+    """
+    return get_connection(db_path or get_db_path())
+
+
+# Database files whose schema has been created/migrated by this process
+_initialized: set[str] = set()
+_init_lock = threading.Lock()
 
 
 def init_db(db_path: Path | None = None) -> None:
-    """Create tables if they do not exist."""
+    """Create tables if they do not exist.
+
+    Runs the schema script once per database file per process; later
+    calls only check that the file still exists.
+    """
+    path = db_path or get_db_path()
+    key = str(path)
+    if key in _initialized and path.exists():
+        return
+    with _init_lock:
+        _create_schema(path)
+        _initialized.add(key)
+
+
+def _create_schema(db_path: Path) -> None:
     conn = _connect(db_path)
     try:
         conn.executescript("""
@@ -41,7 +62,8 @@ def init_db(db_path: Path | None = None) -> None:
                 started_at  TEXT NOT NULL,
                 completed_at TEXT,
                 total_assets INTEGER NOT NULL DEFAULT 0,
-                is_root     INTEGER NOT NULL DEFAULT 0
+                is_root     INTEGER NOT NULL DEFAULT 0,
+                is_partial  INTEGER NOT NULL DEFAULT 0
             );
 
             CREATE TABLE IF NOT EXISTS assets (
@@ -59,6 +81,7 @@ def init_db(db_path: Path | None = None) -> None:
                 manual_category TEXT,
                 manual_note     TEXT,
                 is_ignored      INTEGER NOT NULL DEFAULT 0,
+                ports_checked_at TEXT,
                 UNIQUE(ip, mac)
             );
 
@@ -121,13 +144,31 @@ def init_db(db_path: Path | None = None) -> None:
                 days_until_expiry INTEGER,
                 san             TEXT,
                 last_checked    TEXT NOT NULL,
+                cert_fingerprint TEXT,
                 UNIQUE(ip, port)
             );
+
+            CREATE TABLE IF NOT EXISTS watcher_baselines (
+                subnet       TEXT NOT NULL,
+                ip           TEXT NOT NULL,
+                mac          TEXT NOT NULL DEFAULT '',
+                content_hash INTEGER NOT NULL,
+                fields       TEXT NOT NULL,
+                PRIMARY KEY (subnet, ip, mac)
+            );
         """)
         # Add switch columns to assets if they don't exist yet (migration-safe)
         _add_column_if_missing(conn, "assets", "switch_host", "TEXT")
         _add_column_if_missing(conn, "assets", "switch_port", "TEXT")
         _add_column_if_missing(conn, "assets", "switch_port_index", "INTEGER")
+        # Incremental scan bookkeeping
+        _add_column_if_missing(conn, "scans", "is_partial", "INTEGER NOT NULL DEFAULT 0")
+        _add_column_if_missing(conn, "assets", "ports_checked_at", "TEXT")
+        # Content-addressed certificates ("which hosts share this cert")
+        _add_column_if_missing(conn, "certificates", "cert_fingerprint", "TEXT")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_certificates_fingerprint ON certificates(cert_fingerprint)"
+        )
 
         conn.commit()
     finally:
@@ -147,148 +188,177 @@ def _add_column_if_missing(
 def save_scan(scan_result: ScanResult, db_path: Path | None = None) -> str:
     """Save an entire scan result, upserting assets and detecting changes.
 
+    Existing rows for the scan's assets are fetched in one query, changes
+    are computed in memory, and all writes go through ``executemany``
+    in a single transaction.
+
     Returns the generated scan_id.
     """
     init_db(db_path)
     conn = _connect(db_path)
     scan_id = str(uuid.uuid4())
     now_iso = datetime.now(timezone.utc).isoformat()
+    checked_at = scan_result.started_at.isoformat()
 
     try:
-        # Insert scan record
-        conn.execute(
-            """INSERT INTO scans (id, target, scan_method, started_at, completed_at, total_assets, is_root)
-               VALUES (?, ?, ?, ?, ?, ?, ?)""",
-            (
-                scan_id,
-                scan_result.target,
-                scan_result.scan_method.value,
-                scan_result.started_at.isoformat(),
-                scan_result.completed_at.isoformat() if scan_result.completed_at else None,
-                len(scan_result.assets),
-                int(scan_result.is_root),
-            ),
-        )
+        existing = _fetch_existing_assets(conn, scan_result.assets)
+
+        new_rows: list[tuple] = []
+        update_rows: list[tuple] = []
+        change_rows: list[tuple] = []
+        scan_asset_rows: dict[str, tuple] = {}
 
         for asset in scan_result.assets:
-            asset_id = _upsert_asset(conn, asset, scan_id, now_iso)
+            ports_checked_at = None if asset.raw_evidence.get("ports_carried_forward") else checked_at
+            key = (asset.ip, asset.mac)
+            row = existing.get(key)
+
+            if row is None:
+                # New asset
+                asset_id = str(uuid.uuid4())
+                new_rows.append((
+                    asset_id,
+                    asset.ip,
+                    asset.mac,
+                    asset.hostname,
+                    asset.vendor,
+                    asset.os_hint,
+                    asset.bigr_category.value,
+                    asset.confidence_score,
+                    asset.scan_method.value,
+                    asset.first_seen.isoformat(),
+                    asset.last_seen.isoformat(),
+                    ports_checked_at,
+                ))
+                change_rows.append((asset_id, scan_id, "new_asset", None, None, None, now_iso))
+            else:
+                # Existing asset — detect field changes and update
+                asset_id = row["id"]
+                for field_name, old_str, new_str in _asset_field_changes(row, asset):
+                    change_rows.append(
+                        (asset_id, scan_id, "field_changed", field_name, old_str, new_str, now_iso)
+                    )
+                update_rows.append((
+                    asset.hostname,
+                    asset.vendor,
+                    asset.os_hint,
+                    asset.bigr_category.value,
+                    asset.confidence_score,
+                    asset.scan_method.value,
+                    asset.last_seen.isoformat(),
+                    ports_checked_at,
+                    asset_id,
+                ))
 
-            # Insert scan_assets junction
+            # Later duplicates of the same asset see this one as its state
+            existing[key] = _tracked_row(asset_id, asset)
+            scan_asset_rows[asset_id] = (
+                scan_id,
+                asset_id,
+                json.dumps(asset.open_ports),
+                asset.confidence_score,
+                asset.bigr_category.value,
+                json.dumps(asset.raw_evidence),
+            )
+
+        with conn:
             conn.execute(
-                """INSERT INTO scan_assets (scan_id, asset_id, open_ports, confidence_score, bigr_category, raw_evidence)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
+                """INSERT INTO scans (id, target, scan_method, started_at, completed_at, total_assets, is_root, is_partial)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
                 (
                     scan_id,
-                    asset_id,
-                    json.dumps(asset.open_ports),
-                    asset.confidence_score,
-                    asset.bigr_category.value,
-                    json.dumps(asset.raw_evidence),
+                    scan_result.target,
+                    scan_result.scan_method.value,
+                    checked_at,
+                    scan_result.completed_at.isoformat() if scan_result.completed_at else None,
+                    len(scan_result.assets),
+                    int(scan_result.is_root),
+                    int(scan_result.is_partial),
                 ),
             )
-
-        conn.commit()
+            conn.executemany(
+                """INSERT INTO assets
+                   (id, ip, mac, hostname, vendor, os_hint, bigr_category,
+                    confidence_score, scan_method, first_seen, last_seen, ports_checked_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                new_rows,
+            )
+            # Update the living record (always update last_seen; update fields)
+            conn.executemany(
+                """UPDATE assets SET
+                       hostname = ?,
+                       vendor = ?,
+                       os_hint = ?,
+                       bigr_category = ?,
+                       confidence_score = ?,
+                       scan_method = ?,
+                       last_seen = ?,
+                       ports_checked_at = COALESCE(?, ports_checked_at)
+                   WHERE id = ?""",
+                update_rows,
+            )
+            conn.executemany(
+                """INSERT INTO asset_changes
+                   (asset_id, scan_id, change_type, field_name, old_value, new_value, detected_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                change_rows,
+            )
+            conn.executemany(
+                """INSERT INTO scan_assets (scan_id, asset_id, open_ports, confidence_score, bigr_category, raw_evidence)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                list(scan_asset_rows.values()),
+            )
+        bump_inventory_generation()
         return scan_id
     finally:
         conn.close()
 
 
-def _upsert_asset(
-    conn: sqlite3.Connection,
-    asset: Asset,
-    scan_id: str,
-    now_iso: str,
-) -> str:
-    """Insert or update an asset row. Detects and logs changes. Returns asset_id."""
-    mac_val = asset.mac  # may be None
-    # Look up existing asset by (ip, mac) — handle NULL mac with IS
-    if mac_val is None:
-        row = conn.execute(
-            "SELECT * FROM assets WHERE ip = ? AND mac IS NULL", (asset.ip,)
-        ).fetchone()
-    else:
-        row = conn.execute(
-            "SELECT * FROM assets WHERE ip = ? AND mac = ?", (asset.ip, mac_val)
-        ).fetchone()
+# Asset columns compared on re-discovery; changes are logged to asset_changes
+_ASSET_TRACKED_COLUMNS = ("hostname", "vendor", "os_hint", "bigr_category", "confidence_score", "scan_method")
 
-    if row is None:
-        # New asset
-        asset_id = str(uuid.uuid4())
-        conn.execute(
-            """INSERT INTO assets
-               (id, ip, mac, hostname, vendor, os_hint, bigr_category,
-                confidence_score, scan_method, first_seen, last_seen)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                asset_id,
-                asset.ip,
-                mac_val,
-                asset.hostname,
-                asset.vendor,
-                asset.os_hint,
-                asset.bigr_category.value,
-                asset.confidence_score,
-                asset.scan_method.value,
-                asset.first_seen.isoformat(),
-                asset.last_seen.isoformat(),
-            ),
-        )
-        # Log as new-asset change
-        conn.execute(
-            """INSERT INTO asset_changes
-               (asset_id, scan_id, change_type, detected_at)
-               VALUES (?, ?, 'new_asset', ?)""",
-            (asset_id, scan_id, now_iso),
-        )
-        return asset_id
 
-    # Existing asset — detect field changes and update
-    asset_id = row["id"]
-    tracked_fields = {
+def _fetch_existing_assets(
+    conn: sqlite3.Connection, assets: list[Asset]
+) -> dict[tuple[str, str | None], dict]:
+    """Load the stored rows for the given assets in one query, keyed by (ip, mac)."""
+    if not assets:
+        return {}
+    ips = json.dumps(sorted({a.ip for a in assets}))
+    rows = conn.execute(
+        f"""SELECT id, ip, mac, {", ".join(_ASSET_TRACKED_COLUMNS)} FROM assets
+            WHERE ip IN (SELECT value FROM json_each(?))""",
+        (ips,),
+    ).fetchall()
+    return {(r["ip"], r["mac"]): dict(r) for r in rows}
+
+
+def _tracked_row(asset_id: str, asset: Asset) -> dict:
+    """The stored-row view of an asset after it has been written."""
+    return {
+        "id": asset_id,
         "hostname": asset.hostname,
         "vendor": asset.vendor,
         "os_hint": asset.os_hint,
         "bigr_category": asset.bigr_category.value,
-        "confidence_score": str(asset.confidence_score),
+        "confidence_score": asset.confidence_score,
         "scan_method": asset.scan_method.value,
     }
 
-    for field_name, new_value in tracked_fields.items():
+
+def _asset_field_changes(row: dict, asset: Asset) -> list[tuple[str, str | None, str | None]]:
+    """Return ``(field, old, new)`` for each tracked column that changed."""
+    new_values = _tracked_row(row["id"], asset)
+    changes = []
+    for field_name in _ASSET_TRACKED_COLUMNS:
         old_value = row[field_name]
+        new_value = new_values[field_name]
         # Normalize for comparison
         old_str = str(old_value) if old_value is not None else None
         new_str = str(new_value) if new_value is not None else None
         if old_str != new_str:
-            conn.execute(
-                """INSERT INTO asset_changes
-                   (asset_id, scan_id, change_type, field_name, old_value, new_value, detected_at)
-                   VALUES (?, ?, 'field_changed', ?, ?, ?, ?)""",
-                (asset_id, scan_id, field_name, old_str, new_str, now_iso),
-            )
-
-    # Update the living record (always update last_seen; update fields)
-    conn.execute(
-        """UPDATE assets SET
-               hostname = ?,
-               vendor = ?,
-               os_hint = ?,
-               bigr_category = ?,
-               confidence_score = ?,
-               scan_method = ?,
-               last_seen = ?
-           WHERE id = ?""",
-        (
-            asset.hostname,
-            asset.vendor,
-            asset.os_hint,
-            asset.bigr_category.value,
-            asset.confidence_score,
-            asset.scan_method.value,
-            asset.last_seen.isoformat(),
-            asset_id,
-        ),
-    )
-    return asset_id
+            changes.append((field_name, old_str, new_str))
+    return changes
 
 
 # ---------------------------------------------------------------------------
@@ -358,6 +428,112 @@ def get_asset_history(
         conn.close()
 
 
+def get_port_baseline(db_path: Path | None = None) -> dict[str, dict]:
+    """Return the last known port state per IP for incremental scans.
+
+    Maps each IP to ``{"mac", "open_ports", "scanned_ports",
+    "ports_checked_at"}`` taken from the asset's most recent
+    ``scan_assets`` row; ``scanned_ports`` (the ports that scan probed)
+    is empty if it was not recorded. When several assets share an IP,
+    the most recently seen one wins.
+    """
+    init_db(db_path)
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            """SELECT ip, mac, ports_checked_at, open_ports, scanned_ports FROM (
+                   SELECT a.ip, a.mac, a.last_seen, a.ports_checked_at, sa.open_ports,
+                          json_extract(sa.raw_evidence, '$.scanned_ports') AS scanned_ports,
+                          ROW_NUMBER() OVER (
+                              PARTITION BY sa.asset_id ORDER BY s.started_at DESC
+                          ) AS rn
+                   FROM assets a
+                   JOIN scan_assets sa ON sa.asset_id = a.id
+                   JOIN scans s ON s.id = sa.scan_id
+               )
+               WHERE rn = 1
+               ORDER BY last_seen ASC"""
+        ).fetchall()
+        return {
+            r["ip"]: {
+                "mac": r["mac"],
+                "open_ports": json.loads(r["open_ports"] or "[]"),
+                "scanned_ports": json.loads(r["scanned_ports"] or "[]"),
+                "ports_checked_at": r["ports_checked_at"],
+            }
+            for r in rows
+        }
+    finally:
+        conn.close()
+
+
+def save_watcher_baseline(
+    subnet: str, records: list[dict], db_path: Path | None = None
+) -> None:
+    """Replace a watcher target's diff baseline with ``records``.
+
+    ``records`` come from :func:`bigr.diff.baseline_record`. Only rows
+    whose ``content_hash`` changed are rewritten, and assets no longer
+    present are deleted, all in one transaction.
+    """
+    init_db(db_path)
+    conn = _connect(db_path)
+    try:
+        existing = {
+            (r["ip"], r["mac"]): r["content_hash"]
+            for r in conn.execute(
+                "SELECT ip, mac, content_hash FROM watcher_baselines WHERE subnet = ?", (subnet,)
+            )
+        }
+        seen: set[tuple[str, str]] = set()
+        upserts: list[tuple] = []
+        for record in records:
+            key = (record["ip"], record.get("mac") or "")
+            seen.add(key)
+            if existing.get(key) != record["content_hash"]:
+                fields = {
+                    k: v for k, v in record.items() if k not in ("ip", "mac", "content_hash")
+                }
+                upserts.append((subnet, *key, record["content_hash"], json.dumps(fields)))
+        conn.executemany(
+            """INSERT INTO watcher_baselines (subnet, ip, mac, content_hash, fields)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(subnet, ip, mac) DO UPDATE SET
+                   content_hash = excluded.content_hash,
+                   fields = excluded.fields""",
+            upserts,
+        )
+        conn.executemany(
+            "DELETE FROM watcher_baselines WHERE subnet = ? AND ip = ? AND mac = ?",
+            [(subnet, *key) for key in existing.keys() - seen],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def get_watcher_baseline(subnet: str, db_path: Path | None = None) -> list[dict]:
+    """Return a watcher target's stored baseline records (empty if none)."""
+    init_db(db_path)
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT ip, mac, content_hash, fields FROM watcher_baselines WHERE subnet = ?",
+            (subnet,),
+        ).fetchall()
+        return [
+            {
+                "ip": r["ip"],
+                "mac": r["mac"] or None,
+                "content_hash": r["content_hash"],
+                **json.loads(r["fields"]),
+            }
+            for r in rows
+        ]
+    finally:
+        conn.close()
+
+
 def get_all_assets(db_path: Path | None = None) -> list[dict]:
     """Return all known assets from the living inventory."""
     init_db(db_path)
@@ -499,6 +675,7 @@ def _scan_row_to_dict(conn: sqlite3.Connection, scan_row: sqlite3.Row) -> dict:
     """Convert a scan row + its joined assets into a rich dict."""
     scan = dict(scan_row)
     scan["is_root"] = bool(scan["is_root"])
+    scan["is_partial"] = bool(scan.get("is_partial"))
 
     # Compute duration
     if scan.get("completed_at") and scan.get("started_at"):
@@ -577,7 +754,9 @@ def ConfidenceLevel_from_score(score: float) -> str:
 def save_certificate(cert, db_path: Path | None = None) -> None:
     """Save or update a TLS certificate record.
 
-    Uses UPSERT on (ip, port) unique constraint.
+    Uses UPSERT on (ip, port) unique constraint. If the stored record has
+    the same ``cert_fingerprint``, only ``last_checked`` and the expiry
+    countdown are updated.
     """
     from bigr.scanner.tls import CertificateInfo
 
@@ -585,12 +764,29 @@ def save_certificate(cert, db_path: Path | None = None) -> None:
     conn = _connect(db_path)
     now_iso = datetime.now(timezone.utc).isoformat()
     try:
+        if cert.cert_fingerprint:
+            cursor = conn.execute(
+                """UPDATE certificates SET last_checked = ?, days_until_expiry = ?, is_expired = ?
+                   WHERE ip = ? AND port = ? AND cert_fingerprint = ?""",
+                (
+                    now_iso,
+                    cert.days_until_expiry,
+                    int(cert.is_expired),
+                    cert.ip,
+                    cert.port,
+                    cert.cert_fingerprint,
+                ),
+            )
+            if cursor.rowcount:
+                conn.commit()
+                return
+
         conn.execute(
             """INSERT INTO certificates
                (ip, port, cn, issuer, issuer_org, valid_from, valid_to,
                 serial, key_size, key_algorithm, is_self_signed, is_expired,
-                days_until_expiry, san, last_checked)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                days_until_expiry, san, last_checked, cert_fingerprint)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                ON CONFLICT(ip, port) DO UPDATE SET
                 cn = excluded.cn,
                 issuer = excluded.issuer,
@@ -604,7 +800,8 @@ def save_certificate(cert, db_path: Path | None = None) -> None:
                 is_expired = excluded.is_expired,
                 days_until_expiry = excluded.days_until_expiry,
                 san = excluded.san,
-                last_checked = excluded.last_checked""",
+                last_checked = excluded.last_checked,
+                cert_fingerprint = excluded.cert_fingerprint""",
             (
                 cert.ip,
                 cert.port,
@@ -621,6 +818,7 @@ def save_certificate(cert, db_path: Path | None = None) -> None:
                 cert.days_until_expiry,
                 json.dumps(cert.san),
                 now_iso,
+                cert.cert_fingerprint,
             ),
         )
         conn.commit()
@@ -651,6 +849,32 @@ def get_certificates(db_path: Path | None = None) -> list[dict]:
         conn.close()
 
 
+def get_certificates_by_fingerprint(
+    fingerprint: str, db_path: Path | None = None
+) -> list[dict]:
+    """Return every (ip, port) serving the certificate with this SHA-256 fingerprint."""
+    init_db(db_path)
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT * FROM certificates WHERE cert_fingerprint = ? ORDER BY ip, port",
+            (fingerprint,),
+        ).fetchall()
+        result = []
+        for row in rows:
+            d = dict(row)
+            d["is_self_signed"] = bool(d.get("is_self_signed"))
+            d["is_expired"] = bool(d.get("is_expired"))
+            try:
+                d["san"] = json.loads(d.get("san") or "[]")
+            except (json.JSONDecodeError, TypeError):
+                d["san"] = []
+            result.append(d)
+        return result
+    finally:
+        conn.close()
+
+
 def get_expiring_certificates(
     days: int = 30, db_path: Path | None = None
 ) -> list[dict]:
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-import sqlite3
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -53,6 +53,11 @@ def _asset_key(asset: dict) -> tuple[str, str | None]:
     return (asset.get("ip", ""), asset.get("mac"))
 
 
+def _sort_key(key: tuple[str, str | None]) -> tuple[str, str]:
+    """Sort key tolerating a missing MAC."""
+    return (key[0], key[1] or "")
+
+
 # Fields to compare and their corresponding change_type labels.
 _TRACKED_FIELDS: dict[str, str] = {
     "open_ports": "port_change",
@@ -63,6 +68,18 @@ _TRACKED_FIELDS: dict[str, str] = {
 }
 
 
+# Fields an incremental scan copies from the baseline instead of measuring.
+# For assets flagged ``ports_carried_forward`` these are merged from the
+# previous scan so stale carried data never shows up as a change.
+_CARRIED_FIELDS: frozenset[str] = frozenset({"open_ports"})
+
+
+def _is_carried_forward(asset: dict) -> bool:
+    """True if the asset's ports were carried forward, not rescanned."""
+    evidence = asset.get("raw_evidence")
+    return isinstance(evidence, dict) and bool(evidence.get("ports_carried_forward"))
+
+
 def _normalize_field(field_name: str, value: object) -> str | None:
     """Normalize a field value to a comparable string representation."""
     if value is None:
@@ -70,7 +87,10 @@ def _normalize_field(field_name: str, value: object) -> str | None:
     if field_name == "open_ports":
         # Lists may come as list[int] or already-serialized strings
         if isinstance(value, list):
-            return json.dumps(sorted(value))
+            ports = sorted(value)
+            if all(type(p) is int for p in ports):
+                return repr(ports)  # same text as json.dumps for ints, cheaper
+            return json.dumps(ports)
         return str(value)
     if field_name == "confidence_score":
         try:
@@ -80,9 +100,47 @@ def _normalize_field(field_name: str, value: object) -> str | None:
     return str(value)
 
 
+def asset_digest(asset: dict) -> int:
+    """Return a 64-bit digest of the asset's normalized tracked fields.
+
+    Two assets with equal digests have equal tracked fields, so
+    :func:`diff_scans` can skip them with one integer compare. A digest
+    already carried in ``content_hash`` (baseline records) is reused.
+    Stable across processes, so it can be persisted.
+    """
+    cached = asset.get("content_hash")
+    if isinstance(cached, int):
+        return cached
+    text = "\x1f".join([
+        _normalize_field(name, asset.get(name)) or "\x00" for name in _TRACKED_FIELDS
+    ])
+    return int.from_bytes(
+        hashlib.blake2b(text.encode(), digest_size=8).digest(), "big", signed=True,
+    )
+
+
+def baseline_record(asset: dict) -> dict:
+    """Reduce an asset dict to what :func:`diff_scans` compares.
+
+    The record keeps the key fields, the normalized tracked fields and
+    their ``content_hash`` (:func:`asset_digest`), so a stored baseline
+    costs a few short strings per asset instead of the full scan record.
+    Records can be passed straight back to :func:`diff_scans` as
+    ``previous_assets``.
+    """
+    fields = {name: _normalize_field(name, asset.get(name)) for name in _TRACKED_FIELDS}
+    return {
+        "ip": asset.get("ip", ""),
+        "mac": asset.get("mac"),
+        "content_hash": asset_digest(fields),
+        **fields,
+    }
+
+
 def diff_scans(
     current_assets: list[dict],
     previous_assets: list[dict],
+    ordered: bool = False,
 ) -> DiffResult:
     """Compare two asset lists and return a structured diff.
 
@@ -92,10 +150,19 @@ def diff_scans(
         Assets from the most recent scan.
     previous_assets:
         Assets from the previous scan to compare against.
+    ordered:
+        Sort new, removed and changed assets by (ip, mac). Otherwise
+        they follow input order, which keeps the diff linear.
 
     Returns
     -------
     DiffResult with new, removed, changed, and unchanged counts.
+
+    Common assets are compared by :func:`asset_digest` first; the
+    field-by-field comparison only runs when the digests differ.
+    Assets from a partial (incremental) scan whose ports were carried
+    forward are merged with their previous record for the carried
+    fields, so only freshly measured values are compared.
     """
     prev_map: dict[tuple[str, str | None], dict] = {
         _asset_key(a): a for a in previous_assets
@@ -104,28 +171,37 @@ def diff_scans(
         _asset_key(a): a for a in current_assets
     }
 
-    prev_keys = set(prev_map.keys())
-    curr_keys = set(curr_map.keys())
+    new_keys = [k for k in curr_map if k not in prev_map]
+    removed_keys = [k for k in prev_map if k not in curr_map]
+    common_keys = [k for k in curr_map if k in prev_map]
+    if ordered:
+        new_keys.sort(key=_sort_key)
+        removed_keys.sort(key=_sort_key)
+        common_keys.sort(key=_sort_key)
 
     result = DiffResult()
 
     # New assets: in current but not in previous
-    for key in sorted(curr_keys - prev_keys):
-        result.new_assets.append(curr_map[key])
+    result.new_assets = [curr_map[key] for key in new_keys]
 
     # Removed assets: in previous but not in current
-    for key in sorted(prev_keys - curr_keys):
-        result.removed_assets.append(prev_map[key])
+    result.removed_assets = [prev_map[key] for key in removed_keys]
 
-    # Common assets: check for field changes
-    for key in sorted(curr_keys & prev_keys):
+    # Common assets: digest compare, then field changes on mismatch
+    for key in common_keys:
         curr = curr_map[key]
         prev = prev_map[key]
+        if asset_digest(curr) == asset_digest(prev):
+            result.unchanged_count += 1
+            continue
         ip = curr.get("ip", "")
         mac = curr.get("mac")
         asset_changed = False
+        carried = _is_carried_forward(curr)
 
         for field_name, change_type in _TRACKED_FIELDS.items():
+            if carried and field_name in _CARRIED_FIELDS:
+                continue
             old_val = _normalize_field(field_name, prev.get(field_name))
             new_val = _normalize_field(field_name, curr.get(field_name))
             if old_val != new_val:
@@ -166,13 +242,12 @@ def get_changes_from_db(
     List of change dicts with keys: id, asset_id, scan_id, change_type,
     field_name, old_value, new_value, detected_at, ip, mac.
     """
-    from bigr.db import get_db_path, init_db
+    from bigr.db import _connect, get_db_path, init_db
 
     path = db_path or get_db_path()
     init_db(path)
 
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
+    conn = _connect(path)
     try:
         rows = conn.execute(
             """SELECT ac.*, a.ip, a.mac
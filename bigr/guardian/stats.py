@@ -4,12 +4,14 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from collections import defaultdict
 from datetime import datetime, timezone
 
 from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bigr.core.events import event_bus, publish
 from bigr.guardian.models import GuardianQueryStatsDB, GuardianTopDomainDB
 
 logger = logging.getLogger(__name__)
@@ -24,15 +26,20 @@ class StatsTracker:
         Seconds between DB flushes (default: 300 = 5 minutes).
     top_domains_limit:
         Maximum number of top blocked domains to track.
+    publish_interval:
+        Minimum seconds between ``guardian.stats`` change-feed events.
     """
 
     def __init__(
         self,
         flush_interval: int = 300,
         top_domains_limit: int = 100,
+        publish_interval: float = 5.0,
     ) -> None:
         self._flush_interval = flush_interval
         self._top_domains_limit = top_domains_limit
+        self._publish_interval = publish_interval
+        self._last_published = 0.0
 
         # Memory counters (reset after flush)
         self._total_queries = 0
@@ -70,12 +77,33 @@ class StatsTracker:
         elif action == "allow":
             self._allowed_queries += 1
 
+        self._maybe_publish()
+
+    def _maybe_publish(self) -> None:
+        """Publish the counters, at most once per ``publish_interval``."""
+        now = time.monotonic()
+        if now - self._last_published < self._publish_interval:
+            return
+        # Each event is a full snapshot, so one nobody receives can be skipped
+        if not event_bus.has_subscribers("guardian.stats"):
+            return
+        self._last_published = now
+        publish("guardian.stats", self._counters())
+
     def get_stats_summary(self) -> dict:
         """Return current statistics summary (memory + lifetime)."""
         top_blocked = sorted(
             self._blocked_domains.items(), key=lambda x: x[1], reverse=True
         )[: self._top_domains_limit]
 
+        return {
+            **self._counters(),
+            "top_blocked_domains": [
+                {"domain": d, "count": c} for d, c in top_blocked
+            ],
+        }
+
+    def _counters(self) -> dict:
         return {
             "current_period": {
                 "total_queries": self._total_queries,
@@ -92,9 +120,6 @@ class StatsTracker:
                 "total_queries": self._lifetime_total,
                 "blocked_queries": self._lifetime_blocked,
             },
-            "top_blocked_domains": [
-                {"domain": d, "count": c} for d, c in top_blocked
-            ],
         }
 
     async def flush_to_db(self, session: AsyncSession) -> None:
@@ -173,6 +173,7 @@ class ScanResult:
     completed_at: datetime | None = None
     assets: list[Asset] = field(default_factory=list)
     is_root: bool = False
+    is_partial: bool = False
 
     @property
     def duration_seconds(self) -> float | None:
@@ -196,7 +197,36 @@ class ScanResult:
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "duration_seconds": self.duration_seconds,
             "is_root": self.is_root,
+            "is_partial": self.is_partial,
             "total_assets": len(self.assets),
             "category_summary": self.category_summary,
             "assets": [a.to_dict() for a in self.assets],
         }
+
+
+class ScanEventKind(str, enum.Enum):
+    HOST_DISCOVERED = "host_discovered"
+    PORTS_FOUND = "ports_found"
+    ENRICHED = "enriched"
+    COMPLETED = "completed"
+
+
+@dataclass
+class ScanEvent:
+    """A progress event emitted by a streaming scan.
+
+    ``asset`` is set for per-host events; ``result`` only on the final
+    ``COMPLETED`` event.
+    """
+
+    kind: ScanEventKind
+    asset: Asset | None = None
+    result: ScanResult | None = None
+
+    def to_dict(self) -> dict:
+        data: dict = {"kind": self.kind.value}
+        if self.asset is not None:
+            data["asset"] = self.asset.to_dict()
+        if self.result is not None:
+            data["result"] = self.result.to_dict()
+        return data
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import itertools
+import logging
 import os
+import queue
+import secrets
 import socket
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
 
 from bigr.models import Asset, ScanMethod, normalize_mac
+from bigr.scanner.targets import TargetSet
+
+logger = logging.getLogger(__name__)
 
 # Default critical ports for BİGR classification
 DEFAULT_PORTS = [
@@ -39,6 +52,34 @@ DEFAULT_PORTS = [
     49152, # UPnP dynamic
 ]
 
+# Global in-flight socket budget for the async connect-scan engine.
+# Shared across every (host, port) pair of a scan job, so a /22 is one
+# pipelined job rather than N per-host thread pools.
+DEFAULT_MAX_CONCURRENCY = 256
+
+# Host-level scheduling: how many hosts are scanned at once, and how many
+# ports of a single host may be probed concurrently. Both are bounded by
+# the global budget above.
+DEFAULT_HOST_PARALLELISM = 32
+DEFAULT_PORT_PARALLELISM = 8
+
+# Adaptive timeouts: per-host timeout = srtt + 4 * rttvar, clamped between
+# this floor and the caller's timeout (which is also used until the host
+# has produced its first RTT sample).
+ADAPTIVE_TIMEOUT_MIN = 0.25
+
+# Port scan techniques: full TCP handshake (no root) or half-open SYN (root).
+PORT_SCAN_METHODS = ("connect", "syn")
+
+# SYN scan pacing: packets-per-second ceiling and probes crafted per batch.
+DEFAULT_SYN_PPS = 2000
+DEFAULT_SYN_BATCH_SIZE = 256
+
+# Chunked ARP sweep: addresses probed per block, and how long to collect
+# replies before sending the next block.
+DEFAULT_ARP_CHUNK_SIZE = 256
+DEFAULT_ARP_CHUNK_INTERVAL = 0.1
+
 
 def is_root() -> bool:
     """Check if running with root privileges."""
@@ -57,81 +98,586 @@ def tcp_connect_scan(ip: str, port: int, timeout: float = 2.0) -> bool:
         return False
 
 
+async def async_tcp_probe(ip: str, port: int, timeout: float = 2.0) -> tuple[bool, float | None]:
+    """Probe a TCP port with a non-blocking connect().
+
+    Returns:
+        ``(is_open, rtt)`` where ``rtt`` is the round-trip time in seconds
+        when the host answered (SYN-ACK or RST), or None on timeout or
+        other errors.
+    """
+    loop = asyncio.get_running_loop()
+    family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+    try:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+    except OSError:
+        return False, None
+    started = time.monotonic()
+    try:
+        sock.setblocking(False)
+        await asyncio.wait_for(loop.sock_connect(sock, (ip, port)), timeout)
+        return True, time.monotonic() - started
+    except ConnectionRefusedError:
+        # RST: port closed, but the host answered - still a valid RTT sample
+        return False, time.monotonic() - started
+    except (asyncio.TimeoutError, OSError):
+        return False, None
+    finally:
+        sock.close()
+
+
+async def async_tcp_connect(ip: str, port: int, timeout: float = 2.0) -> bool:
+    """Test if a TCP port is open using a non-blocking connect()."""
+    is_open, _ = await async_tcp_probe(ip, port, timeout)
+    return is_open
+
+
+@dataclass
+class RttEstimator:
+    """Smoothed round-trip time estimate for one host (RFC 6298 style).
+
+    Used to derive a per-host connect timeout, so filtered ports on a
+    LAN host are abandoned quickly while slow WAN/VPN targets keep a
+    generous timeout.
+    """
+
+    srtt: float | None = None
+    rttvar: float = 0.0
+
+    @classmethod
+    def seeded(cls, rtt: float | None) -> RttEstimator:
+        """Create an estimator from a previously measured RTT (seconds)."""
+        estimator = cls()
+        if rtt is not None and rtt > 0:
+            estimator.update(rtt)
+        return estimator
+
+    def update(self, sample: float) -> None:
+        """Fold a new RTT sample (seconds) into the estimate."""
+        if self.srtt is None:
+            self.srtt = sample
+            self.rttvar = sample / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - sample)
+            self.srtt = 0.875 * self.srtt + 0.125 * sample
+
+    def timeout(self, ceiling: float, floor: float = ADAPTIVE_TIMEOUT_MIN) -> float:
+        """Return the connect timeout to use, clamped to [floor, ceiling]."""
+        if self.srtt is None:
+            return ceiling
+        return min(max(self.srtt + 4 * self.rttvar, floor), ceiling)
+
+
+def _host_source(ips: Iterable[str] | AsyncIterable[str]):
+    """Return a coroutine function producing the next IP (None when done).
+
+    Safe to share between concurrent host workers for both sync and
+    async iterables.
+    """
+    if isinstance(ips, AsyncIterable):
+        ait = aiter(ips)
+        lock = asyncio.Lock()
+
+        async def _next_async() -> str | None:
+            async with lock:
+                return await anext(ait, None)
+
+        return _next_async
+
+    it = iter(ips)
+
+    async def _next() -> str | None:
+        return next(it, None)
+
+    return _next
+
+
+async def iterate_in_thread(iterable: Iterable) -> AsyncIterator:
+    """Consume a blocking iterable in a worker thread, yielding its items.
+
+    Lets the async engine start work on items (e.g. ARP responders) while
+    a blocking producer is still running.
+    """
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue = asyncio.Queue()
+    done = object()
+
+    def _produce() -> None:
+        try:
+            for item in iterable:
+                loop.call_soon_threadsafe(items.put_nowait, item)
+        finally:
+            loop.call_soon_threadsafe(items.put_nowait, done)
+
+    producer = loop.run_in_executor(None, _produce)
+    while (item := await items.get()) is not done:
+        yield item
+    await producer
+
+
+async def async_scan_hosts(
+    ips: Iterable[str] | AsyncIterable[str],
+    ports: list[int] | None = None,
+    timeout: float = 2.0,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    host_parallelism: int = DEFAULT_HOST_PARALLELISM,
+    port_parallelism: int = DEFAULT_PORT_PARALLELISM,
+    rtts: dict[str, float] | None = None,
+    on_host: Callable[[str, list[int]], None] | None = None,
+) -> dict[str, list[int]]:
+    """Connect-scan many hosts as one pipelined job.
+
+    ``host_parallelism`` host workers pull IPs lazily from ``ips`` (sync
+    or async iterable, so hosts can be scanned while discovery is still
+    producing them); each host is probed with up to ``port_parallelism`` concurrent connects.
+    Every connect also takes a slot from one global budget of
+    ``max_concurrency`` sockets shared across all hosts and ports.
+
+    Timeouts adapt per host: ``timeout`` is used until the host answers
+    a probe, after which each connect waits ``srtt + 4 * rttvar``
+    (clamped to ``[ADAPTIVE_TIMEOUT_MIN, timeout]``).
+
+    Args:
+        rtts: Optional mapping of IP to RTT in seconds. Existing entries
+            seed the estimator (e.g. from the ARP sweep or a previous
+            scan); on return it holds each answering host's smoothed RTT.
+        on_host: Optional callback invoked with ``(ip, open_ports)`` as
+            soon as each host's scan completes.
+
+    Returns:
+        Mapping of each scanned IP to its sorted list of open ports.
+    """
+    if ports is None:
+        ports = DEFAULT_PORTS
+
+    budget = asyncio.Semaphore(max(1, max_concurrency))
+    open_ports: dict[str, list[int]] = {}
+    next_host = _host_source(ips)
+
+    async def _scan_host(ip: str) -> list[int]:
+        pending = iter(ports)
+        found: list[int] = []
+        estimator = RttEstimator.seeded(rtts.get(ip) if rtts is not None else None)
+
+        async def _port_worker() -> None:
+            for port in pending:
+                async with budget:
+                    is_open, rtt = await async_tcp_probe(ip, port, estimator.timeout(timeout))
+                if rtt is not None:
+                    estimator.update(rtt)
+                if is_open:
+                    found.append(port)
+
+        workers = max(1, min(port_parallelism, len(ports)))
+        await asyncio.gather(*(_port_worker() for _ in range(workers)))
+        if rtts is not None and estimator.srtt is not None:
+            rtts[ip] = estimator.srtt
+        return sorted(found)
+
+    async def _host_worker() -> None:
+        while (ip := await next_host()) is not None:
+            if ip in open_ports:
+                continue
+            open_ports[ip] = []
+            open_ports[ip] = await _scan_host(ip)
+            if on_host is not None:
+                on_host(ip, open_ports[ip])
+
+    await asyncio.gather(*(_host_worker() for _ in range(max(1, host_parallelism))))
+
+    return open_ports
+
+
+def _run_sync(coro):
+    """Run *coro* to completion from synchronous code.
+
+    Uses :func:`asyncio.run` directly, or a worker thread with its own
+    loop when the caller is already inside a running loop (e.g. a
+    FastAPI handler or the agent daemon). That call blocks the caller's
+    loop; async callers should await :func:`async_scan_hosts` instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="bigr-scan") as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def scan_hosts(
+    ips: Iterable[str],
+    ports: list[int] | None = None,
+    timeout: float = 2.0,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    host_parallelism: int = DEFAULT_HOST_PARALLELISM,
+    port_parallelism: int = DEFAULT_PORT_PARALLELISM,
+    rtts: dict[str, float] | None = None,
+) -> dict[str, list[int]]:
+    """Synchronous entry point for :func:`async_scan_hosts`.
+
+    Safe to call with a running loop (see :func:`_run_sync`), but async
+    code should await :func:`async_scan_hosts` directly.
+    """
+    return _run_sync(async_scan_hosts(
+        ips, ports, timeout,
+        max_concurrency=max_concurrency,
+        host_parallelism=host_parallelism,
+        port_parallelism=port_parallelism,
+        rtts=rtts,
+    ))
+
+
 def scan_ports(ip: str, ports: list[int] | None = None, timeout: float = 2.0, max_workers: int = 20) -> list[int]:
     """Scan multiple ports on a single IP concurrently."""
+    result = scan_hosts(
+        [ip], ports=ports, timeout=timeout,
+        max_concurrency=max_workers, host_parallelism=1, port_parallelism=max_workers,
+    )
+    return result.get(ip, [])
+
+
+def _syn_cookie(secret: bytes, ip: str, port: int) -> int:
+    """Keyed 32-bit sequence number for a SYN probe to (ip, port)."""
+    digest = hashlib.blake2s(f"{ip}:{port}".encode(), digest_size=4, key=secret).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _record_syn_reply(pkt, sport: int, secret: bytes, open_ports: dict[str, set[int]]) -> None:
+    """Record a SYN-ACK that answers one of our probes.
+
+    The reply's ACK must equal our cookie + 1, so stray traffic to the
+    source port and replies to other scanners are ignored.
+    """
+    if not pkt.haslayer("IP") or not pkt.haslayer("TCP"):
+        return
+    tcp = pkt["TCP"]
+    ip = pkt["IP"].src
+    if tcp.dport != sport or (int(tcp.flags) & 0x12) != 0x12:
+        return
+    if tcp.ack != (_syn_cookie(secret, ip, tcp.sport) + 1) & 0xFFFFFFFF:
+        return
+    found = open_ports.get(ip)
+    if found is not None:
+        found.add(tcp.sport)
+
+
+def _send_batch(sock, batch: list, pps: int) -> None:
+    """Send a batch of packets, then sleep so the batch honours ``pps``."""
+    started = time.monotonic()
+    for pkt in batch:
+        sock.send(pkt)
+    remaining = len(batch) / pps - (time.monotonic() - started)
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def syn_scan_hosts(
+    ips: Iterable[str],
+    ports: list[int] | None = None,
+    timeout: float = 2.0,
+    pps: int = DEFAULT_SYN_PPS,
+    batch_size: int = DEFAULT_SYN_BATCH_SIZE,
+) -> dict[str, list[int]]:
+    """Half-open SYN scan of every (host, port) pair - requires root.
+
+    Probes are crafted in batches and sent through one raw socket, paced
+    to at most ``pps`` packets per second. A single sniffer collects the
+    SYN-ACKs for the whole job. Each probe's sequence number is a keyed
+    hash of (ip, port), so replies are validated without per-probe state.
+
+    Args:
+        ips: Hosts to scan (consumed lazily).
+        ports: Ports to probe. Defaults to DEFAULT_PORTS.
+        timeout: How long to wait for late replies after the last batch.
+        pps: Packets-per-second ceiling.
+        batch_size: Probes crafted and sent per batch.
+
+    Returns:
+        Mapping of each scanned IP to its sorted list of open ports.
+    """
+    from scapy.all import IP, TCP, AsyncSniffer, conf  # type: ignore[import-untyped]
+
     if ports is None:
         ports = DEFAULT_PORTS
 
-    open_ports: list[int] = []
+    pps = max(1, pps)
+    batch_size = max(1, batch_size)
+    secret = secrets.token_bytes(16)
+    sport = 40000 + secrets.randbelow(20000)
+    open_ports: dict[str, set[int]] = {}
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_port = {
-            executor.submit(tcp_connect_scan, ip, port, timeout): port
-            for port in ports
-        }
-        for future in as_completed(future_to_port):
-            port = future_to_port[future]
-            try:
-                if future.result():
-                    open_ports.append(port)
-            except Exception:
-                pass
+    sniffer = AsyncSniffer(
+        filter=f"tcp and dst port {sport}",
+        prn=lambda pkt: _record_syn_reply(pkt, sport, secret, open_ports),
+        store=False,
+    )
+    sniffer.start()
+    sock = conf.L3socket()
+    try:
+        batch: list = []
+        for ip in ips:
+            if ip in open_ports:
+                continue
+            open_ports[ip] = set()
+            for port in ports:
+                batch.append(
+                    IP(dst=ip) / TCP(sport=sport, dport=port, flags="S", seq=_syn_cookie(secret, ip, port))
+                )
+                if len(batch) >= batch_size:
+                    _send_batch(sock, batch, pps)
+                    batch = []
+        if batch:
+            _send_batch(sock, batch, pps)
 
-    return sorted(open_ports)
+        # Give late SYN-ACKs a chance to arrive
+        time.sleep(timeout)
+    finally:
+        sock.close()
+        sniffer.stop()
 
+    return {ip: sorted(found) for ip, found in open_ports.items()}
 
-def arp_sweep(target: str) -> list[Asset]:
-    """ARP sweep using scapy - requires root.
+
+def syn_scan_available() -> bool:
+    """Check whether SYN scanning is possible (root + scapy)."""
+    if not is_root():
+        return False
+    try:
+        import scapy.all  # type: ignore[import-untyped]  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def scan_asset_ports(
+    assets: Iterable[Asset],
+    ports: list[int] | None = None,
+    timeout: float = 2.0,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    host_parallelism: int = DEFAULT_HOST_PARALLELISM,
+    port_parallelism: int = DEFAULT_PORT_PARALLELISM,
+    method: str = "connect",
+    pps: int = DEFAULT_SYN_PPS,
+) -> list[Asset]:
+    """Port-scan assets, fanning out across hosts.
+
+    Each unique IP is scanned once even when several assets share it
+    (e.g. the same host found by both the passive and active phases);
+    every asset with that IP receives the result. The measured RTT of
+    each answering host is recorded as ``raw_evidence["rtt_ms"]``, and an
+    existing value seeds that host's adaptive timeout.
+
+    A list is scanned as one batch. Any other iterable (such as
+    :func:`iter_arp_sweep`) is consumed in a background thread and each
+    host is port-scanned as soon as it is produced.
+
+    ``method="syn"`` uses :func:`syn_scan_hosts` when running as root
+    with scapy available and falls back to connect scanning otherwise.
+
+    Returns:
+        All assets consumed from ``assets``.
+    """
+    if method == "syn" and not syn_scan_available():
+        logger.warning("SYN scan requires root and scapy; falling back to connect scan")
+        method = "connect"
+
+    rtts: dict[str, float] = {}
+
+    def _seed(asset: Asset) -> None:
+        # Seed per-host RTT estimates from evidence (ARP sweep or a previous scan)
+        rtt_ms = asset.raw_evidence.get("rtt_ms")
+        if isinstance(rtt_ms, (int, float)) and rtt_ms > 0:
+            rtts.setdefault(asset.ip, rtt_ms / 1000)
+
+    engine_kwargs = {
+        "ports": ports,
+        "timeout": timeout,
+        "max_concurrency": max_concurrency,
+        "host_parallelism": host_parallelism,
+        "port_parallelism": port_parallelism,
+        "rtts": rtts,
+    }
+
+    if method == "syn" or isinstance(assets, Sequence):
+        assets = list(assets)
+        if not assets:
+            return assets
+        for asset in assets:
+            _seed(asset)
+        unique_ips = list(dict.fromkeys(a.ip for a in assets))
+        if method == "syn":
+            results = syn_scan_hosts(unique_ips, ports=ports, timeout=timeout, pps=pps)
+        else:
+            results = scan_hosts(unique_ips, **engine_kwargs)
+    else:
+        source = assets
+        assets = []
+
+        def _ips() -> Iterator[str]:
+            for asset in source:
+                assets.append(asset)
+                _seed(asset)
+                yield asset.ip
+
+        results = _run_sync(async_scan_hosts(iterate_in_thread(_ips()), **engine_kwargs))
+
+    for asset in assets:
+        asset.open_ports = results.get(asset.ip, [])
+        if asset.ip in rtts:
+            asset.raw_evidence["rtt_ms"] = round(rtts[asset.ip] * 1000, 3)
+
+    return assets
+
+
+def iter_arp_sweep(
+    target: str | TargetSet,
+    chunk_size: int = DEFAULT_ARP_CHUNK_SIZE,
+    chunk_interval: float = DEFAULT_ARP_CHUNK_INTERVAL,
+    timeout: float = 3.0,
+) -> Iterator[Asset]:
+    """Chunked, streaming ARP sweep using scapy - requires root.
+
+    Walks the target in blocks of ``chunk_size`` addresses, collecting
+    replies for ``chunk_interval`` seconds between blocks, and yields an
+    :class:`Asset` for each responder as soon as its reply arrives. One
+    sniffer serves the whole sweep; after the last block, replies are
+    collected for another ``timeout`` seconds. Memory stays bounded by
+    the probes still awaiting a reply, not the size of the range.
 
     Args:
-        target: CIDR notation (e.g., "192.168.1.0/24")
+        target: CIDR notation (e.g., "10.0.0.0/16"), any target string
+            accepted by :meth:`TargetSet.parse`, or a TargetSet. Only its
+            IPv4 addresses are swept.
+        chunk_size: Addresses probed per block.
+        chunk_interval: Seconds to wait between blocks (pacing).
+        timeout: Seconds a probe may wait for its reply.
     """
     if not is_root():
-        return []
+        return
 
     try:
-        from scapy.all import ARP, Ether, srp  # type: ignore[import-untyped]
+        from scapy.all import ARP, AsyncSniffer, Ether, conf  # type: ignore[import-untyped]
     except ImportError:
-        return []
+        return
 
-    assets: list[Asset] = []
+    replies: queue.Queue = queue.Queue()
+    sent_times: dict[str, float] = {}
+    in_flight: deque[tuple[float, list[str]]] = deque()
+    seen: set[str] = set()
 
-    try:
-        arp_request = Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=target)
-        answered, _ = srp(arp_request, timeout=3, verbose=False)
+    def _on_packet(pkt) -> None:
+        if pkt.haslayer("ARP") and pkt["ARP"].op == 2:  # is-at
+            replies.put((pkt, time.monotonic()))
 
-        for _, received in answered:
-            ip_addr = received.psrc
-            mac_addr = normalize_mac(received.hwsrc)
-
-            assets.append(Asset(
+    def _collect(until: float) -> Iterator[Asset]:
+        while True:
+            now = time.monotonic()
+            # Forget probes whose reply window has closed
+            while in_flight and in_flight[0][0] + timeout < now:
+                for ip in in_flight.popleft()[1]:
+                    sent_times.pop(ip, None)
+            if now >= until:
+                return
+            try:
+                pkt, received_at = replies.get(timeout=min(until - now, 0.05))
+            except queue.Empty:
+                continue
+            ip_addr = pkt["ARP"].psrc
+            sent_at = sent_times.pop(ip_addr, None)
+            if sent_at is None or ip_addr in seen:
+                continue
+            seen.add(ip_addr)
+            yield Asset(
                 ip=ip_addr,
-                mac=mac_addr,
+                mac=normalize_mac(pkt["ARP"].hwsrc),
                 scan_method=ScanMethod.ACTIVE,
-                raw_evidence={"source": "arp_sweep"},
-            ))
-    except Exception:
-        pass
+                raw_evidence={
+                    "source": "arp_sweep",
+                    "rtt_ms": round(max(received_at - sent_at, 0.0) * 1000, 3),
+                },
+            )
 
-    return assets
+    if not isinstance(target, TargetSet):
+        try:
+            target = TargetSet.parse(target)
+        except ValueError as exc:
+            logger.warning("Invalid ARP sweep target %r: %s", target, exc)
+            return
+
+    # ARP is IPv4-only; IPv6 ranges (a /64 alone is 2^64 addresses) are skipped
+    ipv4 = target.only_version(4)
+    if ipv4.size < target.size:
+        logger.info("ARP sweep of %s skips %d IPv6 address(es)", target, target.size - ipv4.size)
+
+    hosts = iter(ipv4)
+    sniffer = None
+    sock = None
+    try:
+        sniffer = AsyncSniffer(filter="arp", prn=_on_packet, store=False)
+        sniffer.start()
+        while chunk := list(itertools.islice(hosts, max(1, chunk_size))):
+            if sock is None:
+                sock = conf.L2socket(iface=conf.route.route(chunk[0])[0])
+            sent_at = time.monotonic()
+            for ip in chunk:
+                sock.send(Ether(dst="ff:ff:ff:ff:ff:ff") / ARP(pdst=ip))
+                sent_times[ip] = time.monotonic()
+            in_flight.append((sent_at, chunk))
+            yield from _collect(time.monotonic() + chunk_interval)
+
+        # Wait for stragglers from the last block
+        yield from _collect(time.monotonic() + timeout)
+    except Exception as exc:
+        logger.debug("ARP sweep of %s failed: %s", target, exc)
+    finally:
+        if sock is not None:
+            sock.close()
+        if sniffer is not None:
+            try:
+                sniffer.stop()
+            except Exception:
+                pass
+
+
+def arp_sweep(target: str | TargetSet) -> list[Asset]:
+    """ARP sweep using scapy - requires root.
+
+    Args:
+        target: CIDR notation (e.g., "192.168.1.0/24")
+    """
+    return list(iter_arp_sweep(target))
 
 
 def run_active_scan(
-    target: str,
+    target: str | TargetSet,
     ports: list[int] | None = None,
     timeout: float = 2.0,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    host_parallelism: int = DEFAULT_HOST_PARALLELISM,
+    port_parallelism: int = DEFAULT_PORT_PARALLELISM,
+    method: str = "connect",
+    pps: int = DEFAULT_SYN_PPS,
 ) -> list[Asset]:
     """Run active scan: ARP sweep + port scan on discovered hosts.
 
+    The sweep is streamed: each responder is port-scanned as soon as it
+    answers, while the rest of the range is still being swept.
+
     Args:
         target: CIDR notation (e.g., "192.168.1.0/24")
         ports: Ports to scan. Defaults to DEFAULT_PORTS.
         timeout: Per-port timeout in seconds.
+        max_concurrency: Global in-flight socket budget for the port scan.
+        host_parallelism: Number of hosts scanned at once.
+        port_parallelism: Concurrent port probes per host.
+        method: Port scan technique, "connect" or "syn".
+        pps: Packets-per-second ceiling for SYN scanning.
     """
-    assets = arp_sweep(target)
-
-    # Port scan each discovered host
-    for asset in assets:
-        asset.open_ports = scan_ports(asset.ip, ports=ports, timeout=timeout)
-
-    return assets
+    return scan_asset_ports(
+        iter_arp_sweep(target), ports=ports, timeout=timeout,
+        max_concurrency=max_concurrency,
+        host_parallelism=host_parallelism,
+        port_parallelism=port_parallelism,
+        method=method,
+        pps=pps,
+    )
@@ -2,26 +2,46 @@
 
 from __future__ import annotations
 
-import ipaddress
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import math
+from collections.abc import AsyncIterator, Callable, Mapping
 from datetime import datetime, timezone
+from functools import partial
 
-from bigr.models import Asset, ScanMethod, ScanResult
-from bigr.scanner.active import is_root, run_active_scan, scan_ports
-from bigr.scanner.mdns import discover_mdns_services, enrich_assets_with_mdns
+from bigr.models import Asset, ScanEvent, ScanEventKind, ScanMethod, ScanResult
+from bigr.scanner.active import (
+    DEFAULT_HOST_PARALLELISM,
+    DEFAULT_PORTS,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_PORT_PARALLELISM,
+    DEFAULT_SYN_PPS,
+    async_scan_hosts,
+    is_root,
+    iter_arp_sweep,
+    iterate_in_thread,
+    syn_scan_available,
+    syn_scan_hosts,
+)
+from bigr.scanner.mdns import discover_mdns_services, enrich_assets_with_mdns, get_mdns_listener
 from bigr.scanner.passive import run_passive_scan
+from bigr.scanner.targets import TargetSet
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_RESCAN_FRACTION = 0.1
+
 
 def expand_cidr(target: str) -> list[str]:
-    """Expand CIDR notation to list of host IPs."""
+    """Expand CIDR notation to list of host IPs.
+
+    Prefer :class:`TargetSet`, which holds the same hosts as integer
+    ranges; this materialises every address.
+    """
     try:
-        network = ipaddress.ip_network(target, strict=False)
-        return [str(ip) for ip in network.hosts()]
+        return list(TargetSet.parse(target))
     except ValueError:
-        # Single IP
+        # Not an address - pass through as-is
         return [target]
 
 
@@ -53,51 +73,195 @@ def merge_assets(passive: list[Asset], active: list[Asset]) -> list[Asset]:
     return list(merged.values())
 
 
-def run_hybrid_scan(
+def select_rescan_due(
+    baseline: Mapping[str, dict],
+    targets: TargetSet,
+    fraction: float = DEFAULT_RESCAN_FRACTION,
+) -> set[str]:
+    """Pick the stable hosts that get a full port rescan this cycle.
+
+    Takes the ``fraction`` of in-target baseline hosts whose ports were
+    verified longest ago (never-verified first), so repeated incremental
+    cycles rotate every host through a full rescan.
+    """
+    candidates = [ip for ip in baseline if ip in targets]
+    count = min(len(candidates), math.ceil(len(candidates) * fraction))
+    candidates.sort(key=lambda ip: baseline[ip].get("ports_checked_at") or "")
+    return set(candidates[:count])
+
+
+def update_port_baseline(
+    baseline: dict[str, dict], assets: list[dict], checked_at: str,
+) -> dict[str, dict]:
+    """Fold a scan's asset dicts into an in-memory port baseline.
+
+    For callers without the local database (e.g. the remote agent).
+    Carried-forward assets keep their previous ``ports_checked_at``.
+    """
+    for asset in assets:
+        prior = baseline.get(asset["ip"], {})
+        carried = asset.get("raw_evidence", {}).get("ports_carried_forward")
+        baseline[asset["ip"]] = {
+            "mac": asset.get("mac"),
+            "open_ports": asset.get("open_ports", []),
+            "ports_checked_at": prior.get("ports_checked_at") if carried else checked_at,
+        }
+    return baseline
+
+
+async def iter_hybrid_scan(
     target: str,
     mode: str = "hybrid",
     ports: list[int] | None = None,
     timeout: float = 2.0,
     mdns_timeout: float = 8.0,
-) -> ScanResult:
-    """Run hybrid scan: passive first, then active if root.
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    host_parallelism: int = DEFAULT_HOST_PARALLELISM,
+    port_parallelism: int = DEFAULT_PORT_PARALLELISM,
+    port_scan: str = "connect",
+    pps: int = DEFAULT_SYN_PPS,
+    baseline: Mapping[str, dict] | None = None,
+    rescan_fraction: float = DEFAULT_RESCAN_FRACTION,
+) -> AsyncIterator[ScanEvent]:
+    """Streaming hybrid scan: yield events as the scan progresses.
 
-    mDNS discovery runs in parallel with the passive scan phase
-    (both are non-root operations). After merging passive and active
-    results, assets are enriched with mDNS hostnames and services.
+    Emits ``HOST_DISCOVERED`` for every passive or ARP-sweep result,
+    ``PORTS_FOUND`` as soon as a host's port scan completes,
+    ``ENRICHED`` for each asset matched to mDNS services, and finally
+    one ``COMPLETED`` event carrying the full :class:`ScanResult`.
 
-    Args:
-        target: CIDR notation (e.g., "192.168.1.0/24")
-        mode: "passive", "active", or "hybrid"
-        ports: Custom port list. Defaults to critical ports.
-        timeout: Per-port scan timeout.
-        mdns_timeout: How long to listen for mDNS services.
+    Discovery and port scanning are pipelined: hosts are port-scanned
+    while the passive phase and ARP sweep are still producing others.
+    Each IP is scanned once even when both phases find it. mDNS
+    discovery listens in the background for the whole scan, unless a
+    long-lived listener is running (see
+    :func:`bigr.scanner.mdns.start_mdns_listener`), whose snapshot is
+    used instead.
+
+    With a ``baseline`` (see :func:`bigr.db.get_port_baseline`) the scan
+    is incremental: hosts whose IP and MAC match the baseline keep their
+    last known ports instead of being port-scanned, except for a
+    rotating ``rescan_fraction`` of them. Carried-forward assets are
+    flagged with ``raw_evidence["ports_carried_forward"]`` and the
+    result is marked ``is_partial``.
+
+    Port-scanned assets record the ports that were probed in
+    ``raw_evidence["scanned_ports"]``, so later consumers (e.g. the TLS
+    harvest) can tell a closed port from one that was never checked.
+
+    Arguments are otherwise the same as :func:`run_hybrid_scan`.
     """
     started_at = datetime.now(timezone.utc)
     root = is_root()
+    loop = asyncio.get_running_loop()
+    try:
+        targets = await loop.run_in_executor(None, TargetSet.resolve, target)
+    except ValueError as exc:
+        # Unresolvable targets scan nothing rather than failing the caller
+        logger.warning("Invalid scan target %r: %s", target, exc)
+        targets = TargetSet(spec=target)
 
-    target_ips = expand_cidr(target)
+    events: asyncio.Queue[ScanEvent | None] = asyncio.Queue()
     passive_assets: list[Asset] = []
     active_assets: list[Asset] = []
+    by_ip: dict[str, list[Asset]] = {}
+    scanned: dict[str, list[int]] = {}
+    rtts: dict[str, float] = {}
+    carried: set[str] = set()
+    due = select_rescan_due(baseline, targets, rescan_fraction) if baseline else set()
+    probed_ports = sorted(ports or DEFAULT_PORTS)
 
-    # Phase 1: Passive scan + mDNS discovery (parallel, both non-root)
+    mdns_listener = get_mdns_listener() if mode in ("passive", "hybrid") else None
     mdns_future = None
-    if mode in ("passive", "hybrid"):
-        with ThreadPoolExecutor(max_workers=2) as executor:
-            # Start mDNS discovery in background
-            mdns_future = executor.submit(discover_mdns_services, mdns_timeout)
+    if mode in ("passive", "hybrid") and mdns_listener is None:
+        mdns_future = loop.run_in_executor(None, discover_mdns_services, mdns_timeout)
 
-            # Run passive scan in main thread
-            passive_assets = run_passive_scan(target_ips=target_ips)
+    def _discovered(asset: Asset, bucket: list[Asset]) -> bool:
+        """Record a discovered asset; True if its IP still needs a port scan."""
+        bucket.append(asset)
+        first = asset.ip not in by_ip
+        by_ip.setdefault(asset.ip, []).append(asset)
+        if first and not asset.open_ports and _carry_forward(asset):
+            carried.add(asset.ip)
+            scanned[asset.ip] = baseline[asset.ip]["open_ports"]
+        if asset.ip in scanned:
+            asset.open_ports = scanned[asset.ip]
+        if asset.ip in carried:
+            asset.raw_evidence["ports_carried_forward"] = True
+            if baseline[asset.ip].get("scanned_ports"):
+                asset.raw_evidence["scanned_ports"] = baseline[asset.ip]["scanned_ports"]
+        elif asset.ip in scanned:
+            asset.raw_evidence["scanned_ports"] = probed_ports
+        rtt_ms = asset.raw_evidence.get("rtt_ms")
+        if isinstance(rtt_ms, (int, float)) and rtt_ms > 0:
+            rtts.setdefault(asset.ip, rtt_ms / 1000)
+        events.put_nowait(ScanEvent(ScanEventKind.HOST_DISCOVERED, asset=asset))
+        if asset.ip in carried:
+            if first:
+                events.put_nowait(ScanEvent(ScanEventKind.PORTS_FOUND, asset=asset))
+            return False
+        return first and not asset.open_ports
 
-            # Port scan passive-discovered hosts (doesn't need root)
-            for asset in passive_assets:
-                if not asset.open_ports:
-                    asset.open_ports = scan_ports(asset.ip, ports=ports, timeout=timeout)
+    def _carry_forward(asset: Asset) -> bool:
+        """True if the asset is unchanged from the baseline and not due a rescan."""
+        if not baseline or asset.ip in due or asset.mac is None:
+            return False
+        prior = baseline.get(asset.ip)
+        return prior is not None and prior.get("mac") == asset.mac
 
-    # Phase 2: Active scan (only if root and mode allows)
-    if mode in ("active", "hybrid") and root:
-        active_assets = run_active_scan(target, ports=ports, timeout=timeout)
+    def _ports_found(ip: str, open_ports: list[int]) -> None:
+        scanned[ip] = open_ports
+        for asset in by_ip.get(ip, []):
+            asset.open_ports = open_ports
+            asset.raw_evidence["scanned_ports"] = probed_ports
+            if ip in rtts:
+                asset.raw_evidence["rtt_ms"] = round(rtts[ip] * 1000, 3)
+        if ip in by_ip:
+            events.put_nowait(ScanEvent(ScanEventKind.PORTS_FOUND, asset=by_ip[ip][0]))
+
+    async def _discover() -> AsyncIterator[str]:
+        if mode in ("passive", "hybrid"):
+            found = await loop.run_in_executor(None, partial(run_passive_scan, target_ips=targets))
+            for asset in found:
+                if _discovered(asset, passive_assets):
+                    yield asset.ip
+        if mode in ("active", "hybrid") and root:
+            async for asset in iterate_in_thread(iter_arp_sweep(targets)):
+                if _discovered(asset, active_assets):
+                    yield asset.ip
+
+    async def _scan() -> None:
+        try:
+            if port_scan == "syn" and not syn_scan_available():
+                logger.warning("SYN scan requires root and scapy; falling back to connect scan")
+            elif port_scan == "syn":
+                ips = [ip async for ip in _discover()]
+                if ips:
+                    results = await loop.run_in_executor(
+                        None, partial(syn_scan_hosts, ips, ports=ports, timeout=timeout, pps=pps),
+                    )
+                    for ip in ips:
+                        _ports_found(ip, results.get(ip, []))
+                return
+            await async_scan_hosts(
+                _discover(), ports=ports, timeout=timeout,
+                max_concurrency=max_concurrency,
+                host_parallelism=host_parallelism,
+                port_parallelism=port_parallelism,
+                rtts=rtts,
+                on_host=_ports_found,
+            )
+        finally:
+            events.put_nowait(None)
+
+    task = asyncio.create_task(_scan())
+    try:
+        while (event := await events.get()) is not None:
+            yield event
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
 
     # Merge results
     if mode == "hybrid":
@@ -107,23 +271,190 @@ def run_hybrid_scan(
     else:
         assets = passive_assets
 
-    # Phase 3: Enrich with mDNS data
-    if mdns_future is not None:
+    # Enrich with mDNS data
+    if mdns_listener is not None or mdns_future is not None:
         try:
-            mdns_services = mdns_future.result(timeout=mdns_timeout + 5)
+            if mdns_listener is not None:
+                mdns_services = mdns_listener.snapshot()
+            else:
+                mdns_services = await asyncio.wait_for(mdns_future, timeout=mdns_timeout + 5)
             if mdns_services:
                 logger.info("Enriching %d assets with %d mDNS services", len(assets), len(mdns_services))
                 enrich_assets_with_mdns(assets, mdns_services)
+                mdns_ips = {svc.ip for svc in mdns_services}
+                for asset in assets:
+                    if asset.ip in mdns_ips:
+                        yield ScanEvent(ScanEventKind.ENRICHED, asset=asset)
         except Exception as exc:
             logger.warning("mDNS discovery failed: %s", exc)
 
     scan_method = ScanMethod.HYBRID if mode == "hybrid" else ScanMethod(mode)
 
-    return ScanResult(
+    yield ScanEvent(ScanEventKind.COMPLETED, result=ScanResult(
         target=target,
         scan_method=scan_method,
         started_at=started_at,
         completed_at=datetime.now(timezone.utc),
         assets=assets,
         is_root=root,
-    )
+        is_partial=bool(carried),
+    ))
+
+
+async def batch_scan_events(
+    events: AsyncIterator[ScanEvent],
+    max_batch: int = 50,
+    max_delay: float = 1.0,
+) -> AsyncIterator[list[ScanEvent]]:
+    """Group a scan event stream into micro-batches for sinks.
+
+    A batch is emitted when it reaches ``max_batch`` events or when
+    ``max_delay`` seconds have passed since its first event (even if the
+    stream has gone quiet), so a sink (classify, persist, upload) sees
+    bounded batches at a bounded lag. The ``COMPLETED`` event always
+    ends its batch.
+    """
+    batch: list[ScanEvent] = []
+    deadline: float | None = None
+    loop = asyncio.get_running_loop()
+    pending: asyncio.Future | None = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(events))
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if not done:
+                yield batch
+                batch, deadline = [], None
+                continue
+            pending, future = None, pending
+            try:
+                event = future.result()
+            except StopAsyncIteration:
+                break
+            if not batch:
+                deadline = loop.time() + max_delay
+            batch.append(event)
+            if len(batch) >= max_batch or event.kind == ScanEventKind.COMPLETED:
+                yield batch
+                batch, deadline = [], None
+        if batch:
+            yield batch
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+class ScanProgressLogger:
+    """``on_batch`` sink that logs running host counts for a scan."""
+
+    def __init__(self, target: str, log: logging.Logger) -> None:
+        self.target = target
+        self.log = log
+        self.discovered: set[str] = set()
+        self.port_scanned: set[str] = set()
+
+    def __call__(self, batch: list[ScanEvent]) -> None:
+        for event in batch:
+            if event.asset is None:
+                continue
+            if event.kind == ScanEventKind.HOST_DISCOVERED:
+                self.discovered.add(event.asset.ip)
+            elif event.kind == ScanEventKind.PORTS_FOUND:
+                self.port_scanned.add(event.asset.ip)
+        if any(event.asset is not None for event in batch):
+            self.log.info(
+                "Scan %s: %d hosts discovered, %d port-scanned",
+                self.target, len(self.discovered), len(self.port_scanned),
+            )
+
+
+def run_hybrid_scan(
+    target: str,
+    mode: str = "hybrid",
+    ports: list[int] | None = None,
+    timeout: float = 2.0,
+    mdns_timeout: float = 8.0,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    host_parallelism: int = DEFAULT_HOST_PARALLELISM,
+    port_parallelism: int = DEFAULT_PORT_PARALLELISM,
+    port_scan: str = "connect",
+    pps: int = DEFAULT_SYN_PPS,
+    on_event: Callable[[ScanEvent], None] | None = None,
+    baseline: Mapping[str, dict] | None = None,
+    rescan_fraction: float = DEFAULT_RESCAN_FRACTION,
+    on_batch: Callable[[list[ScanEvent]], None] | None = None,
+) -> ScanResult:
+    """Run hybrid scan: passive first, then active if root.
+
+    mDNS discovery runs in the background for the whole scan (it is a
+    non-root operation), or is read from the long-lived listener when
+    a daemon runs one. Hosts found by the passive phase and the
+    streamed ARP sweep are port-scanned together as one job, so a host
+    seen by both is only scanned once and early ARP responders are
+    scanned while the sweep continues. After merging passive and active
+    results, assets are enriched with mDNS hostnames and services.
+
+    This is the blocking form of :func:`iter_hybrid_scan`.
+
+    Args:
+        target: CIDR notation (e.g., "192.168.1.0/24"). Comma-separated
+            CIDRs, IPs, hostnames, ``a-b`` ranges and ``!`` exclusions
+            are accepted (see :meth:`TargetSet.resolve`).
+        mode: "passive", "active", or "hybrid"
+        ports: Custom port list. Defaults to critical ports.
+        timeout: Per-port scan timeout.
+        mdns_timeout: How long to listen for mDNS services (ignored
+            while a long-lived mDNS listener is running).
+        max_concurrency: Global in-flight socket budget for port scanning.
+        host_parallelism: Number of hosts port-scanned at once.
+        port_parallelism: Concurrent port probes per host.
+        port_scan: Port scan technique: "connect" (full handshake) or
+            "syn" (half-open, root only; falls back to connect otherwise).
+        pps: Packets-per-second ceiling for SYN scanning.
+        on_event: Optional callback receiving each :class:`ScanEvent`
+            as it happens (e.g. for progress display).
+        baseline: Last known ``{ip: {"mac", "open_ports",
+            "ports_checked_at"}}`` inventory. Enables incremental mode,
+            where unchanged hosts are not port-scanned.
+        rescan_fraction: Share of unchanged hosts still fully rescanned
+            per incremental cycle.
+        on_batch: Optional callback receiving the events in
+            micro-batches (see :func:`batch_scan_events`), e.g. for
+            progress reporting from daemons.
+    """
+    async def _collect() -> ScanResult:
+        result: ScanResult | None = None
+        events = iter_hybrid_scan(
+            target, mode=mode, ports=ports, timeout=timeout,
+            mdns_timeout=mdns_timeout,
+            max_concurrency=max_concurrency,
+            host_parallelism=host_parallelism,
+            port_parallelism=port_parallelism,
+            port_scan=port_scan,
+            pps=pps,
+            baseline=baseline,
+            rescan_fraction=rescan_fraction,
+        )
+
+        async def _observed() -> AsyncIterator[ScanEvent]:
+            nonlocal result
+            async for event in events:
+                if on_event is not None:
+                    on_event(event)
+                if event.kind == ScanEventKind.COMPLETED:
+                    result = event.result
+                yield event
+
+        if on_batch is not None:
+            async for batch in batch_scan_events(_observed()):
+                on_batch(batch)
+        else:
+            async for _event in _observed():
+                pass
+        if result is None:
+            raise RuntimeError(f"Hybrid scan of {target} ended without a result")
+        return result
+
+    return asyncio.run(_collect())
@@ -10,10 +10,11 @@ from __future__ import annotations
 
 import logging
 import socket
+import threading
 import time
 from dataclasses import dataclass, field
 
-from zeroconf import ServiceBrowser, ServiceInfo, ServiceListener, Zeroconf
+from zeroconf import ServiceBrowser, ServiceInfo, ServiceListener, Zeroconf, current_time_millis
 
 from bigr.models import Asset
 
@@ -39,6 +40,12 @@ INTERESTING_SERVICES = [
     "_sonos._tcp.local.",          # Sonos speakers
 ]
 
+# How long a service stays in the listener table without being re-seen.
+# Zeroconf reports goodbyes and cache expiry itself, and doesn't call
+# update_service for unchanged re-announcements, so entries past this age
+# are checked against Zeroconf's record cache before being dropped.
+MDNS_SERVICE_TTL = 3600.0
+
 
 @dataclass
 class MdnsService:
@@ -77,51 +84,209 @@ class _MdnsCollector(ServiceListener):
 
     def _resolve_and_add(self, zc: Zeroconf, type_: str, name: str) -> None:
         """Resolve service info and add to collection."""
-        try:
-            info = zc.get_service_info(type_, name)
-            if info is None:
-                return
+        service = _resolve_service(zc, type_, name)
+        if service is None:
+            return
 
-            # Get IPv4 addresses
-            addresses = info.parsed_addresses()
-            if not addresses:
+        # Avoid exact duplicates (same name + type + ip)
+        for existing in self.services:
+            if existing.name == service.name and existing.service_type == service.service_type and existing.ip == service.ip:
                 return
 
-            ip = addresses[0]
-
-            # Parse TXT record properties
-            properties: dict[str, str] = {}
-            if info.properties:
-                for key, value in info.properties.items():
-                    try:
-                        k = key.decode("utf-8", errors="replace") if isinstance(key, bytes) else str(key)
-                        if value is not None:
-                            v = value.decode("utf-8", errors="replace") if isinstance(value, bytes) else str(value)
-                        else:
-                            v = ""
-                        properties[k] = v
-                    except Exception:
-                        continue
-
-            service = MdnsService(
-                name=name,
-                service_type=type_,
-                ip=ip,
-                port=info.port or 0,
-                hostname=info.server,
-                properties=properties,
-            )
-
-            # Avoid exact duplicates (same name + type + ip)
-            for existing in self.services:
-                if existing.name == service.name and existing.service_type == service.service_type and existing.ip == service.ip:
-                    return
-
-            self.services.append(service)
-            logger.debug("mDNS discovered: %s (%s) at %s:%d", name, type_, ip, service.port)
+        self.services.append(service)
+        logger.debug("mDNS discovered: %s (%s) at %s:%d", name, type_, service.ip, service.port)
+
+
+def _resolve_service(zc: Zeroconf, type_: str, name: str) -> MdnsService | None:
+    """Resolve a browsed service name into an MdnsService (None on failure)."""
+    try:
+        info = zc.get_service_info(type_, name)
+        if info is None:
+            return None
+
+        # Get IPv4 addresses
+        addresses = info.parsed_addresses()
+        if not addresses:
+            return None
+
+        # Parse TXT record properties
+        properties: dict[str, str] = {}
+        if info.properties:
+            for key, value in info.properties.items():
+                try:
+                    k = key.decode("utf-8", errors="replace") if isinstance(key, bytes) else str(key)
+                    if value is not None:
+                        v = value.decode("utf-8", errors="replace") if isinstance(value, bytes) else str(value)
+                    else:
+                        v = ""
+                    properties[k] = v
+                except Exception:
+                    continue
+
+        return MdnsService(
+            name=name,
+            service_type=type_,
+            ip=addresses[0],
+            port=info.port or 0,
+            hostname=info.server,
+            properties=properties,
+        )
+    except Exception as exc:
+        logger.debug("Failed to resolve mDNS service %s: %s", name, exc)
+        return None
+
+
+class MdnsListener(ServiceListener):
+    """Long-lived mDNS collector for daemons.
+
+    Keeps one Zeroconf instance and its browsers running and maintains
+    an IP -> services table. Entries are dropped when the service says
+    goodbye or expires from Zeroconf's cache, or after ``ttl`` seconds
+    without being re-seen while Zeroconf no longer holds a live record
+    for it (e.g. after :meth:`stop`). :meth:`snapshot` returns the current table
+    instantly, so scans don't wait for a listening window.
+
+    Args:
+        ttl: Seconds a service stays known without being re-seen.
+        service_types: mDNS service types to browse.
+    """
+
+    def __init__(
+        self,
+        ttl: float = MDNS_SERVICE_TTL,
+        service_types: list[str] | None = None,
+    ) -> None:
+        self.ttl = ttl
+        self._service_types = service_types or INTERESTING_SERVICES
+        self._lock = threading.Lock()
+        # (service_type, name) -> (service, last seen monotonic time)
+        self._table: dict[tuple[str, str], tuple[MdnsService, float]] = {}
+        self._zc: Zeroconf | None = None
+        self._browsers: list[ServiceBrowser] = []
+
+    @property
+    def is_running(self) -> bool:
+        """True while the Zeroconf instance is up."""
+        return self._zc is not None
 
+    def start(self) -> bool:
+        """Start browsing. Returns False if Zeroconf could not be initialized."""
+        if self._zc is not None:
+            return True
+        try:
+            self._zc = Zeroconf()
         except Exception as exc:
-            logger.debug("Failed to resolve mDNS service %s: %s", name, exc)
+            logger.warning("Failed to initialize Zeroconf: %s", exc)
+            return False
+        for svc_type in self._service_types:
+            try:
+                self._browsers.append(ServiceBrowser(self._zc, svc_type, self))
+            except Exception as exc:
+                logger.debug("Failed to browse %s: %s", svc_type, exc)
+        logger.info("mDNS listener started (%d service types)", len(self._browsers))
+        return True
+
+    def stop(self) -> None:
+        """Stop browsing and close Zeroconf. The table is kept."""
+        zc, self._zc = self._zc, None
+        self._browsers = []
+        if zc is not None:
+            try:
+                zc.close()
+            except Exception:
+                pass
+
+    def add_service(self, zc: Zeroconf, type_: str, name: str) -> None:
+        """Called when a new service is discovered."""
+        self._refresh(zc, type_, name)
+
+    def update_service(self, zc: Zeroconf, type_: str, name: str) -> None:
+        """Called when a service is updated. Re-resolve."""
+        self._refresh(zc, type_, name)
+
+    def remove_service(self, zc: Zeroconf, type_: str, name: str) -> None:
+        """Called on goodbye or cache expiry."""
+        with self._lock:
+            self._table.pop((type_, name), None)
+
+    def _refresh(self, zc: Zeroconf, type_: str, name: str) -> None:
+        service = _resolve_service(zc, type_, name)
+        if service is not None:
+            self.record(service)
+
+    def record(self, service: MdnsService) -> None:
+        """Insert or refresh a service in the table."""
+        with self._lock:
+            self._table[(service.service_type, service.name)] = (service, time.monotonic())
+
+    def snapshot(self) -> list[MdnsService]:
+        """Return the currently known services, dropping expired ones."""
+        now = time.monotonic()
+        cutoff = now - self.ttl
+        with self._lock:
+            for key, (svc, seen) in list(self._table.items()):
+                if seen >= cutoff:
+                    continue
+                if self._still_cached(key[1]):
+                    # Re-announced without changes; Zeroconf only refreshed its cache
+                    self._table[key] = (svc, now)
+                else:
+                    del self._table[key]
+            return [svc for svc, _seen in self._table.values()]
+
+    def _still_cached(self, name: str) -> bool:
+        """True if Zeroconf's cache holds an unexpired record for *name*."""
+        zc = self._zc
+        if zc is None:
+            return False
+        now_ms = current_time_millis()
+        try:
+            return any(not record.is_expired(now_ms) for record in zc.cache.entries_with_name(name))
+        except Exception as exc:
+            logger.debug("Failed to read Zeroconf cache for %s: %s", name, exc)
+            return False
+
+    def services_by_ip(self) -> dict[str, list[MdnsService]]:
+        """Snapshot grouped by IP address."""
+        table: dict[str, list[MdnsService]] = {}
+        for svc in self.snapshot():
+            table.setdefault(svc.ip, []).append(svc)
+        return table
+
+
+_listener: MdnsListener | None = None
+_listener_lock = threading.Lock()
+
+
+def start_mdns_listener(ttl: float = MDNS_SERVICE_TTL) -> MdnsListener | None:
+    """Start (or return) the process-wide mDNS listener.
+
+    Hybrid scans use its snapshot instead of a per-scan listening window
+    while it runs. Returns None if Zeroconf is unavailable.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            listener = MdnsListener(ttl=ttl)
+            if not listener.start():
+                return None
+            _listener = listener
+        return _listener
+
+
+def get_mdns_listener() -> MdnsListener | None:
+    """Return the running process-wide mDNS listener, if any."""
+    listener = _listener
+    return listener if listener is not None and listener.is_running else None
+
+
+def stop_mdns_listener() -> None:
+    """Stop the process-wide mDNS listener (no-op if not running)."""
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
 
 
 def discover_mdns_services(timeout: float = 8.0) -> list[MdnsService]:
@@ -167,7 +332,7 @@ def discover_mdns_services(timeout: float = 8.0) -> list[MdnsService]:
 
 def enrich_assets_with_mdns(
     assets: list[Asset],
-    services: list[MdnsService],
+    services: list[MdnsService] | None = None,
 ) -> list[Asset]:
     """Match discovered mDNS services to assets by IP and enrich them.
 
@@ -178,11 +343,16 @@ def enrich_assets_with_mdns(
 
     Args:
         assets: List of assets to enrich.
-        services: List of discovered mDNS services.
+        services: List of discovered mDNS services. Defaults to the
+            running listener's snapshot (nothing if none is running).
 
     Returns:
         The same list of assets, enriched in-place.
     """
+    if services is None:
+        listener = get_mdns_listener()
+        services = listener.snapshot() if listener is not None else []
+
     # Build IP -> services lookup
     ip_to_services: dict[str, list[MdnsService]] = {}
     for svc in services:
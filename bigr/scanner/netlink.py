@@ -0,0 +1,282 @@
+"""Linux neighbor table (ARP / NDP) access over rtnetlink.
+
+Reads the kernel neighbor table with one RTM_GETNEIGH dump instead of
+forking ``arp -a`` or re-parsing ``/proc/net/arp``, and can subscribe to
+the RTNLGRP_NEIGH multicast group to be told about new and departed
+neighbors as the kernel learns them.
+"""
+
+from __future__ import annotations
+
+import logging
+import select
+import socket
+import struct
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# rtnetlink message types and flags (linux/rtnetlink.h, linux/netlink.h)
+RTM_NEWNEIGH = 28
+RTM_DELNEIGH = 29
+RTM_GETNEIGH = 30
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLM_F_REQUEST = 0x01
+NLM_F_DUMP = 0x300
+RTMGRP_NEIGH = 0x04
+
+# Neighbor attributes (linux/neighbour.h)
+NDA_DST = 1
+NDA_LLADDR = 2
+
+NUD_STATES = {
+    0x01: "incomplete",
+    0x02: "reachable",
+    0x04: "stale",
+    0x08: "delay",
+    0x10: "probe",
+    0x20: "failed",
+    0x40: "noarp",
+    0x80: "permanent",
+}
+
+# States that do not prove a live neighbor with a known MAC
+_UNUSABLE_STATES = frozenset({"incomplete", "failed", "noarp", "none"})
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_NDMSG = struct.Struct("=BBHiHBB")
+_RTATTR = struct.Struct("=HH")
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+@dataclass
+class Neighbor:
+    """One kernel neighbor table entry."""
+
+    ip: str
+    mac: str | None
+    ifindex: int
+    interface: str | None
+    state: str
+    family: int
+
+    @property
+    def usable(self) -> bool:
+        """True if the entry names a live host with a real MAC."""
+        return (
+            self.mac is not None
+            and self.state not in _UNUSABLE_STATES
+            and self.mac not in ("00:00:00:00:00:00", "ff:ff:ff:ff:ff:ff")
+        )
+
+
+@dataclass
+class NeighborEvent:
+    """A neighbor appeared (``"added"``) or went away (``"removed"``)."""
+
+    kind: str
+    neighbor: Neighbor
+
+
+def netlink_available() -> bool:
+    """True if this platform supports rtnetlink sockets."""
+    return hasattr(socket, "AF_NETLINK")
+
+
+def _state_name(state: int) -> str:
+    for bit, name in NUD_STATES.items():
+        if state & bit:
+            return name
+    return "none"
+
+
+def parse_neighbor_messages(data: bytes) -> tuple[list[tuple[int, Neighbor]], bool]:
+    """Parse a buffer of netlink messages.
+
+    Returns ``([(msg_type, neighbor), ...], done)`` where ``done`` is set
+    once the NLMSG_DONE terminator of a dump has been seen. Only IPv4 and
+    IPv6 entries are returned (bridge FDB entries are skipped).
+
+    Raises:
+        OSError: If the kernel answered with a netlink error.
+    """
+    results: list[tuple[int, Neighbor]] = []
+    names: dict[int, str | None] = {}
+    offset = 0
+    while offset + _NLMSGHDR.size <= len(data):
+        msg_len, msg_type, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+        if msg_len < _NLMSGHDR.size:
+            break
+        body = data[offset + _NLMSGHDR.size:offset + msg_len]
+        offset += _align(msg_len)
+
+        if msg_type == NLMSG_DONE:
+            return results, True
+        if msg_type == NLMSG_ERROR:
+            errno = -struct.unpack_from("=i", body)[0]
+            if errno:
+                raise OSError(errno, f"netlink error {errno}")
+            continue
+        if msg_type not in (RTM_NEWNEIGH, RTM_DELNEIGH) or len(body) < _NDMSG.size:
+            continue
+
+        family, _, _, ifindex, state, _nflags, _ntype = _NDMSG.unpack_from(body)
+        if family not in (socket.AF_INET, socket.AF_INET6):
+            continue
+
+        ip: str | None = None
+        mac: str | None = None
+        pos = _NDMSG.size
+        while pos + _RTATTR.size <= len(body):
+            rta_len, rta_type = _RTATTR.unpack_from(body, pos)
+            if rta_len < _RTATTR.size:
+                break
+            payload = body[pos + _RTATTR.size:pos + rta_len]
+            if rta_type == NDA_DST:
+                ip = socket.inet_ntop(family, payload)
+            elif rta_type == NDA_LLADDR and len(payload) == 6:
+                mac = ":".join(f"{b:02x}" for b in payload)
+            pos += _align(rta_len)
+        if ip is None:
+            continue
+
+        if ifindex not in names:
+            try:
+                names[ifindex] = socket.if_indextoname(ifindex)
+            except OSError:
+                names[ifindex] = None
+        results.append((msg_type, Neighbor(
+            ip=ip,
+            mac=mac,
+            ifindex=ifindex,
+            interface=names[ifindex],
+            state=_state_name(state),
+            family=family,
+        )))
+    return results, False
+
+
+def _dump_request(seq: int) -> bytes:
+    ndmsg = _NDMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0, 0, 0)
+    header = _NLMSGHDR.pack(
+        _NLMSGHDR.size + len(ndmsg), RTM_GETNEIGH, NLM_F_REQUEST | NLM_F_DUMP, seq, 0,
+    )
+    return header + ndmsg
+
+
+def dump_neighbors(timeout: float = 2.0) -> list[Neighbor]:
+    """Dump the IPv4 and IPv6 neighbor tables in one RTM_GETNEIGH request.
+
+    Raises:
+        OSError: If netlink is unavailable or the dump fails.
+    """
+    if not netlink_available():
+        raise OSError("rtnetlink is not available on this platform")
+
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+    try:
+        sock.settimeout(timeout)
+        sock.bind((0, 0))
+        sock.send(_dump_request(1))
+        neighbors: list[Neighbor] = []
+        done = False
+        while not done:
+            messages, done = parse_neighbor_messages(sock.recv(65536))
+            neighbors.extend(n for msg_type, n in messages if msg_type == RTM_NEWNEIGH)
+        return neighbors
+    finally:
+        sock.close()
+
+
+class NeighborMonitor:
+    """Pushes neighbor add/remove events from the kernel as they happen.
+
+    Subscribes to RTNLGRP_NEIGH and calls ``callback`` from a background
+    thread. Kernel updates for routine state changes (reachable -> stale
+    and back) are folded away: a neighbor is reported as added when its
+    IP is first seen with a usable MAC (or its MAC changes), and as
+    removed when the kernel deletes it or marks it failed. Neighbors
+    already in the table at :meth:`start` are treated as known.
+    """
+
+    def __init__(self, callback: Callable[[NeighborEvent], None]) -> None:
+        self._callback = callback
+        self._known: dict[str, str] = {}
+        self._sock: socket.socket | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> bool:
+        """Open the subscription; returns False if netlink is unavailable."""
+        if self.is_running:
+            return True
+        if not netlink_available():
+            return False
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+            try:
+                sock.bind((0, RTMGRP_NEIGH))
+                self._known = {n.ip: n.mac for n in dump_neighbors() if n.usable and n.mac}
+            except BaseException:
+                sock.close()
+                raise
+        except OSError as exc:
+            logger.warning("Neighbor monitor unavailable: %s", exc)
+            return False
+
+        self._sock = sock
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bigr-neigh-monitor", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def handle(self, msg_type: int, neighbor: Neighbor) -> NeighborEvent | None:
+        """Fold one kernel update into the known table; return the event, if any."""
+        if msg_type == RTM_DELNEIGH or neighbor.state == "failed":
+            if self._known.pop(neighbor.ip, None) is not None:
+                return NeighborEvent("removed", neighbor)
+            return None
+        if not neighbor.usable or self._known.get(neighbor.ip) == neighbor.mac:
+            return None
+        self._known[neighbor.ip] = neighbor.mac  # type: ignore[assignment]
+        return NeighborEvent("added", neighbor)
+
+    def _run(self) -> None:
+        sock = self._sock
+        while not self._stop.is_set() and sock is not None:
+            try:
+                ready, _, _ = select.select([sock], [], [], 0.5)
+                if not ready:
+                    continue
+                messages, _ = parse_neighbor_messages(sock.recv(65536))
+            except (OSError, ValueError) as exc:
+                if not self._stop.is_set():
+                    logger.warning("Neighbor monitor stopped: %s", exc)
+                return
+            for msg_type, neighbor in messages:
+                event = self.handle(msg_type, neighbor)
+                if event is None:
+                    continue
+                try:
+                    self._callback(event)
+                except Exception:
+                    logger.exception("Neighbor event callback failed")
@@ -2,13 +2,35 @@
 
 from __future__ import annotations
 
+import asyncio
+import ipaddress
 import platform
 import re
 import socket
 import subprocess
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 
 from bigr.models import Asset, ScanMethod, normalize_mac
+from bigr.scanner.targets import TargetSet
+
+# Enrichment cache lifetimes (seconds). Failed lookups are retried sooner.
+ENRICH_CACHE_TTL = 3600
+ENRICH_NEGATIVE_TTL = 300
+ENRICH_CACHE_MAX_SIZE = 65536
+
+# Max PTR queries in flight at once during enrichment
+DNS_CONCURRENCY = 128
+
+NETBIOS_PORT = 137
+
+# NBSTAT question for the wildcard name "*" (everything after the header)
+_NBSTAT_QUESTION = (
+    b"\x20CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\x00"
+    b"\x00\x21\x00\x01"
+)
 
 
 def scan_arp_table() -> list[Asset]:
@@ -95,76 +117,323 @@ def scan_proc_net_arp() -> list[Asset]:
     return assets
 
 
+def scan_netlink_neighbors() -> list[Asset] | None:
+    """Read the kernel neighbor table over rtnetlink (Linux).
+
+    IPv4 neighbors become assets; IPv6 neighbors are attached to the IPv4
+    asset with the same MAC (``raw_evidence["ipv6_addresses"]``) or become
+    assets of their own when the host has no IPv4 entry. Returns ``None``
+    if netlink is unavailable, so callers can fall back to ``arp -a``.
+    """
+    from bigr.scanner.netlink import dump_neighbors
+
+    try:
+        neighbors = dump_neighbors()
+    except OSError:
+        return None
+
+    by_mac: dict[str, Asset] = {}
+    # IPv4 first so a dual-stack host is keyed by its IPv4 address
+    for neigh in sorted(neighbors, key=lambda n: n.family != socket.AF_INET):
+        if not neigh.usable:
+            continue
+        asset = by_mac.get(neigh.mac)  # type: ignore[arg-type]
+        if asset is None:
+            by_mac[neigh.mac] = Asset(  # type: ignore[index]
+                ip=neigh.ip,
+                mac=neigh.mac,
+                scan_method=ScanMethod.PASSIVE,
+                raw_evidence={
+                    "source": "netlink_neigh",
+                    "interface": neigh.interface,
+                    "neighbor_state": neigh.state,
+                },
+            )
+        elif neigh.family == socket.AF_INET6:
+            asset.raw_evidence.setdefault("ipv6_addresses", []).append(neigh.ip)
+    return list(by_mac.values())
+
+
+class EnrichmentCache:
+    """Thread-safe TTL cache of per-IP lookup results.
+
+    Negative results (``None``) are cached too, with a shorter TTL, so
+    silent hosts are not re-queried every scan cycle. Module-level
+    instances persist across scan cycles of a long-running process.
+    """
+
+    def __init__(
+        self,
+        ttl: float = ENRICH_CACHE_TTL,
+        negative_ttl: float = ENRICH_NEGATIVE_TTL,
+        max_size: int = ENRICH_CACHE_MAX_SIZE,
+    ) -> None:
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, ip: str) -> tuple[bool, str | None]:
+        """Return ``(hit, value)`` for an IP; expired entries are misses."""
+        with self._lock:
+            entry = self._entries.get(ip)
+            if entry is None:
+                return False, None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[ip]
+                return False, None
+            return True, value
+
+    def put(self, ip: str, value: str | None) -> None:
+        """Store a lookup result, evicting the oldest entry when full."""
+        ttl = self._ttl if value is not None else self._negative_ttl
+        with self._lock:
+            self._entries[ip] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(ip)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_hostname_cache = EnrichmentCache()
+_netbios_cache = EnrichmentCache()
+
+
+async def async_resolve_hostnames(
+    ips: list[str],
+    timeout: float = 2.0,
+    concurrency: int = DNS_CONCURRENCY,
+) -> dict[str, str | None]:
+    """Reverse DNS (PTR) lookups for many IPs, sent concurrently."""
+    import dns.asyncresolver
+    import dns.exception
+
+    if not ips:
+        return {}
+
+    try:
+        resolver = dns.asyncresolver.Resolver()
+    except (dns.exception.DNSException, OSError):
+        return {ip: None for ip in ips}
+    resolver.lifetime = timeout
+
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def _lookup(ip: str) -> tuple[str, str | None]:
+        async with limit:
+            try:
+                answer = await resolver.resolve_address(ip)
+            except (dns.exception.DNSException, OSError, ValueError):
+                return ip, None
+        for rr in answer:
+            return ip, str(rr.target).rstrip(".") or None
+        return ip, None
+
+    return dict(await asyncio.gather(*(_lookup(ip) for ip in ips)))
+
+
 def resolve_hostname(ip: str, timeout: float = 2.0) -> str | None:
     """Reverse DNS lookup for an IP address."""
-    old_timeout = socket.getdefaulttimeout()
+    return asyncio.run(async_resolve_hostnames([ip], timeout=timeout)).get(ip)
+
+
+def _nbstat_query(tid: int) -> bytes:
+    """Build an NBSTAT (node status) query with the given transaction ID."""
+    return tid.to_bytes(2, "big") + b"\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00" + _NBSTAT_QUESTION
+
+
+def _parse_nbstat_name(data: bytes) -> str | None:
+    """Extract the first NetBIOS name from an NBSTAT response."""
+    if len(data) > 57:
+        name = data[57:57 + 15].decode("ascii", errors="ignore").strip()
+        if name:
+            return name
+    return None
+
+
+class _NbstatProtocol(asyncio.DatagramProtocol):
+    """Collects NBSTAT replies, matched to queries by transaction ID."""
+
+    def __init__(self, pending: dict[int, str], results: dict[str, str | None]) -> None:
+        self._pending = pending
+        self._results = results
+        self.done = asyncio.Event()
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        if len(data) < 2:
+            return
+        tid = int.from_bytes(data[:2], "big")
+        ip = self._pending.get(tid)
+        if ip is None or ip != addr[0]:
+            return
+        del self._pending[tid]
+        self._results[ip] = _parse_nbstat_name(data)
+        if not self._pending:
+            self.done.set()
+
+
+def _is_ipv4(ip: str) -> bool:
     try:
-        socket.setdefaulttimeout(timeout)
-        hostname, _, _ = socket.gethostbyaddr(ip)
-        return hostname
-    except (socket.herror, socket.gaierror, socket.timeout, OSError):
-        return None
-    finally:
-        socket.setdefaulttimeout(old_timeout)
+        return ipaddress.ip_address(ip).version == 4
+    except ValueError:
+        return False
+
+
+async def async_query_netbios(
+    ips: list[str],
+    timeout: float = 2.0,
+    port: int = NETBIOS_PORT,
+) -> dict[str, str | None]:
+    """NetBIOS NBSTAT name queries for many IPs over one UDP socket.
+
+    All queries are sent up front with distinct transaction IDs, and
+    replies are matched back by ID and source address, so the whole
+    batch costs about one timeout. NetBIOS is IPv4-only; other addresses
+    map to ``None`` without being queried.
+    """
+    results: dict[str, str | None] = {ip: None for ip in ips}
+    targets = [ip for ip in results if _is_ipv4(ip)]
+    if not targets:
+        return results
+
+    loop = asyncio.get_running_loop()
+    # Transaction IDs are 16-bit: query in chunks that fit the ID space
+    for start in range(0, len(targets), 0xFFFF):
+        chunk = targets[start:start + 0xFFFF]
+        pending = {tid: ip for tid, ip in enumerate(chunk, start=1)}
+        try:
+            transport, protocol = await loop.create_datagram_endpoint(
+                lambda: _NbstatProtocol(pending, results),
+                family=socket.AF_INET,
+            )
+        except OSError:
+            return results
+        try:
+            for tid, ip in list(pending.items()):
+                try:
+                    transport.sendto(_nbstat_query(tid), (ip, port))
+                except OSError:
+                    pending.pop(tid, None)
+            if pending:
+                try:
+                    await asyncio.wait_for(protocol.done.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            transport.close()
+
+    return results
 
 
 def scan_netbios(ip: str, timeout: float = 2.0) -> str | None:
     """Try NetBIOS name query on a single IP."""
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
-
-        # NetBIOS name query packet
-        query = (
-            b"\x80\x94\x00\x00\x00\x01\x00\x00\x00\x00\x00\x00"
-            b"\x20CKAAAAAAAAAAAAAAAAAAAAAAAAAAAAAA\x00"
-            b"\x00\x21\x00\x01"
-        )
+    return asyncio.run(async_query_netbios([ip], timeout=timeout)).get(ip)
+
+
+async def _cached_lookup(ips: list[str], cache: EnrichmentCache, lookup) -> dict[str, str | None]:
+    """Answer from cache where possible; look up (and cache) the rest."""
+    results: dict[str, str | None] = {}
+    missing: list[str] = []
+    for ip in ips:
+        hit, value = cache.get(ip)
+        if hit:
+            results[ip] = value
+        else:
+            missing.append(ip)
+    if missing:
+        fresh = await lookup(missing)
+        for ip in missing:
+            value = fresh.get(ip)
+            cache.put(ip, value)
+            results[ip] = value
+    return results
+
+
+async def async_enrich_hostnames(
+    assets: list[Asset],
+    timeout: float = 2.0,
+    netbios: bool = True,
+    hostname_cache: EnrichmentCache | None = None,
+    netbios_cache: EnrichmentCache | None = None,
+) -> list[Asset]:
+    """Fill in missing hostnames via reverse DNS, falling back to NetBIOS.
+
+    PTR and NBSTAT lookups for every asset run concurrently, so the
+    stage costs about one timeout instead of one per host. Results are
+    cached per IP (see :class:`EnrichmentCache`).
+    """
+    hostname_cache = hostname_cache if hostname_cache is not None else _hostname_cache
+    netbios_cache = netbios_cache if netbios_cache is not None else _netbios_cache
 
-        sock.sendto(query, (ip, 137))
-        data, _ = sock.recvfrom(1024)
-        sock.close()
+    ips = list(dict.fromkeys(a.ip for a in assets if a.hostname is None))
+    if not ips:
+        return assets
 
-        if len(data) > 57:
-            name = data[57:57 + 15].decode("ascii", errors="ignore").strip()
-            if name:
-                return name
-    except (socket.timeout, OSError):
-        pass
+    lookups = [_cached_lookup(ips, hostname_cache, lambda m: async_resolve_hostnames(m, timeout=timeout))]
+    if netbios:
+        lookups.append(_cached_lookup(ips, netbios_cache, lambda m: async_query_netbios(m, timeout=timeout)))
+    results = await asyncio.gather(*lookups)
+    hostnames = results[0]
+    netbios_names = results[1] if netbios else {}
+
+    for asset in assets:
+        if asset.hostname is not None:
+            continue
+        nb_name = netbios_names.get(asset.ip)
+        if nb_name:
+            asset.raw_evidence["netbios_name"] = nb_name
+        asset.hostname = hostnames.get(asset.ip) or nb_name
 
-    return None
+    return assets
+
+
+def enrich_hostnames(assets: list[Asset], timeout: float = 2.0, netbios: bool = True) -> list[Asset]:
+    """Synchronous entry point for :func:`async_enrich_hostnames`."""
+    return asyncio.run(async_enrich_hostnames(assets, timeout=timeout, netbios=netbios))
 
 
-def run_passive_scan(target_ips: list[str] | None = None) -> list[Asset]:
+def run_passive_scan(target_ips: TargetSet | list[str] | None = None) -> list[Asset]:
     """Run all passive scan methods and merge results.
 
     Args:
-        target_ips: Optional list of IPs to filter results.
+        target_ips: Optional TargetSet (or list of IPs) to filter results.
                     If None, returns all discovered assets.
     """
     seen: dict[str, Asset] = {}  # key: MAC or IP
 
-    # Source 1: ARP table
-    for asset in scan_arp_table():
-        key = asset.mac or asset.ip
-        seen[key] = asset
-
-    # Source 2: /proc/net/arp (Linux only)
-    if platform.system() == "Linux":
-        for asset in scan_proc_net_arp():
+    # Linux: one netlink dump covers ARP and NDP without forking arp -a
+    neighbors = scan_netlink_neighbors() if platform.system() == "Linux" else None
+    if neighbors is not None:
+        for asset in neighbors:
+            seen[asset.mac or asset.ip] = asset
+    else:
+        # Source 1: ARP table
+        for asset in scan_arp_table():
             key = asset.mac or asset.ip
-            if key not in seen:
-                seen[key] = asset
+            seen[key] = asset
 
-    # Enrich: reverse DNS for assets without hostname
-    for asset in seen.values():
-        if asset.hostname is None:
-            asset.hostname = resolve_hostname(asset.ip)
+        # Source 2: /proc/net/arp (Linux only)
+        if platform.system() == "Linux":
+            for asset in scan_proc_net_arp():
+                key = asset.mac or asset.ip
+                if key not in seen:
+                    seen[key] = asset
 
     # Filter by target IPs if provided
     assets = list(seen.values())
-    if target_ips:
-        target_set = set(target_ips)
+    if isinstance(target_ips, TargetSet) or target_ips:
+        target_set = target_ips if isinstance(target_ips, TargetSet) else set(target_ips)
         assets = [a for a in assets if a.ip in target_set]
 
+    # Enrich: reverse DNS / NetBIOS for assets without hostname
+    enrich_hostnames(assets)
+
     return assets
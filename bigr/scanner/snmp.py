@@ -2,8 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
+import logging
+import socket
+import time
 from dataclasses import dataclass, field
 
+logger = logging.getLogger(__name__)
+
+SNMP_PORT = 161
+DEFAULT_MAX_REPETITIONS = 50
+DEFAULT_SNMP_RATE_LIMIT = 50.0  # requests per second, per switch
+DEFAULT_SWITCH_CONCURRENCY = 16
+
+OID_DOT1D_TP_FDB_PORT = "1.3.6.1.2.1.17.4.3.1.2"
+OID_DOT1D_BASE_PORT_IF_INDEX = "1.3.6.1.2.1.17.1.4.1.2"
+OID_IF_NAME = "1.3.6.1.2.1.31.1.1.1.1"
+
 
 @dataclass
 class SwitchConfig:
@@ -98,55 +114,437 @@ def _oid_suffix_to_mac(oid_suffix: str) -> str:
     return ":".join(f"{int(o):02x}" for o in octets)
 
 
+# ---------------------------------------------------------------------------
+# Minimal SNMPv2c (BER) codec and GETBULK client
+# ---------------------------------------------------------------------------
+
+_SNMP_VERSION_2C = 1
+
+_TAG_INTEGER = 0x02
+_TAG_OCTET_STRING = 0x04
+_TAG_NULL = 0x05
+_TAG_OID = 0x06
+_TAG_SEQUENCE = 0x30
+_TAG_IP_ADDRESS = 0x40
+_TAG_COUNTER32 = 0x41
+_TAG_GAUGE32 = 0x42
+_TAG_TIMETICKS = 0x43
+_TAG_COUNTER64 = 0x46
+_TAG_NO_SUCH_OBJECT = 0x80
+_TAG_NO_SUCH_INSTANCE = 0x81
+_TAG_END_OF_MIB_VIEW = 0x82
+
+_PDU_RESPONSE = 0xA2
+_PDU_GET_BULK = 0xA5
+
+_UNSIGNED_TAGS = frozenset({_TAG_COUNTER32, _TAG_GAUGE32, _TAG_TIMETICKS, _TAG_COUNTER64})
+_EXCEPTION_TAGS = frozenset({_TAG_NO_SUCH_OBJECT, _TAG_NO_SUCH_INSTANCE, _TAG_END_OF_MIB_VIEW})
+
+_request_ids = itertools.count(1)
+
+
+class SnmpError(Exception):
+    """An SNMP request failed (timeout, error-status or malformed reply)."""
+
+
+def _encode_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    raw = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([0x80 | len(raw)]) + raw
+
+
+def _encode_tlv(tag: int, value: bytes) -> bytes:
+    return bytes([tag]) + _encode_length(len(value)) + value
+
+
+def _encode_integer(value: int, tag: int = _TAG_INTEGER) -> bytes:
+    if tag in _UNSIGNED_TAGS:
+        raw = value.to_bytes(value.bit_length() // 8 + 1, "big")
+    else:
+        raw = value.to_bytes((value + (value < 0)).bit_length() // 8 + 1, "big", signed=True)
+    return _encode_tlv(tag, raw)
+
+
+def _encode_oid(oid: str) -> bytes:
+    arcs = [int(a) for a in oid.strip(".").split(".")]
+    if len(arcs) < 2:
+        raise ValueError(f"OID too short: '{oid}'")
+    body = bytearray([40 * arcs[0] + arcs[1]])
+    for arc in arcs[2:]:
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        body.extend(reversed(chunk))
+    return _encode_tlv(_TAG_OID, bytes(body))
+
+
+def _encode_value(tag: int, value: object) -> bytes:
+    """Encode a varbind value; ``None`` with a null/exception tag is empty."""
+    if tag == _TAG_OID:
+        return _encode_oid(str(value))
+    if tag == _TAG_IP_ADDRESS:
+        return _encode_tlv(tag, socket.inet_aton(str(value)))
+    if tag == _TAG_INTEGER or tag in _UNSIGNED_TAGS:
+        return _encode_integer(int(value), tag)  # type: ignore[arg-type]
+    if tag == _TAG_OCTET_STRING:
+        return _encode_tlv(tag, value if isinstance(value, bytes) else str(value).encode())
+    return _encode_tlv(tag, b"")
+
+
+def _encode_message(
+    community: str,
+    pdu_tag: int,
+    request_id: int,
+    varbinds: list[tuple[str, int, object]],
+    error_status: int = 0,
+    error_index: int = 0,
+) -> bytes:
+    """Encode an SNMPv2c message.
+
+    For GETBULK requests ``error_status`` and ``error_index`` carry
+    non-repeaters and max-repetitions, as the PDU layout is shared.
+    """
+    vb_list = b"".join(
+        _encode_tlv(_TAG_SEQUENCE, _encode_oid(oid) + _encode_value(tag, value))
+        for oid, tag, value in varbinds
+    )
+    pdu = _encode_tlv(pdu_tag, (
+        _encode_integer(request_id)
+        + _encode_integer(error_status)
+        + _encode_integer(error_index)
+        + _encode_tlv(_TAG_SEQUENCE, vb_list)
+    ))
+    return _encode_tlv(_TAG_SEQUENCE, (
+        _encode_integer(_SNMP_VERSION_2C)
+        + _encode_tlv(_TAG_OCTET_STRING, community.encode())
+        + pdu
+    ))
+
+
+def _decode_tlv(data: bytes, pos: int) -> tuple[int, bytes, int]:
+    """Decode one TLV at ``pos``; returns ``(tag, value, next_pos)``."""
+    try:
+        tag = data[pos]
+        length = data[pos + 1]
+        pos += 2
+        if length & 0x80:
+            n = length & 0x7F
+            length = int.from_bytes(data[pos:pos + n], "big")
+            pos += n
+    except IndexError:
+        raise SnmpError("Truncated SNMP message") from None
+    end = pos + length
+    if end > len(data):
+        raise SnmpError("Truncated SNMP message")
+    return tag, data[pos:end], end
+
+
+def _decode_oid(raw: bytes) -> str:
+    if not raw:
+        raise SnmpError("Empty OID")
+    arcs = list(divmod(raw[0], 40)) if raw[0] < 80 else [2, raw[0] - 80]
+    value = 0
+    for byte in raw[1:]:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            arcs.append(value)
+            value = 0
+    return ".".join(str(a) for a in arcs)
+
+
+def _decode_value(tag: int, raw: bytes) -> object:
+    if tag == _TAG_INTEGER:
+        return int.from_bytes(raw, "big", signed=True)
+    if tag in _UNSIGNED_TAGS:
+        return int.from_bytes(raw, "big")
+    if tag == _TAG_OID:
+        return _decode_oid(raw)
+    if tag == _TAG_IP_ADDRESS:
+        return socket.inet_ntoa(raw)
+    if tag == _TAG_OCTET_STRING:
+        return raw
+    return None
+
+
+def _decode_message(data: bytes) -> tuple[str, int, int, int, int, list[tuple[str, int, object]]]:
+    """Decode an SNMPv2c message.
+
+    Returns ``(community, pdu_tag, request_id, error_status, error_index,
+    varbinds)`` with each varbind as ``(oid, tag, value)``.
+
+    Raises:
+        SnmpError: If the message is truncated or malformed.
+    """
+    try:
+        return _decode_message_fields(data)
+    except SnmpError:
+        raise
+    except (ValueError, IndexError, OSError) as exc:
+        raise SnmpError(f"Malformed SNMP message: {exc}") from exc
+
+
+def _decode_message_fields(data: bytes) -> tuple[str, int, int, int, int, list[tuple[str, int, object]]]:
+    tag, message, _ = _decode_tlv(data, 0)
+    if tag != _TAG_SEQUENCE:
+        raise SnmpError("Not an SNMP message")
+    _, _version, pos = _decode_tlv(message, 0)
+    _, community, pos = _decode_tlv(message, pos)
+    pdu_tag, pdu, _ = _decode_tlv(message, pos)
+
+    fields: list[int] = []
+    pos = 0
+    for _ in range(3):
+        _, raw, pos = _decode_tlv(pdu, pos)
+        fields.append(int.from_bytes(raw, "big", signed=True))
+    _, vb_list, _ = _decode_tlv(pdu, pos)
+
+    varbinds: list[tuple[str, int, object]] = []
+    pos = 0
+    while pos < len(vb_list):
+        _, vb, pos = _decode_tlv(vb_list, pos)
+        _, oid_raw, vpos = _decode_tlv(vb, 0)
+        vtag, vraw, _ = _decode_tlv(vb, vpos)
+        varbinds.append((_decode_oid(oid_raw), vtag, _decode_value(vtag, vraw)))
+    return community.decode(errors="replace"), pdu_tag, fields[0], fields[1], fields[2], varbinds
+
+
+def _oid_key(oid: str) -> tuple[int, ...]:
+    return tuple(int(a) for a in oid.split("."))
+
+
+class _SnmpProtocol(asyncio.DatagramProtocol):
+    """Routes responses to the futures waiting on their request IDs."""
+
+    def __init__(self) -> None:
+        self.pending: dict[int, asyncio.Future] = {}
+
+    def datagram_received(self, data: bytes, addr: tuple) -> None:
+        try:
+            decoded = _decode_message(data)
+        except SnmpError:
+            return
+        future = self.pending.pop(decoded[2], None)
+        if future is not None and not future.done():
+            future.set_result(decoded)
+
+    def error_received(self, exc: Exception) -> None:
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(SnmpError(str(exc)))
+        self.pending.clear()
+
+
+class SnmpClient:
+    """Async SNMPv2c client for one agent, with a request rate limit.
+
+    One UDP socket is used for the client's lifetime; replies are matched
+    by request ID so several walks can share it. Requests are spaced at
+    least ``1 / rate_limit`` seconds apart to spare the switch CPU.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        community: str = "public",
+        port: int = SNMP_PORT,
+        timeout: float = 2.0,
+        retries: int = 2,
+        rate_limit: float = DEFAULT_SNMP_RATE_LIMIT,
+    ) -> None:
+        self.host = host
+        self.community = community
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self._interval = 1.0 / rate_limit if rate_limit > 0 else 0.0
+        self._next_send = 0.0
+        self._send_lock = asyncio.Lock()
+        self._transport: asyncio.DatagramTransport | None = None
+        self._protocol: _SnmpProtocol | None = None
+        self.requests_sent = 0
+
+    async def open(self) -> None:
+        if self._transport is None:
+            loop = asyncio.get_running_loop()
+            self._transport, self._protocol = await loop.create_datagram_endpoint(
+                _SnmpProtocol, remote_addr=(self.host, self.port),
+            )
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    async def __aenter__(self) -> SnmpClient:
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self.close()
+
+    async def _throttle(self) -> None:
+        async with self._send_lock:
+            delay = self._next_send - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_send = time.monotonic() + self._interval
+
+    async def request(
+        self,
+        pdu_tag: int,
+        oids: list[str],
+        non_repeaters: int = 0,
+        max_repetitions: int = 0,
+    ) -> list[tuple[str, int, object]]:
+        """Send one request and return the response varbinds.
+
+        Raises:
+            SnmpError: On timeout after all retries or an error-status reply.
+        """
+        await self.open()
+        assert self._transport is not None and self._protocol is not None
+        loop = asyncio.get_running_loop()
+        varbinds = [(oid, _TAG_NULL, None) for oid in oids]
+
+        for _attempt in range(self.retries + 1):
+            request_id = next(_request_ids) & 0x7FFFFFFF
+            message = _encode_message(
+                self.community, pdu_tag, request_id, varbinds, non_repeaters, max_repetitions,
+            )
+            future = loop.create_future()
+            self._protocol.pending[request_id] = future
+            await self._throttle()
+            self._transport.sendto(message)
+            self.requests_sent += 1
+            try:
+                _, _, _, error_status, error_index, result = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                continue
+            finally:
+                self._protocol.pending.pop(request_id, None)
+            if error_status:
+                raise SnmpError(f"{self.host}: error-status {error_status} at index {error_index}")
+            return result
+
+        raise SnmpError(f"{self.host}: no response after {self.retries + 1} attempts")
+
+    async def walk(
+        self,
+        base_oid: str,
+        max_repetitions: int = DEFAULT_MAX_REPETITIONS,
+    ) -> list[tuple[str, object]]:
+        """Walk the subtree under ``base_oid`` with GETBULK.
+
+        Each round trip returns up to ``max_repetitions`` rows, so a table
+        of N rows costs about ``N / max_repetitions`` requests.
+        """
+        prefix = base_oid + "."
+        rows: list[tuple[str, object]] = []
+        current = base_oid
+        while True:
+            varbinds = await self.request(_PDU_GET_BULK, [current], 0, max_repetitions)
+            if not varbinds:
+                return rows
+            for oid, tag, value in varbinds:
+                if tag in _EXCEPTION_TAGS or not oid.startswith(prefix):
+                    return rows
+                if _oid_key(oid) <= _oid_key(current):
+                    raise SnmpError(f"{self.host}: OID not increasing at {oid}")
+                rows.append((oid, value))
+                current = oid
+
+
 class SnmpMacTableReader:
     """Reads MAC address tables from SNMP-managed switches."""
 
-    def __init__(self, switch: SwitchConfig):
+    def __init__(
+        self,
+        switch: SwitchConfig,
+        port: int = SNMP_PORT,
+        timeout: float = 2.0,
+        retries: int = 2,
+        max_repetitions: int = DEFAULT_MAX_REPETITIONS,
+        rate_limit: float = DEFAULT_SNMP_RATE_LIMIT,
+    ):
         self.switch = switch
+        self.port = port
+        self.timeout = timeout
+        self.retries = retries
+        self.max_repetitions = max_repetitions
+        self.rate_limit = rate_limit
+        self._client: SnmpClient | None = None
         self._mac_table: list[SwitchMacEntry] = []
 
-    def _snmp_walk_mac_to_bridge(self) -> dict[str, int]:
+    async def _walk(self, base_oid: str) -> list[tuple[str, object]]:
+        if self.switch.version != "2c":
+            raise SnmpError(
+                f"{self.switch.host}: SNMP version {self.switch.version} is not supported (use 2c)"
+            )
+        if self._client is None:
+            self._client = SnmpClient(
+                self.switch.host, self.switch.community, port=self.port,
+                timeout=self.timeout, retries=self.retries, rate_limit=self.rate_limit,
+            )
+        return await self._client.walk(base_oid, self.max_repetitions)
+
+    async def _snmp_walk_mac_to_bridge(self) -> dict[str, int]:
         """Walk dot1dTpFdbPort (1.3.6.1.2.1.17.4.3.1.2).
 
         Returns {full_oid: bridge_port_number}.
-        Override or mock for testing.
         """
-        return {}  # pragma: no cover
+        rows = await self._walk(OID_DOT1D_TP_FDB_PORT)
+        return {oid: int(value) for oid, value in rows if isinstance(value, int)}
 
-    def _snmp_walk_bridge_to_if(self) -> dict[int, int]:
+    async def _snmp_walk_bridge_to_if(self) -> dict[int, int]:
         """Walk dot1dBasePortIfIndex (1.3.6.1.2.1.17.1.4.1.2).
 
         Returns {bridge_port: ifIndex}.
-        Override or mock for testing.
         """
-        return {}  # pragma: no cover
+        rows = await self._walk(OID_DOT1D_BASE_PORT_IF_INDEX)
+        return {int(oid.rsplit(".", 1)[1]): int(value) for oid, value in rows if isinstance(value, int)}
 
-    def _snmp_walk_if_to_name(self) -> dict[int, str]:
+    async def _snmp_walk_if_to_name(self) -> dict[int, str]:
         """Walk ifName (1.3.6.1.2.1.31.1.1.1.1).
 
         Returns {ifIndex: interface_name}.
-        Override or mock for testing.
         """
-        return {}  # pragma: no cover
+        rows = await self._walk(OID_IF_NAME)
+        return {
+            int(oid.rsplit(".", 1)[1]): value.decode(errors="replace")
+            for oid, value in rows if isinstance(value, bytes)
+        }
 
-    def read_mac_table(self) -> list[SwitchMacEntry]:
-        """Read MAC address table via SNMP.
+    async def async_read_mac_table(self) -> list[SwitchMacEntry]:
+        """Read the MAC address table, walking the three tables concurrently.
 
         Uses OIDs:
         - 1.3.6.1.2.1.17.4.3.1.2 (dot1dTpFdbPort) - MAC -> bridge port
         - 1.3.6.1.2.1.17.1.4.1.2 (dot1dBasePortIfIndex) - bridge port -> ifIndex
         - 1.3.6.1.2.1.31.1.1.1.1 (ifName) - ifIndex -> interface name
+
+        Raises:
+            SnmpError: If the switch does not answer or returns an error.
         """
-        mac_to_bridge = self._snmp_walk_mac_to_bridge()
-        bridge_to_if = self._snmp_walk_bridge_to_if()
-        if_to_name = self._snmp_walk_if_to_name()
+        try:
+            mac_to_bridge, bridge_to_if, if_to_name = await asyncio.gather(
+                self._snmp_walk_mac_to_bridge(),
+                self._snmp_walk_bridge_to_if(),
+                self._snmp_walk_if_to_name(),
+            )
+        finally:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
 
         entries: list[SwitchMacEntry] = []
 
         for oid, bridge_port in mac_to_bridge.items():
             # Extract MAC from OID suffix
             # OID format: 1.3.6.1.2.1.17.4.3.1.2.<mac_as_decimal_octets>
-            base_oid = "1.3.6.1.2.1.17.4.3.1.2."
+            base_oid = OID_DOT1D_TP_FDB_PORT + "."
             if oid.startswith(base_oid):
                 mac_suffix = oid[len(base_oid):]
             else:
@@ -170,6 +568,10 @@ class SnmpMacTableReader:
         self._mac_table = entries
         return entries
 
+    def read_mac_table(self) -> list[SwitchMacEntry]:
+        """Read MAC address table via SNMP (sync wrapper)."""
+        return asyncio.run(self.async_read_mac_table())
+
     @property
     def mac_table(self) -> list[SwitchMacEntry]:
         return self._mac_table
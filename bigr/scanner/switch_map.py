@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
 from bigr.db import _connect, init_db
-from bigr.scanner.snmp import SnmpMacTableReader, SwitchConfig, SwitchMacEntry
+from bigr.scanner.snmp import (
+    DEFAULT_SWITCH_CONCURRENCY,
+    SnmpError,
+    SnmpMacTableReader,
+    SwitchConfig,
+    SwitchMacEntry,
+)
+
+logger = logging.getLogger(__name__)
 
 
 def save_switch(config: SwitchConfig, db_path: Path | None = None) -> None:
@@ -50,36 +60,66 @@ def get_switches(db_path: Path | None = None) -> list[dict]:
         conn.close()
 
 
-def scan_all_switches(db_path: Path | None = None) -> list[SwitchMacEntry]:
-    """Read MAC tables from all registered switches."""
-    switches = get_switches(db_path)
-    all_entries: list[SwitchMacEntry] = []
+async def async_scan_switches(
+    configs: list[SwitchConfig],
+    max_concurrency: int = DEFAULT_SWITCH_CONCURRENCY,
+    **reader_kwargs,
+) -> list[list[SwitchMacEntry] | None]:
+    """Read MAC tables from many switches concurrently.
+
+    At most ``max_concurrency`` switches are polled at once; each reader
+    applies its own per-switch request rate limit. Returns one entry list
+    per config, in order, with ``None`` for switches that failed.
+    """
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def _poll(config: SwitchConfig) -> list[SwitchMacEntry] | None:
+        async with slots:
+            try:
+                return await SnmpMacTableReader(config, **reader_kwargs).async_read_mac_table()
+            except (SnmpError, OSError) as exc:
+                logger.warning("Skipping switch %s: %s", config.host, exc)
+                return None
+            except Exception:
+                logger.exception("Skipping switch %s: unexpected error", config.host)
+                return None
 
-    for sw in switches:
-        config = SwitchConfig(
+    return list(await asyncio.gather(*(_poll(c) for c in configs)))
+
+
+def scan_all_switches(
+    db_path: Path | None = None,
+    max_concurrency: int = DEFAULT_SWITCH_CONCURRENCY,
+) -> list[SwitchMacEntry]:
+    """Read MAC tables from all registered switches in parallel."""
+    configs = [
+        SwitchConfig(
             host=sw["host"],
             community=sw["community"],
             version=sw["version"],
             label=sw["label"],
         )
-        reader = SnmpMacTableReader(config)
-        try:
-            entries = reader.read_mac_table()
-            all_entries.extend(entries)
+        for sw in get_switches(db_path)
+    ]
+    if not configs:
+        return []
 
-            # Update switch stats
-            init_db(db_path)
-            conn = _connect(db_path)
-            try:
-                now_iso = datetime.now(timezone.utc).isoformat()
-                conn.execute(
-                    "UPDATE switches SET last_polled = ?, mac_count = ? WHERE host = ?",
-                    (now_iso, len(entries), config.host),
-                )
-                conn.commit()
-            finally:
-                conn.close()
-        except Exception:
-            pass  # Skip unreachable switches
+    results = asyncio.run(async_scan_switches(configs, max_concurrency=max_concurrency))
+
+    all_entries: list[SwitchMacEntry] = []
+    now_iso = datetime.now(timezone.utc).isoformat()
+    conn = _connect(db_path)
+    try:
+        for config, entries in zip(configs, results):
+            if entries is None:
+                continue  # Skip unreachable switches
+            all_entries.extend(entries)
+            conn.execute(
+                "UPDATE switches SET last_polled = ?, mac_count = ? WHERE host = ?",
+                (now_iso, len(entries), config.host),
+            )
+        conn.commit()
+    finally:
+        conn.close()
 
     return all_entries
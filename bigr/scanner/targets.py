@@ -0,0 +1,229 @@
+"""Compact scan target sets - integer IP ranges instead of expanded lists."""
+
+from __future__ import annotations
+
+import bisect
+import ipaddress
+import socket
+from collections.abc import Iterator
+
+_IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
+
+
+def split_target_spec(target: str, exclude: str | None = None) -> tuple[list[str], list[str]]:
+    """Split a comma-separated target string into (includes, excludes).
+
+    Items prefixed with ``!`` and everything in ``exclude`` are excludes.
+    """
+    includes: list[str] = []
+    excludes: list[str] = []
+    items = [p.strip() for p in target.split(",")]
+    if exclude:
+        items += [f"!{p.strip()}" for p in exclude.split(",")]
+    for item in items:
+        if item.startswith("!"):
+            item = item[1:].strip()
+            if item:
+                excludes.append(item)
+        elif item:
+            includes.append(item)
+    return includes, excludes
+
+
+def _spec_range(spec: str, hosts_only: bool = True) -> tuple[int, int, int]:
+    """Parse one target spec into ``(version, start_int, end_int)``.
+
+    Accepts a CIDR, a single IP, or an ``a-b`` address range. With
+    ``hosts_only`` a CIDR covers its usable hosts (network and broadcast
+    addresses are skipped, like ``ip_network().hosts()``); otherwise it
+    covers the whole block, as needed for exclusions.
+    """
+    if "-" in spec:
+        first, last = (ipaddress.ip_address(p.strip()) for p in spec.split("-", 1))
+        if first.version != last.version:
+            raise ValueError(f"Mixed address families in range: '{spec}'")
+        start, end = sorted((int(first), int(last)))
+        return first.version, start, end
+
+    network = ipaddress.ip_network(spec, strict=False)
+    start = int(network.network_address)
+    end = int(network.broadcast_address)
+    if not hosts_only:
+        return network.version, start, end
+    if network.version == 4 and network.prefixlen <= 30:
+        start, end = start + 1, end - 1
+    elif network.version == 6 and network.prefixlen <= 126:
+        start += 1  # Subnet-Router anycast, as ip_network().hosts() does
+    return network.version, start, end
+
+
+def _merge(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Sort and coalesce overlapping or adjacent ranges."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract(ranges: list[tuple[int, int]], holes: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Remove merged ``holes`` from merged ``ranges``."""
+    result: list[tuple[int, int]] = []
+    for start, end in ranges:
+        for h_start, h_end in holes:
+            if h_end < start or h_start > end:
+                continue
+            if h_start > start:
+                result.append((start, h_start - 1))
+            start = h_end + 1
+            if start > end:
+                break
+        if start <= end:
+            result.append((start, end))
+    return result
+
+
+def _resolve_item(spec: str) -> str:
+    """Return ``spec`` if it parses, else its hostname's addresses joined by commas."""
+    try:
+        _spec_range(spec)
+        return spec
+    except ValueError:
+        pass
+    try:
+        infos = socket.getaddrinfo(spec, None, proto=socket.IPPROTO_TCP)
+    except (OSError, UnicodeError) as exc:
+        raise ValueError(f"Cannot resolve target '{spec}': {exc}") from exc
+    return ",".join(dict.fromkeys(info[4][0] for info in infos))
+
+
+class TargetSet:
+    """A set of IP addresses stored as sorted, merged integer ranges.
+
+    Membership is a binary search (O(log n) in the number of ranges) and
+    iteration is lazy, so a /16 costs a couple of integers rather than
+    65k strings. Built from comma-separated specs via :meth:`parse`;
+    specs prefixed with ``!`` are excluded.
+
+    Example::
+
+        TargetSet.parse("10.0.0.0/16, 192.168.1.10-192.168.1.20, !10.0.5.0/24")
+    """
+
+    def __init__(
+        self,
+        ranges: dict[int, list[tuple[int, int]]] | None = None,
+        spec: str = "",
+    ) -> None:
+        self._ranges: dict[int, list[tuple[int, int]]] = {}
+        self._starts: dict[int, list[int]] = {}
+        for version, rs in (ranges or {}).items():
+            merged = _merge(rs)
+            if merged:
+                self._ranges[version] = merged
+                self._starts[version] = [s for s, _ in merged]
+        self._spec = spec
+
+    @classmethod
+    def parse(cls, target: str, exclude: str | None = None) -> TargetSet:
+        """Parse a comma-separated target string.
+
+        Each item is a CIDR, a single IP or an ``a-b`` range; items
+        prefixed with ``!`` (and everything in ``exclude``) are removed.
+
+        Raises:
+            ValueError: If any item is not a valid address, network or range.
+        """
+        include: dict[int, list[tuple[int, int]]] = {}
+        holes: dict[int, list[tuple[int, int]]] = {}
+
+        includes, excludes = split_target_spec(target, exclude)
+        for spec in includes:
+            version, start, end = _spec_range(spec)
+            if start <= end:
+                include.setdefault(version, []).append((start, end))
+        for spec in excludes:
+            version, start, end = _spec_range(spec, hosts_only=False)
+            holes.setdefault(version, []).append((start, end))
+
+        if not include:
+            raise ValueError(f"No scan targets in '{target}'")
+
+        ranges = {
+            version: _subtract(_merge(rs), _merge(holes.get(version, [])))
+            for version, rs in include.items()
+        }
+        spec_text = target if not exclude else f"{target},!{exclude}"
+        return cls(ranges, spec=spec_text)
+
+    @classmethod
+    def resolve(cls, target: str, exclude: str | None = None) -> TargetSet:
+        """Like :meth:`parse`, but hostname items are looked up in DNS.
+
+        Each hostname contributes every address it resolves to. Blocks
+        on name resolution, so call it off the event loop.
+
+        Raises:
+            ValueError: If an item is neither a valid address spec nor a
+                resolvable hostname.
+        """
+        includes, excludes = split_target_spec(target, exclude)
+        resolved = [
+            ",".join(_resolve_item(spec) for spec in specs) for specs in (includes, excludes)
+        ]
+        targets = cls.parse(resolved[0], resolved[1] or None)
+        targets._spec = target if not exclude else f"{target},!{exclude}"
+        return targets
+
+    def __contains__(self, ip: object) -> bool:
+        if isinstance(ip, str):
+            try:
+                ip = ipaddress.ip_address(ip)
+            except ValueError:
+                return False
+        if not isinstance(ip, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+            return False
+        starts = self._starts.get(ip.version)
+        if not starts:
+            return False
+        value = int(ip)
+        idx = bisect.bisect_right(starts, value) - 1
+        return idx >= 0 and value <= self._ranges[ip.version][idx][1]
+
+    def __iter__(self) -> Iterator[str]:
+        for version in sorted(self._ranges):
+            factory = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+            for start, end in self._ranges[version]:
+                for value in range(start, end + 1):
+                    yield str(factory(value))
+
+    @property
+    def size(self) -> int:
+        """Number of addresses in the set."""
+        return sum(end - start + 1 for rs in self._ranges.values() for start, end in rs)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __bool__(self) -> bool:
+        return bool(self._ranges)
+
+    def only_version(self, version: int) -> TargetSet:
+        """The subset of addresses of one IP version (4 or 6)."""
+        return TargetSet({version: self._ranges.get(version, [])}, spec=self._spec)
+
+    def ranges(self) -> Iterator[tuple[_IPAddress, _IPAddress]]:
+        """Iterate the merged ranges as ``(first, last)`` address pairs."""
+        for version in sorted(self._ranges):
+            factory = ipaddress.IPv4Address if version == 4 else ipaddress.IPv6Address
+            for start, end in self._ranges[version]:
+                yield factory(start), factory(end)
+
+    def __str__(self) -> str:
+        return self._spec
+
+    def __repr__(self) -> str:
+        return f"TargetSet({self._spec!r}, ranges={sum(len(r) for r in self._ranges.values())})"
@@ -2,11 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import dataclasses
+import hashlib
+import logging
 import ssl
-import socket
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
+from cryptography import x509
+from cryptography.hazmat.primitives.asymmetric import dsa, ec, ed448, ed25519, rsa
+from cryptography.x509.oid import NameOID
+
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CertificateInfo:
@@ -27,6 +40,7 @@ class CertificateInfo:
     is_self_signed: bool = False
     is_expired: bool = False
     days_until_expiry: int | None = None
+    cert_fingerprint: str | None = None  # SHA-256 of the DER certificate
 
     @property
     def expiry_status(self) -> str:
@@ -78,6 +92,7 @@ class CertificateInfo:
             "is_self_signed": self.is_self_signed,
             "is_expired": self.is_expired,
             "days_until_expiry": self.days_until_expiry,
+            "cert_fingerprint": self.cert_fingerprint,
             "expiry_status": self.expiry_status,
             "security_issues": self.security_issues,
         }
@@ -111,6 +126,13 @@ class CertScanResult:
 # Common TLS ports to scan
 TLS_PORTS = [443, 8443, 993, 995, 636, 8883, 9443]
 
+# Global in-flight handshake budget and per-host connection limit
+DEFAULT_TLS_CONCURRENCY = 128
+DEFAULT_TLS_HOST_CONCURRENCY = 2
+
+# Parsed certificates kept by fingerprint (shared certs are parsed once)
+CERT_CACHE_MAX_SIZE = 4096
+
 
 # SSL date format: 'Mon DD HH:MM:SS YYYY GMT'
 _SSL_DATE_FMT = "%b %d %H:%M:%S %Y %Z"
@@ -220,6 +242,18 @@ def calculate_days_until_expiry(not_after: str) -> int:
     return delta.days
 
 
+def expiry_from_valid_to(valid_to: str | None) -> tuple[int | None, bool]:
+    """Return ``(days_until_expiry, is_expired)`` for an ISO ``valid_to``."""
+    if not valid_to:
+        return None, False
+    try:
+        expiry = datetime.fromisoformat(valid_to)
+    except (TypeError, ValueError):
+        return None, False
+    days = (expiry - datetime.now(timezone.utc)).days
+    return days, days < 0
+
+
 def is_cert_self_signed(subject_cn: str | None, issuer_cn: str | None) -> bool:
     """Determine if a certificate is self-signed (subject CN == issuer CN)."""
     if subject_cn is None or issuer_cn is None:
@@ -227,6 +261,216 @@ def is_cert_self_signed(subject_cn: str | None, issuer_cn: str | None) -> bool:
     return subject_cn.lower() == issuer_cn.lower()
 
 
+def _tls_context() -> ssl.SSLContext:
+    """Client context that accepts any certificate (we inspect, not trust)."""
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+_KEY_ALGORITHMS = (
+    (rsa.RSAPublicKey, "RSA"),
+    (ec.EllipticCurvePublicKey, "ECDSA"),
+    (ed25519.Ed25519PublicKey, "Ed25519"),
+    (ed448.Ed448PublicKey, "Ed448"),
+    (dsa.DSAPublicKey, "DSA"),
+)
+
+
+def _name_attr(name: x509.Name, oid: x509.ObjectIdentifier) -> str | None:
+    attrs = name.get_attributes_for_oid(oid)
+    return str(attrs[0].value) if attrs else None
+
+
+def _decode_der_cert(der: bytes) -> CertificateInfo:
+    """Parse a DER certificate into a CertificateInfo (``ip``/``port`` unset).
+
+    With verification disabled ``getpeercert()`` returns an empty dict,
+    so the DER bytes are the only source; unlike the dict they also
+    carry the key size and algorithms.
+
+    Raises:
+        ValueError: If ``der`` is not a valid DER certificate.
+    """
+    cert = x509.load_der_x509_certificate(der)
+    cn = _name_attr(cert.subject, NameOID.COMMON_NAME)
+    issuer_cn = _name_attr(cert.issuer, NameOID.COMMON_NAME)
+
+    try:
+        san_ext = cert.extensions.get_extension_for_class(x509.SubjectAlternativeName)
+        san = san_ext.value.get_values_for_type(x509.DNSName)
+    except x509.ExtensionNotFound:
+        san = []
+
+    public_key = cert.public_key()
+    key_algorithm = next(
+        (name for key_type, name in _KEY_ALGORITHMS if isinstance(public_key, key_type)), None,
+    )
+    hash_algorithm = cert.signature_hash_algorithm
+
+    return CertificateInfo(
+        ip="",
+        port=0,
+        cn=cn,
+        san=san,
+        issuer=issuer_cn,
+        issuer_org=_name_attr(cert.issuer, NameOID.ORGANIZATION_NAME),
+        valid_from=cert.not_valid_before_utc.isoformat(),
+        valid_to=cert.not_valid_after_utc.isoformat(),
+        serial=f"{cert.serial_number:X}",
+        key_size=getattr(public_key, "key_size", None),
+        key_algorithm=key_algorithm,
+        signature_algorithm=hash_algorithm.name if hash_algorithm is not None else None,
+        is_self_signed=is_cert_self_signed(cn, issuer_cn),
+    )
+
+
+def certificate_fingerprint(der: bytes) -> str:
+    """SHA-256 hex digest of a DER-encoded certificate."""
+    return hashlib.sha256(der).hexdigest()
+
+
+_parsed_certs: OrderedDict[str, CertificateInfo] = OrderedDict()
+_parsed_certs_lock = threading.Lock()
+
+
+def certificate_from_der(der: bytes, ip: str, port: int) -> CertificateInfo:
+    """Build a CertificateInfo for ``ip:port`` from its DER certificate.
+
+    Parsing is content-addressed: a certificate already seen (on any
+    host) is copied from the cache and only its expiry is recomputed.
+
+    Raises:
+        ValueError: If ``der`` is not a valid DER certificate.
+    """
+    fingerprint = certificate_fingerprint(der)
+    with _parsed_certs_lock:
+        template = _parsed_certs.get(fingerprint)
+        if template is not None:
+            _parsed_certs.move_to_end(fingerprint)
+
+    if template is None:
+        template = _decode_der_cert(der)
+        template.cert_fingerprint = fingerprint
+        with _parsed_certs_lock:
+            _parsed_certs[fingerprint] = template
+            while len(_parsed_certs) > CERT_CACHE_MAX_SIZE:
+                _parsed_certs.popitem(last=False)
+
+    days, expired = expiry_from_valid_to(template.valid_to)
+    return dataclasses.replace(
+        template, ip=ip, port=port, san=list(template.san),
+        days_until_expiry=days, is_expired=expired,
+    )
+
+
+async def async_fetch_certificate(
+    ip: str, port: int, timeout: float = 3.0
+) -> CertificateInfo | None:
+    """Handshake with ``ip:port`` and return its parsed certificate.
+
+    Returns None if the port is closed, filtered, not TLS, or presents
+    no certificate.
+    """
+    try:
+        _reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(ip, port, ssl=_tls_context(), server_hostname=ip),
+            timeout=timeout,
+        )
+    except (OSError, ssl.SSLError, asyncio.TimeoutError):
+        return None
+
+    try:
+        ssl_object = writer.get_extra_info("ssl_object")
+        der = ssl_object.getpeercert(binary_form=True) if ssl_object else None
+    finally:
+        writer.close()
+        # Bounded: a peer that never answers close_notify can't stall the scan
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(writer.wait_closed(), timeout)
+
+    if not der:
+        return None
+    try:
+        return certificate_from_der(der, ip, port)
+    except ValueError as exc:
+        logger.debug("Could not decode certificate from %s:%d: %s", ip, port, exc)
+        return None
+
+
+def _ports_for_asset(asset: dict, ports: list[int] | None) -> list[int]:
+    """TLS ports worth trying on an asset.
+
+    The requested (or default) TLS ports plus any open HTTPS-like ports,
+    minus ports the asset's last port scan actually probed and found
+    closed (``scanned_ports``, top level or in ``raw_evidence``).
+    Explicitly requested ports are always tried.
+    """
+    open_ports = set(asset.get("open_ports") or [])
+    scan_ports = set(ports or TLS_PORTS) | (open_ports & set(TLS_PORTS))
+    probed = asset.get("scanned_ports") or (asset.get("raw_evidence") or {}).get("scanned_ports")
+    if probed:
+        scan_ports -= set(probed) - open_ports - set(ports or ())
+    return sorted(scan_ports)
+
+
+async def async_scan_all_certificates(
+    assets: Iterable[dict],
+    ports: list[int] | None = None,
+    timeout: float = 3.0,
+    max_concurrency: int = DEFAULT_TLS_CONCURRENCY,
+    host_concurrency: int = DEFAULT_TLS_HOST_CONCURRENCY,
+) -> CertScanResult:
+    """Harvest certificates from many assets concurrently.
+
+    At most ``max_concurrency`` handshakes are in flight overall and at
+    most ``host_concurrency`` per host, so filtered hosts cost one
+    timeout per batch instead of one per port. A fixed pool of host
+    workers pulls assets lazily from ``assets``, so a large target
+    (e.g. a lazily iterated /16) never has more than the pool's hosts
+    in memory at once.
+
+    Args:
+        assets: Asset dicts with ``ip`` and optionally ``open_ports``
+            and ``scanned_ports`` (used to skip known-closed ports).
+        ports: TLS ports to try. Defaults to :data:`TLS_PORTS`.
+        timeout: Per-handshake timeout in seconds.
+        max_concurrency: Global in-flight handshake budget.
+        host_concurrency: Concurrent handshakes per host.
+    """
+    budget = asyncio.Semaphore(max(1, max_concurrency))
+    host_concurrency = max(1, host_concurrency)
+    pending_assets = iter(assets)
+    certs: list[CertificateInfo] = []
+    scanned = 0
+
+    async def _scan_host(ip: str, host_ports: list[int]) -> None:
+        pending_ports = iter(host_ports)
+
+        async def _port_worker() -> None:
+            for port in pending_ports:
+                async with budget:
+                    cert = await async_fetch_certificate(ip, port, timeout=timeout)
+                if cert is not None:
+                    certs.append(cert)
+
+        await asyncio.gather(*(_port_worker() for _ in range(min(host_concurrency, len(host_ports)))))
+
+    async def _host_worker() -> None:
+        nonlocal scanned
+        for asset in pending_assets:
+            ip = asset.get("ip", "")
+            if not ip:
+                continue
+            scanned += 1
+            await _scan_host(ip, _ports_for_asset(asset, ports))
+
+    host_workers = max(1, max_concurrency // host_concurrency)
+    await asyncio.gather(*(_host_worker() for _ in range(host_workers)))
+    return _summarize(certs, total_scanned=scanned)
+
+
 def scan_host_certificates(
     ip: str, ports: list[int] | None = None, timeout: float = 3.0
 ) -> list[CertificateInfo]:
@@ -236,53 +480,33 @@ def scan_host_certificates(
     """
     if ports is None:
         ports = TLS_PORTS
-
-    results: list[CertificateInfo] = []
-
-    for port in ports:
-        try:
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-
-            with socket.create_connection((ip, port), timeout=timeout) as sock:
-                with ctx.wrap_socket(sock, server_hostname=ip) as ssock:
-                    cert_dict = ssock.getpeercert(binary_form=False)
-                    if cert_dict:
-                        info = parse_certificate(cert_dict, ip, port)
-                        results.append(info)
-        except (OSError, ssl.SSLError, socket.timeout, ConnectionRefusedError):
-            continue
-
-    return results
+    result = asyncio.run(
+        async_scan_all_certificates([{"ip": ip}], ports=ports, timeout=timeout)
+    )
+    return result.certificates
 
 
 def scan_all_certificates(
-    assets: list[dict], ports: list[int] | None = None
+    assets: list[dict],
+    ports: list[int] | None = None,
+    timeout: float = 3.0,
+    max_concurrency: int = DEFAULT_TLS_CONCURRENCY,
+    host_concurrency: int = DEFAULT_TLS_HOST_CONCURRENCY,
 ) -> CertScanResult:
     """Scan all assets for TLS certificates.
 
-    For each asset, check TLS_PORTS plus any HTTPS ports from open_ports.
+    For each asset, check TLS_PORTS plus any HTTPS ports from open_ports,
+    skipping ports a previous port scan probed and found closed. Handshakes run
+    concurrently (see :func:`async_scan_all_certificates`).
     """
-    all_certs: list[CertificateInfo] = []
-    total_scanned = 0
-
-    for asset in assets:
-        ip = asset.get("ip", "")
-        if not ip:
-            continue
-
-        # Build port list: default TLS ports + any open HTTPS-like ports
-        scan_ports = set(ports or TLS_PORTS)
-        for p in asset.get("open_ports", []):
-            if p in (443, 8443, 993, 995, 636, 8883, 9443):
-                scan_ports.add(p)
+    return asyncio.run(async_scan_all_certificates(
+        assets, ports=ports, timeout=timeout,
+        max_concurrency=max_concurrency, host_concurrency=host_concurrency,
+    ))
 
-        total_scanned += 1
-        certs = scan_host_certificates(ip, ports=sorted(scan_ports))
-        all_certs.extend(certs)
 
-    # Calculate summary counts
+def _summarize(all_certs: list[CertificateInfo], total_scanned: int) -> CertScanResult:
+    """Build a CertScanResult with summary counts."""
     expired_count = sum(1 for c in all_certs if c.is_expired)
     expiring_soon_count = sum(
         1
@@ -7,6 +7,7 @@ import logging
 import shutil
 import xml.etree.ElementTree as ET
 
+from bigr.scanner.targets import split_target_spec
 from bigr.shield.models import FindingSeverity, ShieldFinding
 from bigr.shield.modules.base import ScanModule
 
@@ -36,6 +37,19 @@ NMAP_TIMEOUT = 120
 OPEN_PORT_THRESHOLD = 10
 
 
+def _nmap_target_args(target: str) -> list[str]:
+    """Translate a target spec (see TargetSet) into nmap arguments.
+
+    Comma-separated items become separate nmap targets and ``!`` items
+    are passed through ``--exclude``.
+    """
+    includes, excludes = split_target_spec(target)
+    args = list(includes) or [target]
+    if excludes:
+        args += ["--exclude", ",".join(excludes)]
+    return args
+
+
 def _parse_nmap_xml(xml_text: str) -> list[dict]:
     """Parse nmap XML output and return a list of open port dicts.
 
@@ -130,7 +144,7 @@ class PortScanModule(ScanModule):
             "-sV",               # Service version detection
             "--open",            # Only show open ports
             "-oX", "-",          # XML output to stdout
-            target,
+            *_nmap_target_args(target),
         ]
 
         try:
@@ -108,6 +108,9 @@ class TLSCheckModule(ScanModule):
         self.last_certificates = []
         actual_port = port or 443
 
+        if _is_multi_host(target):
+            return await self._scan_network(target, port)
+
         # Step 1: Connect and retrieve certificate info
         cert_info: dict | None = None
         cipher_info: tuple | None = None
@@ -236,20 +239,8 @@ class TLSCheckModule(ScanModule):
                     is_self_signed = True
 
             if is_self_signed:
-                findings.append(ShieldFinding(
-                    module="tls",
-                    severity=FindingSeverity.HIGH,
-                    title="Self-Signed Certificate",
-                    description=(
-                        f"The certificate for {target} is self-signed. "
-                        "Clients will not trust this certificate by default."
-                    ),
-                    remediation="Replace with a certificate signed by a trusted Certificate Authority.",
-                    target_ip=target,
-                    target_port=actual_port,
-                    evidence={"self_signed": True, "chain_error": chain_error},
-                    attack_technique="T1557",
-                    attack_tactic="Credential Access",
+                findings.append(_self_signed_finding(
+                    target, actual_port, {"self_signed": True, "chain_error": chain_error},
                 ))
             else:
                 findings.append(ShieldFinding(
@@ -272,45 +263,16 @@ class TLSCheckModule(ScanModule):
                 try:
                     # Python ssl module returns dates like 'Jan  5 00:00:00 2025 GMT'
                     not_after = _parse_ssl_date(not_after_str)
-                    now = datetime.now(timezone.utc)
-                    days_remaining = (not_after - now).days
-
-                    if days_remaining < 0:
-                        findings.append(ShieldFinding(
-                            module="tls",
-                            severity=FindingSeverity.CRITICAL,
-                            title="Certificate Expired",
-                            description=(
-                                f"The certificate for {target} expired {abs(days_remaining)} days ago "
-                                f"(expiry: {not_after.isoformat()})."
-                            ),
-                            remediation="Renew the TLS certificate immediately.",
-                            target_ip=target,
-                            target_port=actual_port,
-                            evidence={
-                                "not_after": not_after.isoformat(),
-                                "days_remaining": days_remaining,
-                            },
-                        ))
-                    elif days_remaining <= EXPIRY_WARNING_DAYS:
-                        findings.append(ShieldFinding(
-                            module="tls",
-                            severity=FindingSeverity.MEDIUM,
-                            title="Certificate Expiring Soon",
-                            description=(
-                                f"The certificate for {target} expires in {days_remaining} days "
-                                f"(expiry: {not_after.isoformat()})."
-                            ),
-                            remediation=f"Renew the TLS certificate before {not_after.date().isoformat()}.",
-                            target_ip=target,
-                            target_port=actual_port,
-                            evidence={
-                                "not_after": not_after.isoformat(),
-                                "days_remaining": days_remaining,
-                            },
-                        ))
                 except (ValueError, TypeError):
-                    pass
+                    not_after = None
+                if not_after is not None:
+                    days_remaining = (not_after - datetime.now(timezone.utc)).days
+                    finding = _expiry_finding(
+                        target, actual_port, not_after.isoformat(), days_remaining,
+                        {"not_after": not_after.isoformat(), "days_remaining": days_remaining},
+                    )
+                    if finding is not None:
+                        findings.append(finding)
 
         # Step 4: Protocol version check
         if protocol_version:
@@ -332,21 +294,10 @@ class TLSCheckModule(ScanModule):
 
         # Step 5: Key size check
         if cert_info:
-            # The key size is not directly in getpeercert() dict, but we can
-            # try to extract from the DER cert if cryptography is available,
-            # otherwise skip this check.
-            key_bits = _extract_key_bits(peer_cert_der)
-            if key_bits is not None and key_bits < 2048:
-                findings.append(ShieldFinding(
-                    module="tls",
-                    severity=FindingSeverity.HIGH,
-                    title="Weak Certificate Key Size",
-                    description=f"The certificate uses a {key_bits}-bit key, which is below the recommended 2048-bit minimum.",
-                    remediation="Generate a new certificate with at least a 2048-bit RSA key or 256-bit ECDSA key.",
-                    target_ip=target,
-                    target_port=actual_port,
-                    evidence={"key_bits": key_bits},
-                ))
+            # The key size is not in the getpeercert() dict; read it from the DER cert
+            finding = _weak_key_finding(target, actual_port, _extract_key_bits(peer_cert_der))
+            if finding is not None:
+                findings.append(finding)
 
         # Step 6: Cipher suite check
         if cipher_info:
@@ -395,7 +346,7 @@ class TLSCheckModule(ScanModule):
 
         # Collect certificate metadata for DB persistence
         if cert_info:
-            from bigr.scanner.tls import parse_certificate
+            from bigr.scanner.tls import certificate_fingerprint, parse_certificate
 
             try:
                 cert_obj = parse_certificate(cert_info, target, actual_port)
@@ -404,12 +355,132 @@ class TLSCheckModule(ScanModule):
                 key_bits = _extract_key_bits(peer_cert_der)
                 if key_bits is not None:
                     cert_dict["key_size"] = key_bits
+                if isinstance(peer_cert_der, bytes):
+                    cert_dict["cert_fingerprint"] = certificate_fingerprint(peer_cert_der)
                 self.last_certificates.append(cert_dict)
             except Exception:
                 pass  # Best-effort — don't fail the scan
 
         return findings
 
+    async def _scan_network(self, target: str, port: int | None) -> list[ShieldFinding]:
+        """Harvest certificates across a multi-host target concurrently.
+
+        Per-connection checks (chain, protocol, cipher, HSTS) need a
+        single endpoint; for networks we report certificate issues only.
+        """
+        from bigr.scanner.targets import TargetSet
+        from bigr.scanner.tls import async_scan_all_certificates
+
+        result = await async_scan_all_certificates(
+            ({"ip": ip} for ip in TargetSet.parse(target)),
+            ports=[port] if port else None,
+            timeout=DEFAULT_TIMEOUT,
+        )
+        findings: list[ShieldFinding] = []
+        for cert in result.certificates:
+            self.last_certificates.append(cert.to_dict())
+            findings.extend(_certificate_findings(cert))
+        return findings
+
+
+def _is_multi_host(target: str) -> bool:
+    """True if the target is a network, range or list of several hosts."""
+    from bigr.scanner.targets import TargetSet
+
+    try:
+        return TargetSet.parse(target).size > 1
+    except ValueError:
+        return False
+
+
+def _certificate_findings(cert) -> list[ShieldFinding]:
+    """Findings for a harvested CertificateInfo (expiry, self-signed, key size)."""
+    findings = [
+        _expiry_finding(
+            cert.ip, cert.port, cert.valid_to, cert.days_until_expiry,
+            {"cn": cert.cn, "not_after": cert.valid_to, "days_remaining": cert.days_until_expiry},
+        ),
+        _self_signed_finding(cert.ip, cert.port, {"self_signed": True, "cn": cert.cn})
+        if cert.is_self_signed else None,
+        _weak_key_finding(cert.ip, cert.port, cert.key_size),
+    ]
+    return [f for f in findings if f is not None]
+
+
+def _expiry_finding(
+    target: str, port: int, not_after: str | None, days_remaining: int | None, evidence: dict,
+) -> ShieldFinding | None:
+    """Expired / expiring-soon finding, or None if the certificate is fine."""
+    if days_remaining is None:
+        return None
+    if days_remaining < 0:
+        return ShieldFinding(
+            module="tls",
+            severity=FindingSeverity.CRITICAL,
+            title="Certificate Expired",
+            description=(
+                f"The certificate for {target} expired {abs(days_remaining)} days ago "
+                f"(expiry: {not_after})."
+            ),
+            remediation="Renew the TLS certificate immediately.",
+            target_ip=target,
+            target_port=port,
+            evidence=evidence,
+        )
+    if days_remaining <= EXPIRY_WARNING_DAYS:
+        return ShieldFinding(
+            module="tls",
+            severity=FindingSeverity.MEDIUM,
+            title="Certificate Expiring Soon",
+            description=(
+                f"The certificate for {target} expires in {days_remaining} days "
+                f"(expiry: {not_after})."
+            ),
+            remediation=(
+                f"Renew the TLS certificate before {not_after[:10]}."
+                if not_after else "Renew the TLS certificate before it expires."
+            ),
+            target_ip=target,
+            target_port=port,
+            evidence=evidence,
+        )
+    return None
+
+
+def _self_signed_finding(target: str, port: int, evidence: dict) -> ShieldFinding:
+    return ShieldFinding(
+        module="tls",
+        severity=FindingSeverity.HIGH,
+        title="Self-Signed Certificate",
+        description=(
+            f"The certificate for {target} is self-signed. "
+            "Clients will not trust this certificate by default."
+        ),
+        remediation="Replace with a certificate signed by a trusted Certificate Authority.",
+        target_ip=target,
+        target_port=port,
+        evidence=evidence,
+        attack_technique="T1557",
+        attack_tactic="Credential Access",
+    )
+
+
+def _weak_key_finding(target: str, port: int, key_bits: int | None) -> ShieldFinding | None:
+    """Finding for a key below 2048 bits, or None."""
+    if key_bits is None or key_bits >= 2048:
+        return None
+    return ShieldFinding(
+        module="tls",
+        severity=FindingSeverity.HIGH,
+        title="Weak Certificate Key Size",
+        description=f"The certificate uses a {key_bits}-bit key, which is below the recommended 2048-bit minimum.",
+        remediation="Generate a new certificate with at least a 2048-bit RSA key or 256-bit ECDSA key.",
+        target_ip=target,
+        target_port=port,
+        evidence={"key_bits": key_bits},
+    )
+
 
 def _parse_ssl_date(date_str: str) -> datetime:
     """Parse ssl module date string like 'Jan  5 00:00:00 2025 GMT'."""
@@ -435,10 +506,10 @@ def _parse_ssl_date(date_str: str) -> datetime:
 
 
 def _extract_key_bits(cert_der: bytes | None) -> int | None:
-    """Try to extract key bit length from DER-encoded certificate.
+    """Key bit length of a DER-encoded certificate, or None if unavailable.
 
-    Uses the cryptography library if available, otherwise returns None.
-    This is a best-effort check -- we don't add external dependencies.
+    Best-effort: returns None for missing or undecodable certificates and
+    key types without a bit length (e.g. Ed25519).
     """
     if cert_der is None:
         return None
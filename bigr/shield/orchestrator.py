@@ -6,6 +6,8 @@ import asyncio
 import logging
 from datetime import datetime, timezone
 
+from bigr.core.events import publish
+from bigr.scanner.targets import TargetSet
 from bigr.shield.models import (
     FindingSeverity,
     ModuleScore,
@@ -118,12 +120,13 @@ class ShieldOrchestrator:
 
         scan.status = ScanStatus.RUNNING
         scan.started_at = datetime.now(timezone.utc)
+        _publish_progress(scan)
 
         try:
             all_findings = []
             module_scores: dict[str, ModuleScore] = {}
 
-            for module_name in scan.modules_enabled:
+            for index, module_name in enumerate(scan.modules_enabled, start=1):
                 module = self._modules.get(module_name)
                 if module is None or not module.check_available():
                     logger.warning("Module '%s' not available, skipping", module_name)
@@ -149,6 +152,10 @@ class ShieldOrchestrator:
                 ms = _compute_module_score(module_name, findings)
                 module_scores[module_name] = ms
 
+                for f in findings:
+                    publish("shield.finding", f.to_dict())
+                _publish_progress(scan, module=module_name, modules_done=index)
+
             # Update scan with results
             scan.findings = all_findings
             scan.module_scores = module_scores
@@ -175,6 +182,7 @@ class ShieldOrchestrator:
 
         finally:
             scan.completed_at = datetime.now(timezone.utc)
+            _publish_progress(scan)
 
         return scan
 
@@ -188,10 +196,40 @@ class ShieldOrchestrator:
         return all_scans[:limit]
 
 
+def _publish_progress(
+    scan: ShieldScan, module: str | None = None, modules_done: int | None = None
+) -> None:
+    """Publish a ``shield.scan`` status/progress event for *scan*."""
+    data = {
+        "scan_id": scan.id,
+        "status": scan.status.value,
+        "target": scan.target,
+        "modules_total": len(scan.modules_enabled),
+    }
+    if module is not None:
+        data["module"] = module
+        data["modules_done"] = modules_done
+    if scan.status in (ScanStatus.COMPLETED, ScanStatus.FAILED):
+        data["shield_score"] = scan.shield_score
+        data["grade"] = scan.grade.value if scan.grade else None
+        data["findings_count"] = len(scan.findings)
+    publish("shield.scan", data)
+
+
 def _detect_target_type(target: str) -> str:
-    """Detect whether the target is an IP, domain, or CIDR."""
+    """Detect whether the target is an IP, domain, or CIDR.
+
+    Multi-target specs (comma-separated CIDRs/IPs, ``a-b`` ranges and
+    ``!`` exclusions, see :class:`TargetSet`) are treated as "cidr".
+    """
     if "/" in target:
         return "cidr"
+    if any(sep in target for sep in (",", "-", "!")):
+        try:
+            TargetSet.parse(target)
+            return "cidr"
+        except ValueError:
+            pass
     # Simple heuristic: if all parts are digits or dots, it's an IP
     parts = target.split(".")
     if len(parts) == 4:
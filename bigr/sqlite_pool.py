@@ -0,0 +1,132 @@
+"""Shared per-thread SQLite connections with a tuned pragma profile.
+
+``bigr.db``, analytics, the CVE cache and the switch registry used to
+open a fresh connection (and re-run their pragmas) for every helper
+call. :func:`get_connection` instead hands out one long-lived
+connection per thread and database file. Callers keep the usual
+``conn = ...; try: ... finally: conn.close()`` shape: ``close()`` on a
+pooled connection rolls back anything left uncommitted and returns it
+to the pool rather than closing it.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+# Applied once when a connection is opened
+PRAGMAS: tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",  # 256 MiB
+    "PRAGMA cache_size=-32768",  # 32 MiB
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+STATEMENT_CACHE_SIZE = 256
+# Passive WAL checkpoint at most this often per connection (seconds)
+CHECKPOINT_INTERVAL = 300.0
+# Least recently used connections beyond this are closed (per thread)
+MAX_CONNECTIONS_PER_THREAD = 8
+
+
+class PooledConnection(sqlite3.Connection):
+    """A connection whose ``close()`` returns it to the per-thread pool."""
+
+    _checkouts = 0
+
+    def close(self) -> None:
+        self._checkouts = max(0, self._checkouts - 1)
+        if self._checkouts == 0 and self.in_transaction:
+            self.rollback()
+
+    def dispose(self) -> None:
+        """Really close the underlying connection."""
+        super().close()
+
+
+@dataclass
+class _Entry:
+    conn: PooledConnection
+    file_id: tuple[int, int] | None
+    last_checkpoint: float
+
+
+class _ThreadPool(threading.local):
+    def __init__(self) -> None:
+        self.pid = os.getpid()
+        self.entries: OrderedDict[str, _Entry] = OrderedDict()
+
+
+_pool = _ThreadPool()
+
+
+def _file_id(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+def _open(path: str) -> _Entry:
+    conn = sqlite3.connect(
+        path,
+        factory=PooledConnection,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return _Entry(conn, _file_id(path), time.monotonic())
+
+
+def get_connection(db_path: Path | str) -> sqlite3.Connection:
+    """Return this thread's connection to ``db_path``, opening it if needed.
+
+    A cached connection is reopened if the database file was deleted or
+    replaced since it was opened, or if the process has forked.
+    """
+    path = str(db_path)
+    pool = _pool
+    if pool.pid != os.getpid():
+        # Connections must not cross a fork; drop them without closing
+        pool.entries = OrderedDict()
+        pool.pid = os.getpid()
+
+    entry = pool.entries.get(path)
+    if entry is not None and entry.file_id != _file_id(path):
+        pool.entries.pop(path)
+        entry.conn.dispose()
+        entry = None
+
+    if entry is None:
+        entry = _open(path)
+        pool.entries[path] = entry
+        while len(pool.entries) > MAX_CONNECTIONS_PER_THREAD:
+            _, evicted = pool.entries.popitem(last=False)
+            evicted.conn.dispose()
+    else:
+        pool.entries.move_to_end(path)
+        now = time.monotonic()
+        if entry.conn._checkouts == 0 and now - entry.last_checkpoint >= CHECKPOINT_INTERVAL:
+            entry.conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            entry.last_checkpoint = now
+
+    conn = entry.conn
+    conn.row_factory = sqlite3.Row
+    conn._checkouts += 1
+    return conn
+
+
+def close_connections() -> None:
+    """Close every pooled connection held by the calling thread."""
+    entries, _pool.entries = _pool.entries, OrderedDict()
+    for entry in entries.values():
+        entry.conn.dispose()
@@ -5,6 +5,7 @@ from __future__ import annotations
 import sqlite3
 from pathlib import Path
 
+from bigr.sqlite_pool import get_connection
 from bigr.vuln.models import CveEntry
 
 
@@ -21,10 +22,8 @@ def _resolve_path(db_path: Path | None) -> Path:
 
 
 def _connect(db_path: Path) -> sqlite3.Connection:
-    """Open a connection and return it."""
-    conn = sqlite3.connect(str(db_path))
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Return this thread's pooled connection to the CVE database."""
+    return get_connection(db_path)
 
 
 def init_cve_db(db_path: Path | None = None) -> None:
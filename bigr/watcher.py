@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import logging
 import os
+import random
 import signal
+import threading
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from logging.handlers import RotatingFileHandler
@@ -21,12 +26,22 @@ from bigr.alerts.channels import (
     dispatch_alerts,
 )
 from bigr.alerts.engine import evaluate_diff
-from bigr.diff import diff_scans
+from bigr.db import get_watcher_baseline, save_watcher_baseline
+from bigr.diff import baseline_record, diff_scans
+from bigr.scanner.netlink import NeighborEvent
+from bigr.scanner.targets import TargetSet
 
 _DEFAULT_DIR = Path.home() / ".bigr"
 _MAX_SCAN_HISTORY = 100
 _MAX_ALERT_HISTORY = 200
 
+# Scheduler defaults: concurrent scans, and the share of each interval
+# used as random start offset so targets don't all fire together
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_JITTER_FRACTION = 0.1
+# A dispatch later than this past its due time counts as a missed deadline
+_DEADLINE_GRACE_SECONDS = 1.0
+
 
 @dataclass
 class WatcherStatus:
@@ -133,6 +148,10 @@ class WatcherDaemon:
         Optional database path override.
     channels:
         Alert channels for dispatching scan-diff alerts.
+    max_workers:
+        Maximum number of targets scanned concurrently.
+    jitter:
+        Fraction of each target's interval used as a random start offset.
     """
 
     def __init__(
@@ -144,6 +163,8 @@ class WatcherDaemon:
         scan_func: Callable[[str], Any] | None = None,
         db_path: Path | None = None,
         channels: list[AlertChannel] | None = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        jitter: float = DEFAULT_JITTER_FRACTION,
     ) -> None:
         self._bigr_dir = bigr_dir or _DEFAULT_DIR
         self._bigr_dir.mkdir(parents=True, exist_ok=True)
@@ -158,16 +179,30 @@ class WatcherDaemon:
         self._logger = self._setup_logger()
         self._channels: list[AlertChannel] = channels or []
 
-        # Per-target scheduling
+        # Per-target scheduling: a min-heap of
+        # (due_at, seq, subnet, nominal_due) where nominal_due is None for
+        # one-off early scans
         self._last_scan_time: dict[str, float] = {}
+        self._max_workers = max(1, max_workers)
+        self._jitter = max(0.0, jitter)
+        self._schedule: list[tuple[float, int, str, float | None]] = []
+        self._seq = itertools.count()
+        self._in_flight: set[str] = set()
+        # Regular slots that came due while a one-off scan was running
+        self._deferred: dict[str, float] = {}
+        self._deadlines: dict[str, dict[str, Any]] = {}
+        self._state_lock = threading.Lock()
+        self._wake = threading.Event()
 
         # In-memory history (bounded)
         self._scan_history: deque[dict] = deque(maxlen=_MAX_SCAN_HISTORY)
         self._alert_history: deque[dict] = deque(maxlen=_MAX_ALERT_HISTORY)
         self._scan_count = 0
 
-        # Previous scan results for diffing (keyed by subnet)
-        self._last_results: dict[str, list[dict]] = {}
+        # Previous scan results for diffing are persisted per subnet as
+        # compact baseline records (see bigr.diff.baseline_record), so
+        # memory stays flat and change detection survives restarts
+        self._baseline_db = db_path or (self._bigr_dir / "bigr.db")
 
     def _setup_logger(self) -> logging.Logger:
         """Configure a rotating file logger."""
@@ -190,17 +225,24 @@ class WatcherDaemon:
 
         return logger
 
-    @staticmethod
-    def _default_scan(subnet: str) -> list[dict]:
+    def _default_scan(self, subnet: str) -> list[dict]:
         """Default scan function - runs hybrid scan + classify + save.
 
+        Scans incrementally against the persisted inventory: only new or
+        changed hosts (and a rotating share of stable ones) are
+        port-scanned.
+
         Returns the list of asset dicts for change detection.
         """
         from bigr.classifier.bigr_mapper import classify_assets
-        from bigr.db import save_scan
-        from bigr.scanner.hybrid import run_hybrid_scan
+        from bigr.db import get_port_baseline, save_scan
+        from bigr.scanner.hybrid import ScanProgressLogger, run_hybrid_scan
 
-        result = run_hybrid_scan(subnet)
+        result = run_hybrid_scan(
+            subnet,
+            baseline=get_port_baseline() or None,
+            on_batch=ScanProgressLogger(subnet, self._logger),
+        )
         classify_assets(result.assets, do_fingerprint=True)
         save_scan(result)
         return [a.to_dict() if hasattr(a, "to_dict") else a for a in result.assets]
@@ -209,6 +251,7 @@ class WatcherDaemon:
         """Handle SIGTERM/SIGINT for graceful shutdown."""
         self._logger.info("Signal %d received, stopping...", signum)
         self._running = False
+        self._wake.set()
 
     def _should_scan(self, target: dict) -> bool:
         """Check if a target is due for scanning based on its interval."""
@@ -217,6 +260,66 @@ class WatcherDaemon:
         last = self._last_scan_time.get(subnet, 0)
         return (time.time() - last) >= interval
 
+    def _push(self, due_at: float, subnet: str, nominal_due: float | None) -> None:
+        with self._state_lock:
+            heapq.heappush(self._schedule, (due_at, next(self._seq), subnet, nominal_due))
+        self._wake.set()
+
+    def _jittered(self, nominal_due: float, interval: float) -> float:
+        return nominal_due + random.uniform(0, interval * self._jitter)
+
+    def request_scan(self, subnet: str) -> None:
+        """Scan ``subnet`` as soon as a worker is free, outside its schedule."""
+        self._last_scan_time[subnet] = 0
+        self._push(time.time(), subnet, None)
+
+    def _deadline_stats(self, subnet: str) -> dict[str, Any]:
+        return self._deadlines.setdefault(subnet, {
+            "runs": 0, "missed_deadlines": 0, "last_lag_seconds": 0.0, "max_lag_seconds": 0.0,
+        })
+
+    def _record_dispatch(self, subnet: str, lag: float) -> None:
+        """Account one run started ``lag`` seconds after it was due."""
+        with self._state_lock:
+            stats = self._deadline_stats(subnet)
+            stats["runs"] += 1
+            stats["missed_deadlines"] += lag > _DEADLINE_GRACE_SECONDS
+            stats["last_lag_seconds"] = round(lag, 3)
+            stats["max_lag_seconds"] = round(max(stats["max_lag_seconds"], lag), 3)
+
+    def _record_skipped(self, subnet: str, slots: int) -> None:
+        """Account runs skipped because the previous scan overran them."""
+        with self._state_lock:
+            self._deadline_stats(subnet)["missed_deadlines"] += slots
+
+    @property
+    def schedule_stats(self) -> dict[str, Any]:
+        """Scheduler state: next due times, in-flight scans and missed deadlines."""
+        with self._state_lock:
+            next_due: dict[str, float] = {}
+            for due_at, _, subnet, nominal in self._schedule:
+                if nominal is not None:
+                    next_due[subnet] = min(due_at, next_due.get(subnet, due_at))
+            targets = {}
+            for target in self._targets:
+                subnet = target.get("subnet", "")
+                stats = self._deadlines.get(subnet, {})
+                targets[subnet] = {
+                    "interval_seconds": target.get("interval_seconds", 300),
+                    "next_due_at": next_due.get(subnet),
+                    "running": subnet in self._in_flight,
+                    "runs": stats.get("runs", 0),
+                    "missed_deadlines": stats.get("missed_deadlines", 0),
+                    "last_lag_seconds": stats.get("last_lag_seconds", 0.0),
+                    "max_lag_seconds": stats.get("max_lag_seconds", 0.0),
+                }
+            return {
+                "max_workers": self._max_workers,
+                "in_flight": sorted(self._in_flight),
+                "missed_deadlines": sum(t["missed_deadlines"] for t in targets.values()),
+                "targets": targets,
+            }
+
     @property
     def scan_history(self) -> list[dict]:
         """Return scan history as a list (most recent first)."""
@@ -278,6 +381,7 @@ class WatcherDaemon:
     def stop(self) -> None:
         """Stop the watcher and clean up PID file."""
         self._running = False
+        self._wake.set()
         self._logger.info("Watcher stopped.")
 
         if self._pid_path.exists():
@@ -287,91 +391,190 @@ class WatcherDaemon:
                 pass
 
     def _run_loop(self) -> None:
-        """Main loop - checks each target's interval and scans when due.
+        """Main loop - runs each target when it comes due.
+
+        Targets sit in a min-heap keyed on their next due time; the loop
+        sleeps until the earliest one (or until woken by stop, a new
+        neighbor or :meth:`request_scan`) and hands due targets to a pool
+        of ``max_workers`` threads, so a slow subnet never holds up the
+        others. Each target's next run is its previous *nominal* due time
+        plus its interval, so schedules don't drift with scan duration;
+        the per-run jitter is applied on top of that.
 
         Override or mock this for testing.
         """
         if not self._targets:
             return
 
-        # Tick interval: check every 5 seconds (or min target interval if shorter)
-        min_interval = min(
-            t.get("interval_seconds", 300) for t in self._targets
-        )
-        tick = min(5, min_interval)
-
+        now = time.time()
+        for target in self._targets:
+            subnet = target.get("subnet", "")
+            if subnet:
+                interval = target.get("interval_seconds", 300)
+                self._push(self._jittered(now, interval), subnet, now)
+
+        # Keep one mDNS listener up so scans read a snapshot instead of
+        # listening for a fixed window each cycle
+        from bigr.scanner.mdns import start_mdns_listener, stop_mdns_listener
+        from bigr.scanner.netlink import NeighborMonitor
+
+        start_mdns_listener()
+        # New neighbors (Linux netlink) make their target due right away
+        neighbor_monitor = NeighborMonitor(self._on_neighbor_event)
+        neighbor_monitor.start()
+        pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="bigr-watch")
         try:
-            # Run first cycle immediately
-            self._run_single_cycle()
             while self._running:
-                time.sleep(tick)
-                self._run_single_cycle()
+                self._wake.clear()
+                entry = self._pop_due()
+                if entry is None:
+                    with self._state_lock:
+                        wait = self._schedule[0][0] - time.time() if self._schedule else None
+                    self._wake.wait(wait)
+                    continue
+                pool.submit(self._dispatch, *entry)
         except KeyboardInterrupt:
             self._logger.info("Keyboard interrupt received.")
         finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            neighbor_monitor.stop()
+            stop_mdns_listener()
             self.stop()
 
-    def _run_single_cycle(self) -> None:
-        """Execute one scan cycle — only scans targets that are due."""
+    def _pop_due(self) -> tuple[dict, float, float | None] | None:
+        """Pop the next due target that is not already being scanned."""
+        targets = {t.get("subnet", ""): t for t in self._targets}
+        with self._state_lock:
+            now = time.time()
+            while self._schedule and self._schedule[0][0] <= now:
+                due_at, _, subnet, nominal = heapq.heappop(self._schedule)
+                target = targets.get(subnet)
+                if target is None:
+                    continue
+                if subnet in self._in_flight:
+                    # Still running: a one-off early scan is dropped; a
+                    # regular slot is handed to the running scan, which
+                    # schedules the next one when it finishes
+                    if nominal is not None:
+                        self._deferred[subnet] = nominal
+                    continue
+                self._in_flight.add(subnet)
+                return target, due_at, nominal
+        return None
+
+    def _dispatch(self, target: dict, due_at: float, nominal_due: float | None) -> None:
+        """Worker: scan one target, then schedule its next regular run."""
+        subnet = target.get("subnet", "")
+        interval = target.get("interval_seconds", 300)
+        self._record_dispatch(subnet, max(0.0, time.time() - due_at))
+        try:
+            self._scan_target(target)
+        finally:
+            with self._state_lock:
+                self._in_flight.discard(subnet)
+                deferred = self._deferred.pop(subnet, None)
+            if nominal_due is None:
+                nominal_due = deferred
+            if nominal_due is not None and self._running:
+                next_nominal = nominal_due + interval
+                now = time.time()
+                if next_nominal <= now:
+                    # The scan overran whole intervals: skip those slots
+                    skipped = int((now - next_nominal) // interval) + 1
+                    next_nominal += skipped * interval
+                    self._record_skipped(subnet, skipped)
+                self._push(self._jittered(next_nominal, interval), subnet, next_nominal)
+            else:
+                self._wake.set()
+
+    def _on_neighbor_event(self, event: NeighborEvent) -> None:
+        """Mark every target containing a newly seen neighbor as due."""
+        if event.kind != "added":
+            return
         for target in self._targets:
             subnet = target.get("subnet", "")
-            if not subnet:
+            try:
+                if event.neighbor.ip not in TargetSet.parse(subnet):
+                    continue
+            except ValueError:
                 continue
+            self._logger.info(
+                "New neighbor %s (%s) on %s, scanning %s early",
+                event.neighbor.ip, event.neighbor.mac, event.neighbor.interface, subnet,
+            )
+            self.request_scan(subnet)
 
-            if not self._should_scan(target):
-                continue
+    def _run_single_cycle(self) -> None:
+        """Execute one scan cycle — scans every due target concurrently."""
+        due = [
+            target for target in self._targets
+            if target.get("subnet", "") and self._should_scan(target)
+        ]
+        if len(due) <= 1 or self._max_workers == 1:
+            for target in due:
+                self._scan_target(target)
+            return
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(due))) as pool:
+            list(pool.map(self._scan_target, due))
 
-            self._logger.info("Scanning %s ...", subnet)
-            started_at = datetime.now(timezone.utc)
-            asset_count = 0
-            changes_count = 0
+    def _scan_target(self, target: dict) -> None:
+        """Scan one target, diff against its previous result and alert."""
+        subnet = target.get("subnet", "")
+        self._logger.info("Scanning %s ...", subnet)
+        started_at = datetime.now(timezone.utc)
+        asset_count = 0
+        changes_count = 0
 
-            try:
-                result = self._scan_func(subnet)
+        try:
+            result = self._scan_func(subnet)
 
-                # Extract asset list for diffing
-                if isinstance(result, list):
-                    current_assets = result
-                else:
-                    current_assets = []
+            # Extract asset list for diffing
+            if isinstance(result, list):
+                current_assets = result
+            else:
+                current_assets = []
 
-                asset_count = len(current_assets)
-                self._last_scan_time[subnet] = time.time()
+            asset_count = len(current_assets)
+            self._last_scan_time[subnet] = time.time()
+            with self._state_lock:
                 self._scan_count += 1
 
-                # Diff with previous scan and dispatch alerts
-                if subnet in self._last_results and current_assets:
-                    diff_result = diff_scans(current_assets, self._last_results[subnet])
-                    changes_count = len(diff_result.new_assets) + len(diff_result.removed_assets) + len(diff_result.changed_assets)
-
-                    if diff_result.has_changes and self._channels:
-                        alerts = evaluate_diff(diff_result)
-                        dispatch_alerts(alerts, self._channels)
-                        for alert in alerts:
-                            self._alert_history.append(alert.to_dict())
-
-                    self._logger.info(
-                        "Scan complete for %s: %d assets, %s",
-                        subnet,
-                        asset_count,
-                        diff_result.summary,
-                    )
-                else:
-                    self._logger.info("Scan complete for %s: %d assets (initial scan)", subnet, asset_count)
-
-                # Store for next diff
-                if current_assets:
-                    self._last_results[subnet] = current_assets
-
-            except Exception as exc:
-                self._logger.error("Scan failed for %s: %s", subnet, exc)
-
-            completed_at = datetime.now(timezone.utc)
-            self._scan_history.append({
-                "subnet": subnet,
-                "started_at": started_at.isoformat(),
-                "completed_at": completed_at.isoformat(),
-                "asset_count": asset_count,
-                "changes_count": changes_count,
-                "status": "completed" if asset_count >= 0 else "failed",
-            })
+            # Diff with the stored baseline and dispatch alerts
+            previous = get_watcher_baseline(subnet, db_path=self._baseline_db) if current_assets else []
+            if previous:
+                diff_result = diff_scans(current_assets, previous)
+                changes_count = len(diff_result.new_assets) + len(diff_result.removed_assets) + len(diff_result.changed_assets)
+
+                if diff_result.has_changes and self._channels:
+                    alerts = evaluate_diff(diff_result)
+                    dispatch_alerts(alerts, self._channels)
+                    for alert in alerts:
+                        self._alert_history.append(alert.to_dict())
+
+                self._logger.info(
+                    "Scan complete for %s: %d assets, %s",
+                    subnet,
+                    asset_count,
+                    diff_result.summary,
+                )
+            else:
+                self._logger.info("Scan complete for %s: %d assets (initial scan)", subnet, asset_count)
+
+            # Store for next diff
+            if current_assets:
+                save_watcher_baseline(
+                    subnet, [baseline_record(a) for a in current_assets], db_path=self._baseline_db,
+                )
+
+        except Exception as exc:
+            self._logger.error("Scan failed for %s: %s", subnet, exc)
+
+        completed_at = datetime.now(timezone.utc)
+        self._scan_history.append({
+            "subnet": subnet,
+            "started_at": started_at.isoformat(),
+            "completed_at": completed_at.isoformat(),
+            "asset_count": asset_count,
+            "changes_count": changes_count,
+            "status": "completed" if asset_count >= 0 else "failed",
+        })
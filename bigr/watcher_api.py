@@ -87,6 +87,19 @@ async def watcher_history(
     }
 
 
+@router.get("/schedule")
+async def watcher_schedule() -> dict:
+    """Get scheduler state.
+
+    Returns per-target next due time, run count and missed-deadline
+    accounting, plus the scans currently in flight.
+    """
+    watcher = get_watcher()
+    if not watcher:
+        return {"max_workers": 0, "in_flight": [], "missed_deadlines": 0, "targets": {}}
+    return watcher.schedule_stats
+
+
 @router.get("/alerts")
 async def watcher_alerts(
     limit: int = Query(default=50, le=200),
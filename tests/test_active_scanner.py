@@ -0,0 +1,471 @@
+"""Tests for the async connect-scan engine in bigr.scanner.active."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from bigr.models import Asset, ScanMethod
+from bigr.scanner.active import (
+    ADAPTIVE_TIMEOUT_MIN,
+    RttEstimator,
+    _record_syn_reply,
+    _syn_cookie,
+    async_scan_hosts,
+    async_tcp_probe,
+    iter_arp_sweep,
+    run_active_scan,
+    scan_asset_ports,
+    scan_hosts,
+    scan_ports,
+    syn_scan_hosts,
+)
+
+
+@pytest.fixture()
+def listener():
+    """A TCP socket listening on an ephemeral localhost port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+@pytest.fixture()
+def closed_port():
+    """A localhost port with nothing listening on it."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+# ---------------------------------------------------------------------------
+# TestScanHosts
+# ---------------------------------------------------------------------------
+
+
+class TestScanHosts:
+    """Tests for the pipelined multi-host scan."""
+
+    def test_open_and_closed_ports(self, listener, closed_port):
+        """Only the listening port is reported open."""
+        result = scan_hosts(["127.0.0.1"], ports=[listener, closed_port], timeout=1.0)
+        assert result == {"127.0.0.1": [listener]}
+
+    def test_every_host_present_in_result(self, listener):
+        """Hosts with no open ports map to an empty list."""
+        result = scan_hosts(["127.0.0.1", "127.0.0.2"], ports=[listener], timeout=1.0)
+        assert set(result) == {"127.0.0.1", "127.0.0.2"}
+        assert result["127.0.0.1"] == [listener]
+
+    def test_accepts_lazy_iterable(self, listener):
+        """IPs may be a generator; it is consumed lazily by the workers."""
+        ips = (ip for ip in ["127.0.0.1"])
+        assert scan_hosts(ips, ports=[listener], timeout=1.0) == {"127.0.0.1": [listener]}
+
+    def test_ports_sorted(self, listener):
+        """Open ports are returned sorted even when found out of order."""
+        second = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        second.bind(("127.0.0.1", 0))
+        second.listen(4)
+        try:
+            other = second.getsockname()[1]
+            result = scan_hosts(["127.0.0.1"], ports=[max(listener, other), min(listener, other)])
+            assert result["127.0.0.1"] == sorted([listener, other])
+        finally:
+            second.close()
+
+    async def test_sync_wrappers_inside_running_loop(self, listener):
+        """The sync wrappers still work when called from a running loop."""
+        assert scan_hosts(["127.0.0.1"], ports=[listener], timeout=1.0) == {"127.0.0.1": [listener]}
+        assert scan_ports("127.0.0.1", ports=[listener], timeout=1.0) == [listener]
+        assets = scan_asset_ports(iter([Asset(ip="127.0.0.1")]), ports=[listener], timeout=1.0)
+        assert assets[0].open_ports == [listener]
+
+    async def test_concurrency_budget(self):
+        """No more than max_concurrency connects are in flight at once."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_probe(ip, port, timeout=2.0):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return port == 22, None
+
+        ips = [f"10.0.0.{i}" for i in range(1, 21)]
+        with patch("bigr.scanner.active.async_tcp_probe", side_effect=fake_probe):
+            result = await async_scan_hosts(ips, ports=[22, 80, 443], max_concurrency=7)
+
+        assert peak <= 7
+        assert len(result) == 20
+        assert all(ports == [22] for ports in result.values())
+
+    async def test_host_and_port_parallelism(self):
+        """Hosts in flight and probes per host respect their own limits."""
+        active: dict[str, int] = {}
+        peak_hosts = 0
+        peak_per_host = 0
+
+        async def fake_probe(ip, port, timeout=2.0):
+            nonlocal peak_hosts, peak_per_host
+            active[ip] = active.get(ip, 0) + 1
+            peak_hosts = max(peak_hosts, sum(1 for v in active.values() if v))
+            peak_per_host = max(peak_per_host, active[ip])
+            await asyncio.sleep(0.001)
+            active[ip] -= 1
+            return False, None
+
+        ips = [f"10.0.0.{i}" for i in range(1, 11)]
+        with patch("bigr.scanner.active.async_tcp_probe", side_effect=fake_probe):
+            await async_scan_hosts(
+                ips, ports=list(range(1, 13)),
+                host_parallelism=3, port_parallelism=2,
+            )
+
+        assert peak_hosts <= 3
+        assert peak_per_host <= 2
+
+    async def test_duplicate_ips_scanned_once(self):
+        """An IP repeated in the input is only probed once."""
+        calls: list[tuple[str, int]] = []
+
+        async def fake_probe(ip, port, timeout=2.0):
+            calls.append((ip, port))
+            return True, None
+
+        with patch("bigr.scanner.active.async_tcp_probe", side_effect=fake_probe):
+            result = await async_scan_hosts(["10.0.0.1", "10.0.0.1"], ports=[22, 80])
+
+        assert sorted(calls) == [("10.0.0.1", 22), ("10.0.0.1", 80)]
+        assert result == {"10.0.0.1": [22, 80]}
+
+
+# ---------------------------------------------------------------------------
+# TestAdaptiveTimeouts
+# ---------------------------------------------------------------------------
+
+
+class TestRttEstimator:
+    """Per-host timeouts derived from smoothed RTT."""
+
+    def test_no_sample_uses_ceiling(self):
+        assert RttEstimator().timeout(2.0) == 2.0
+
+    def test_first_sample(self):
+        est = RttEstimator()
+        est.update(0.1)
+        assert est.srtt == pytest.approx(0.1)
+        assert est.rttvar == pytest.approx(0.05)
+        assert est.timeout(2.0) == pytest.approx(0.3)
+
+    def test_smoothing(self):
+        est = RttEstimator.seeded(0.1)
+        est.update(0.2)
+        assert est.srtt == pytest.approx(0.1125)
+        assert est.rttvar == pytest.approx(0.0625)
+
+    def test_clamped_to_floor_for_lan(self):
+        assert RttEstimator.seeded(0.001).timeout(2.0) == ADAPTIVE_TIMEOUT_MIN
+
+    def test_clamped_to_ceiling_for_slow_links(self):
+        assert RttEstimator.seeded(1.5).timeout(2.0) == 2.0
+
+    def test_seed_ignores_missing(self):
+        assert RttEstimator.seeded(None).srtt is None
+
+
+class TestAdaptiveScan:
+    """The engine shortens timeouts once a host has answered."""
+
+    async def test_probe_reports_rtt_for_closed_port(self, closed_port):
+        is_open, rtt = await async_tcp_probe("127.0.0.1", closed_port, 1.0)
+        assert is_open is False
+        assert rtt is not None and rtt < 1.0
+
+    async def test_timeouts_shrink_after_first_answer(self):
+        timeouts: list[float] = []
+
+        async def fake_probe(ip, port, timeout=2.0):
+            timeouts.append(timeout)
+            return port == 22, 0.002 if port in (22, 23) else None
+
+        rtts: dict[str, float] = {}
+        with patch("bigr.scanner.active.async_tcp_probe", side_effect=fake_probe):
+            result = await async_scan_hosts(
+                ["10.0.0.1"], ports=[22, 23, 80, 443], timeout=2.0,
+                port_parallelism=1, rtts=rtts,
+            )
+
+        assert result == {"10.0.0.1": [22]}
+        assert timeouts[0] == 2.0
+        assert timeouts[2:] == [ADAPTIVE_TIMEOUT_MIN, ADAPTIVE_TIMEOUT_MIN]
+        assert rtts["10.0.0.1"] == pytest.approx(0.002)
+
+    async def test_seeded_rtt_used_from_the_start(self):
+        timeouts: list[float] = []
+
+        async def fake_probe(ip, port, timeout=2.0):
+            timeouts.append(timeout)
+            return False, None
+
+        with patch("bigr.scanner.active.async_tcp_probe", side_effect=fake_probe):
+            await async_scan_hosts(["10.0.0.1"], ports=[80], rtts={"10.0.0.1": 0.2})
+
+        assert timeouts == [pytest.approx(0.6)]
+
+    @patch("bigr.scanner.active.scan_hosts")
+    def test_rtt_recorded_in_evidence(self, mock_scan):
+        def fake_scan(ips, ports=None, timeout=2.0, rtts=None, **kwargs):
+            assert rtts == {"10.0.0.1": pytest.approx(0.004)}
+            rtts["10.0.0.1"] = 0.0035
+            rtts["10.0.0.2"] = 0.05
+            return {"10.0.0.1": [], "10.0.0.2": [80]}
+
+        mock_scan.side_effect = fake_scan
+        seeded = Asset(ip="10.0.0.1", raw_evidence={"source": "arp_sweep", "rtt_ms": 4.0})
+        fresh = Asset(ip="10.0.0.2")
+
+        scan_asset_ports([seeded, fresh])
+
+        assert seeded.raw_evidence["rtt_ms"] == 3.5
+        assert fresh.raw_evidence["rtt_ms"] == 50.0
+
+
+# ---------------------------------------------------------------------------
+# TestScanPorts / TestRunActiveScan
+# ---------------------------------------------------------------------------
+
+
+class TestScanPorts:
+    """scan_ports keeps its single-host interface on top of the engine."""
+
+    def test_single_host(self, listener, closed_port):
+        assert scan_ports("127.0.0.1", ports=[closed_port, listener], timeout=1.0) == [listener]
+
+
+class TestScanAssetPorts:
+    """scan_asset_ports dedupes hosts and fans the result back out."""
+
+    @patch("bigr.scanner.active.scan_hosts")
+    def test_shared_ip_scanned_once(self, mock_scan):
+        mock_scan.return_value = {"10.0.0.1": [80], "10.0.0.2": []}
+        passive = Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01")
+        active = Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01", scan_method=ScanMethod.ACTIVE)
+        other = Asset(ip="10.0.0.2")
+
+        scan_asset_ports([passive, active, other], ports=[80], host_parallelism=4, port_parallelism=2)
+
+        assert mock_scan.call_args.args[0] == ["10.0.0.1", "10.0.0.2"]
+        assert mock_scan.call_args.kwargs["host_parallelism"] == 4
+        assert mock_scan.call_args.kwargs["port_parallelism"] == 2
+        assert passive.open_ports == [80]
+        assert active.open_ports == [80]
+        assert other.open_ports == []
+
+    @patch("bigr.scanner.active.scan_hosts")
+    def test_empty_batch(self, mock_scan):
+        assert scan_asset_ports([]) == []
+        mock_scan.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# TestSynScan
+# ---------------------------------------------------------------------------
+
+
+class TestSynScan:
+    """Tests for the root-mode half-open SYN scanner."""
+
+    SECRET = b"0123456789abcdef"
+    SPORT = 45000
+
+    def _reply(self, src: str, port: int, flags: str = "SA", ack: int | None = None):
+        from scapy.all import IP, TCP
+
+        if ack is None:
+            ack = (_syn_cookie(self.SECRET, src, port) + 1) & 0xFFFFFFFF
+        return IP(src=src, dst="10.0.0.254") / TCP(sport=port, dport=self.SPORT, flags=flags, ack=ack)
+
+    def test_syn_ack_recorded(self):
+        found: dict[str, set[int]] = {"10.0.0.1": set()}
+        _record_syn_reply(self._reply("10.0.0.1", 443), self.SPORT, self.SECRET, found)
+        assert found == {"10.0.0.1": {443}}
+
+    def test_rst_ignored(self):
+        found: dict[str, set[int]] = {"10.0.0.1": set()}
+        _record_syn_reply(self._reply("10.0.0.1", 443, flags="RA"), self.SPORT, self.SECRET, found)
+        assert found == {"10.0.0.1": set()}
+
+    def test_bad_cookie_ignored(self):
+        found: dict[str, set[int]] = {"10.0.0.1": set()}
+        _record_syn_reply(self._reply("10.0.0.1", 443, ack=12345), self.SPORT, self.SECRET, found)
+        assert found == {"10.0.0.1": set()}
+
+    def test_untargeted_host_ignored(self):
+        found: dict[str, set[int]] = {"10.0.0.1": set()}
+        _record_syn_reply(self._reply("10.0.0.99", 22), self.SPORT, self.SECRET, found)
+        assert found == {"10.0.0.1": set()}
+
+    @patch("bigr.scanner.active.time.sleep")
+    def test_batches_paced_by_pps(self, mock_sleep):
+        """Every (host, port) pair is probed once, in pps-paced batches."""
+        sent: list = []
+        sock = type("Sock", (), {"send": lambda self, pkt: sent.append(pkt), "close": lambda self: None})()
+
+        with patch("scapy.all.AsyncSniffer") as mock_sniffer, patch("scapy.all.conf") as mock_conf:
+            mock_conf.L3socket.return_value = sock
+            result = syn_scan_hosts(
+                ["10.0.0.1", "10.0.0.2", "10.0.0.3"], ports=[22, 80],
+                timeout=0.5, pps=100, batch_size=4,
+            )
+
+        mock_sniffer.return_value.start.assert_called_once()
+        mock_sniffer.return_value.stop.assert_called_once()
+        assert len(sent) == 6
+        assert {(p["IP"].dst, p["TCP"].dport) for p in sent} == {
+            (ip, port) for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3") for port in (22, 80)
+        }
+        assert all(p["TCP"].flags == "S" for p in sent)
+        # Two batches (4 + 2 probes) at 100 pps, then the reply grace period
+        sleeps = [c.args[0] for c in mock_sleep.call_args_list]
+        assert sleeps[-1] == 0.5
+        assert sum(sleeps[:-1]) == pytest.approx(0.06, abs=0.01)
+        assert result == {"10.0.0.1": [], "10.0.0.2": [], "10.0.0.3": []}
+
+    @patch("bigr.scanner.active.syn_scan_hosts")
+    @patch("bigr.scanner.active.scan_hosts")
+    @patch("bigr.scanner.active.syn_scan_available", return_value=False)
+    def test_falls_back_to_connect_without_root(self, _avail, mock_connect, mock_syn):
+        mock_connect.return_value = {"10.0.0.1": [22]}
+        assets = scan_asset_ports([Asset(ip="10.0.0.1")], ports=[22], method="syn")
+        mock_syn.assert_not_called()
+        assert assets[0].open_ports == [22]
+
+    @patch("bigr.scanner.active.syn_scan_hosts")
+    @patch("bigr.scanner.active.scan_hosts")
+    @patch("bigr.scanner.active.syn_scan_available", return_value=True)
+    def test_syn_method_used_as_root(self, _avail, mock_connect, mock_syn):
+        mock_syn.return_value = {"10.0.0.1": [443]}
+        assets = scan_asset_ports([Asset(ip="10.0.0.1")], ports=[443], method="syn", pps=500)
+        mock_connect.assert_not_called()
+        assert mock_syn.call_args.kwargs["pps"] == 500
+        assert assets[0].open_ports == [443]
+
+
+class TestRunActiveScan:
+    """run_active_scan port-scans ARP responders as they are discovered."""
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.active.iter_arp_sweep")
+    def test_streams_sweep_into_port_scan(self, mock_sweep, mock_probe):
+        mock_sweep.return_value = iter([
+            Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01", scan_method=ScanMethod.ACTIVE),
+            Asset(ip="10.0.0.2", mac="aa:bb:cc:dd:ee:02", scan_method=ScanMethod.ACTIVE),
+        ])
+
+        async def fake_probe(ip, port, timeout=2.0):
+            return ip == "10.0.0.1", None
+
+        mock_probe.side_effect = fake_probe
+
+        assets = run_active_scan("10.0.0.0/24", ports=[22])
+
+        assert [a.ip for a in assets] == ["10.0.0.1", "10.0.0.2"]
+        assert [a.open_ports for a in assets] == [[22], []]
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.active.iter_arp_sweep", return_value=iter([]))
+    def test_no_hosts_no_scan(self, _mock_sweep, mock_probe):
+        assert run_active_scan("10.0.0.0/24") == []
+        mock_probe.assert_not_called()
+
+
+# ---------------------------------------------------------------------------
+# TestIterArpSweep
+# ---------------------------------------------------------------------------
+
+
+class _FakeL2Socket:
+    """Records ARP probes and answers some of them through the sniffer."""
+
+    def __init__(self, responders: dict[str, str]):
+        self.sent: list = []
+        self.responders = responders
+        self.prn = None
+
+    def send(self, pkt) -> None:
+        from scapy.all import ARP, Ether
+
+        self.sent.append(pkt)
+        ip = pkt["ARP"].pdst
+        if ip in self.responders:
+            self.prn(Ether() / ARP(op=2, psrc=ip, hwsrc=self.responders[ip]))
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture()
+def fake_l2():
+    """Patch scapy so the sweep talks to a _FakeL2Socket."""
+    sock = _FakeL2Socket({})
+
+    def fake_sniffer(*args, prn=None, **kwargs):
+        sock.prn = prn
+        return MagicMock()
+
+    with patch("bigr.scanner.active.is_root", return_value=True), \
+            patch("scapy.all.AsyncSniffer", side_effect=fake_sniffer), \
+            patch("scapy.all.conf") as mock_conf:
+        mock_conf.L2socket.return_value = sock
+        mock_conf.route.route.return_value = ("eth0", "10.0.0.254", "10.0.0.254")
+        yield sock
+
+
+class TestIterArpSweep:
+    """Chunked, streaming ARP sweep."""
+
+    def test_yields_responders_with_rtt(self, fake_l2):
+        fake_l2.responders.update({"10.0.0.2": "AA:BB:CC:DD:EE:02", "10.0.0.5": "aa:bb:cc:dd:ee:05"})
+
+        assets = list(iter_arp_sweep("10.0.0.0/29", chunk_size=4, chunk_interval=0.01, timeout=0.01))
+
+        assert len(fake_l2.sent) == 6
+        assert [a.ip for a in assets] == ["10.0.0.2", "10.0.0.5"]
+        assert assets[0].mac == "aa:bb:cc:dd:ee:02"
+        assert assets[0].scan_method == ScanMethod.ACTIVE
+        assert assets[0].raw_evidence["source"] == "arp_sweep"
+        assert assets[0].raw_evidence["rtt_ms"] >= 0
+
+    def test_early_responders_before_sweep_completes(self, fake_l2):
+        fake_l2.responders["10.0.0.1"] = "aa:bb:cc:dd:ee:01"
+
+        sweep = iter_arp_sweep("10.0.0.0/24", chunk_size=16, chunk_interval=0.01, timeout=0.01)
+        first = next(sweep)
+
+        assert first.ip == "10.0.0.1"
+        assert len(fake_l2.sent) == 16
+        sweep.close()
+
+    def test_mixed_target_sweeps_only_ipv4(self, fake_l2):
+        fake_l2.responders["10.0.0.2"] = "aa:bb:cc:dd:ee:02"
+
+        assets = list(iter_arp_sweep(
+            "10.0.0.0/30,2001:db8::/64", chunk_size=4, chunk_interval=0.01, timeout=0.01,
+        ))
+
+        assert len(fake_l2.sent) == 2
+        assert [a.ip for a in assets] == ["10.0.0.2"]
+
+    def test_requires_root(self):
+        with patch("bigr.scanner.active.is_root", return_value=False):
+            assert list(iter_arp_sweep("10.0.0.0/24")) == []
@@ -102,9 +102,14 @@ class TestScanCycle:
             patch.object(daemon, "_push_discovery_results") as mock_push,
         ):
             daemon._run_single_cycle()
-            mock_scan.assert_called_once_with("10.0.0.0/24")
+            mock_scan.assert_called_once_with("10.0.0.0/24", baseline=None)
             mock_push.assert_called_once_with(mock_result)
 
+            # Next cycle scans incrementally against the previous result
+            daemon._run_single_cycle()
+            baseline = mock_scan.call_args.kwargs["baseline"]
+            assert baseline["10.0.0.1"]["ports_checked_at"] == "2026-01-01T00:00:00Z"
+
     def test_single_cycle_with_shield(self, tmp_bigr_dir):
         """When shield=True, shield methods should also be called."""
         d = AgentDaemon(
@@ -10,7 +10,7 @@ from httpx import ASGITransport, AsyncClient
 
 from bigr.agent.auth import generate_token, hash_token
 from bigr.core.database import Base, get_db, get_engine, get_session_factory, reset_engine
-from bigr.core.models_db import AgentDB, AssetDB, ScanDB
+from bigr.core.models_db import AgentDB, AssetDB, NetworkDB, ScanDB
 from bigr.dashboard.app import create_app
 
 
@@ -184,6 +184,29 @@ class TestAgentList:
         agents = resp.json()["agents"]
         assert agents[0]["site_name"] == "HQ Office"
 
+    async def test_list_shows_latest_network(self, client: AsyncClient):
+        agent_id, _ = await _register_agent(client, name="laptop")
+        other_id, _ = await _register_agent(client, name="desk")
+        factory = get_session_factory()
+        async with factory() as session:
+            for i, (owner, seen) in enumerate([
+                (agent_id, "2026-01-01T00:00:00"),
+                (agent_id, "2026-03-01T00:00:00"),
+                (agent_id, "2026-02-01T00:00:00"),
+                (None, "2026-04-01T00:00:00"),
+            ]):
+                session.add(NetworkDB(
+                    id=f"net-{i}", fingerprint_hash=f"fp-{i}", ssid=f"wifi-{i}",
+                    agent_id=owner, first_seen=seen, last_seen=seen,
+                ))
+            await session.commit()
+
+        agents = {a["id"]: a for a in (await client.get("/api/agents")).json()["agents"]}
+
+        assert agents[agent_id]["current_network"]["id"] == "net-1"
+        assert agents[agent_id]["current_network"]["ssid"] == "wifi-1"
+        assert agents[other_id]["current_network"] is None
+
 
 class TestIngestDiscovery:
     async def test_ingest_creates_scan_and_assets(self, client: AsyncClient):
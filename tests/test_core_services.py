@@ -5,7 +5,7 @@ from __future__ import annotations
 import json
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bigr.core.database import Base, get_engine, get_session_factory, reset_engine
@@ -13,6 +13,7 @@ from bigr.core.models_db import (
     AssetChangeDB,
     AssetDB,
     CertificateDB,
+    NetworkDB,
     ScanAssetDB,
     ScanDB,
     SubnetDB,
@@ -373,6 +374,204 @@ class TestSaveScan:
         assert "bigr_category" in changed_fields
 
 
+class TestSaveScanBulk:
+    """save_scan_async writes a batch with a fixed number of statements."""
+
+    @staticmethod
+    def _scan(assets: list[dict], started: str = "2026-02-01T12:00:00Z") -> dict:
+        return {"target": "10.0.0.0/24", "scan_method": "passive",
+                "started_at": started, "assets": assets}
+
+    @staticmethod
+    async def _changes(session, scan_id: str) -> list[tuple]:
+        stmt = (
+            select(AssetDB.ip, AssetChangeDB.change_type, AssetChangeDB.field_name,
+                   AssetChangeDB.old_value, AssetChangeDB.new_value)
+            .join(AssetDB, AssetDB.id == AssetChangeDB.asset_id)
+            .where(AssetChangeDB.scan_id == scan_id)
+            .order_by(AssetChangeDB.id)
+        )
+        return [tuple(r) for r in (await session.execute(stmt)).all()]
+
+    async def test_change_rows(self, db_session):
+        await services.save_scan_async(db_session, self._scan([
+            {"ip": "10.0.0.1", "mac": "aa:00:00:00:00:01", "hostname": "a"},
+            {"ip": "10.0.0.2", "mac": None, "vendor": "Acme", "confidence_score": 0.5},
+        ]))
+
+        scan_id = await services.save_scan_async(db_session, self._scan([
+            {"ip": "10.0.0.1", "mac": "aa:00:00:00:00:01", "hostname": "b"},
+            {"ip": "10.0.0.2", "mac": None, "vendor": "Acme", "confidence_score": 0.5},
+            {"ip": "10.0.0.3", "mac": "aa:00:00:00:00:03"},
+        ], started="2026-02-01T13:00:00Z"))
+
+        assert await self._changes(db_session, scan_id) == [
+            ("10.0.0.1", "field_changed", "hostname", "a", "b"),
+            ("10.0.0.3", "new_asset", None, None, None),
+        ]
+        count = select(func.count()).select_from(AssetDB)
+        assert (await db_session.execute(count)).scalar_one() == 3
+        links = select(func.count()).select_from(ScanAssetDB).where(ScanAssetDB.scan_id == scan_id)
+        assert (await db_session.execute(links)).scalar_one() == 3
+
+    async def test_statement_count_independent_of_batch(self, db_session):
+        from sqlalchemy import event
+
+        await services.save_scan_async(db_session, self._scan([
+            {"ip": f"10.0.0.{i}", "mac": f"aa:00:00:00:00:{i:02x}"} for i in range(1, 51)
+        ]))
+
+        statements: list[str] = []
+        engine = get_engine().sync_engine
+        listener = lambda conn, cursor, stmt, *a: statements.append(stmt)  # noqa: E731
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            await services.save_scan_async(db_session, self._scan([
+                {"ip": f"10.0.0.{i}", "mac": f"aa:00:00:00:00:{i:02x}", "hostname": f"h{i}"}
+                for i in range(1, 101)
+            ]))
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 1
+        assert any("ON CONFLICT" in s for s in statements)
+
+    async def test_duplicate_in_batch(self, db_session):
+        scan_id = await services.save_scan_async(db_session, self._scan([
+            {"ip": "10.0.0.1", "mac": "aa:00:00:00:00:01", "hostname": "first"},
+            {"ip": "10.0.0.1", "mac": "aa:00:00:00:00:01", "hostname": "second"},
+        ]))
+
+        assert await self._changes(db_session, scan_id) == [
+            ("10.0.0.1", "new_asset", None, None, None),
+            ("10.0.0.1", "field_changed", "hostname", "first", "second"),
+        ]
+        asset = (await db_session.execute(select(AssetDB))).scalar_one()
+        assert asset.hostname == "second"
+
+    async def test_concurrent_insert_reuses_id(self, db_session):
+        from unittest.mock import AsyncMock, patch
+
+        db_session.add(AssetDB(
+            id="a-existing", ip="10.0.0.1", mac="aa:00:00:00:00:01",
+            first_seen="2026-01-01", last_seen="2026-01-01",
+        ))
+        await db_session.commit()
+
+        # Simulate another writer inserting the asset after the prefetch
+        with patch.object(services, "_fetch_existing_assets", AsyncMock(return_value={})):
+            scan_id = await services.save_scan_async(db_session, self._scan([
+                {"ip": "10.0.0.1", "mac": "aa:00:00:00:00:01", "hostname": "h"},
+            ]))
+
+        rows = (await db_session.execute(
+            select(AssetDB.id, AssetDB.hostname, AssetDB.first_seen)
+        )).all()
+        assert [tuple(r) for r in rows] == [("a-existing", "h", "2026-01-01")]
+        link = select(ScanAssetDB.asset_id).where(ScanAssetDB.scan_id == scan_id)
+        assert (await db_session.execute(link)).scalar_one() == "a-existing"
+
+
+class TestNetworksSummary:
+    async def test_counts_per_network(self, db_session):
+        for i, seen in enumerate(["2026-01-01", "2026-03-01", "2026-02-01"]):
+            db_session.add(NetworkDB(
+                id=f"net-{i}", fingerprint_hash=f"fp-{i}",
+                first_seen=seen, last_seen=seen,
+            ))
+        await db_session.commit()
+        for i, network_id in enumerate(["net-0", "net-0", "net-1", None]):
+            db_session.add(AssetDB(
+                id=f"a-{i}", ip=f"10.0.0.{i}", network_id=network_id,
+                first_seen="2026-01-01", last_seen="2026-01-01",
+            ))
+        await db_session.commit()
+
+        summary = await services.get_networks_summary(db_session)
+
+        assert [(n["id"], n["asset_count"]) for n in summary] == [
+            ("net-1", 1), ("net-2", 0), ("net-0", 2),
+        ]
+
+
+class TestSubnetRangeQueries:
+    """Subnet filters and per-subnet compliance run on ip_int / ip_v6."""
+
+    _ASSETS = [
+        ("10.0.0.5", "iot", 0.9, None),
+        ("10.0.0.200", "unclassified", 0.1, None),
+        ("10.0.1.7", "uygulamalar", 0.5, "iot"),
+        ("192.168.1.1", "ag_ve_sistemler", 0.8, None),
+        ("fd00::10", "tasinabilir", 0.4, None),
+    ]
+
+    async def _seed(self, session) -> str:
+        scan_id = await services.save_scan_async(session, {
+            "target": "10.0.0.0/16", "scan_method": "passive",
+            "started_at": "2026-02-01T12:00:00Z",
+            "assets": [
+                {"ip": ip, "bigr_category": cat, "confidence_score": conf}
+                for ip, cat, conf, _ in self._ASSETS
+            ],
+        })
+        for ip, _, _, manual in self._ASSETS:
+            if manual:
+                await services.tag_asset_async(session, ip, manual)
+        return scan_id
+
+    async def test_keys_populated(self, db_session):
+        await self._seed(db_session)
+        db_session.add(AssetDB(
+            id="orm", ip="172.16.0.1", first_seen="2026-01-01", last_seen="2026-01-01",
+        ))
+        await db_session.commit()
+
+        rows = dict((await db_session.execute(
+            select(AssetDB.ip, func.coalesce(AssetDB.ip_int, AssetDB.ip_v6))
+        )).all())
+        assert rows["10.0.0.5"] == 0x0A000005
+        assert rows["172.16.0.1"] == 0xAC100001
+        assert rows["fd00::10"] == bytes.fromhex("fd00" + "00" * 13 + "10")
+
+    async def test_subnet_filter(self, db_session):
+        await self._seed(db_session)
+
+        v4 = await services.get_all_assets(db_session, subnet="10.0.0.0/23")
+        assert {a["ip"] for a in v4} == {"10.0.0.5", "10.0.0.200", "10.0.1.7"}
+        narrow = await services.get_all_assets(db_session, subnet="10.0.0.128/25")
+        assert [a["ip"] for a in narrow] == ["10.0.0.200"]
+        v6 = await services.get_all_assets(db_session, subnet="fd00::/64")
+        assert [a["ip"] for a in v6] == ["fd00::10"]
+
+    async def test_compliance_matches_python(self, db_session):
+        from bigr.compliance import calculate_subnet_compliance
+
+        scan_id = await self._seed(db_session)
+        subnets = [
+            {"cidr": "10.0.0.0/23", "label": "office"},
+            {"cidr": "not-a-cidr"},
+            {"cidr": "172.16.0.0/12"},
+            {"cidr": "fd00::/64"},
+            {"cidr": "10.0.0.0/24"},
+        ]
+
+        def summary(results):
+            return [
+                (r.cidr, r.label, vars(r.breakdown), r.distribution.to_dict())
+                for r in results
+            ]
+
+        inventory = await services.get_all_assets(db_session)
+        assert summary(await services.get_subnet_compliance_async(db_session, subnets)) == \
+            summary(calculate_subnet_compliance(inventory, subnets))
+
+        latest = await services.get_latest_scan(db_session)
+        sql = await services.get_subnet_compliance_async(db_session, subnets, scan_id=scan_id)
+        assert summary(sql) == summary(calculate_subnet_compliance(latest["assets"], subnets))
+        assert sql[0].breakdown.manual_overrides == 0
+
+
 class TestTagUntag:
     async def test_tag_and_untag(self, db_session):
         await _seed_scan_with_assets(db_session)
@@ -455,3 +654,25 @@ class TestCertificateOps:
         result = await services.get_certificates_async(db_session)
         assert len(result) == 1
         assert result[0]["cn"] == "new.example.com"
+
+    async def test_unchanged_fingerprint_only_bumps_last_checked(self, db_session):
+        cert = {
+            "ip": "10.0.0.1", "port": 443, "cn": "a.example.com",
+            "days_until_expiry": 90, "cert_fingerprint": "ab" * 32,
+        }
+        await services.save_certificate_async(db_session, cert)
+        first = (await services.get_certificates_async(db_session))[0]
+
+        await services.save_certificate_async(
+            db_session, {**cert, "cn": "ignored", "days_until_expiry": 89},
+        )
+        await services.save_certificate_async(
+            db_session, {**cert, "ip": "10.0.0.2"},
+        )
+
+        shared = await services.get_certificates_async(db_session, fingerprint="ab" * 32)
+        assert sorted(c["ip"] for c in shared) == ["10.0.0.1", "10.0.0.2"]
+        row = next(c for c in shared if c["ip"] == "10.0.0.1")
+        assert row["cn"] == "a.example.com"
+        assert row["days_until_expiry"] == 89
+        assert row["last_checked"] >= first["last_checked"]
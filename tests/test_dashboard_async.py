@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+from unittest.mock import patch
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from bigr.core import services
 from bigr.core.database import Base, get_db, get_engine, get_session_factory, reset_engine
+from bigr.core.events import event_bus
 from bigr.core.models_db import (
     AssetChangeDB,
     AssetDB,
@@ -135,6 +139,15 @@ class TestDataEndpoint:
         data = resp.json()
         assert len(data.get("assets", [])) == 0
 
+    async def test_empty_subnet_does_not_fall_back(self, setup_db, tmp_path):
+        data_file = tmp_path / "assets.json"
+        data_file.write_text(json.dumps({"assets": [{"ip": "192.168.1.5"}]}))
+        transport = ASGITransport(app=create_app(data_path=str(data_file)))
+        async with AsyncClient(transport=transport, base_url="http://test") as c:
+            assert len((await c.get("/api/data")).json()["assets"]) == 1
+            resp = await c.get("/api/data?subnet=192.168.1.0/24")
+        assert resp.json()["assets"] == []
+
 
 class TestScansEndpoint:
     async def test_scans_empty(self, client: AsyncClient, setup_db):
@@ -163,6 +176,200 @@ class TestAssetDetailEndpoint:
         assert resp.status_code == 404
 
 
+
+class TestAssetListEndpoint:
+    @pytest.fixture
+    async def many_assets(self, setup_db):
+        factory = get_session_factory()
+        async with factory() as session:
+            session.add_all([
+                AssetDB(
+                    id=f"a-{i:03d}", ip=f"10.0.{i % 2}.{i}",
+                    bigr_category="iot" if i % 3 == 0 else "tasinabilir",
+                    site_name="HQ" if i < 20 else "Branch",
+                    first_seen="2026-01-01T00:00:00Z",
+                    # Pairs share a timestamp so the id tiebreak matters
+                    last_seen=f"2026-01-{1 + i // 2:02d}T00:00:00Z",
+                )
+                for i in range(1, 31)
+            ])
+            await session.commit()
+
+    async def _all_pages(self, client: AsyncClient, query: str) -> list[dict]:
+        assets: list[dict] = []
+        cursor = None
+        while True:
+            url = f"/api/assets?{query}" + (f"&cursor={cursor}" if cursor else "")
+            data = (await client.get(url)).json()
+            assets += data["assets"]
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return assets
+
+    async def test_keyset_pages(self, client: AsyncClient, many_assets):
+        assets = await self._all_pages(client, "limit=7")
+
+        ids = [a["id"] for a in assets]
+        assert len(ids) == 30 and len(set(ids)) == 30
+        keys = [(a["last_seen"], a["id"]) for a in assets]
+        assert keys == sorted(keys, reverse=True)
+
+    async def test_projection(self, client: AsyncClient, many_assets):
+        resp = await client.get("/api/assets?fields=ip,hostname&limit=2")
+        assert resp.status_code == 200
+        assert all(set(a) == {"ip", "hostname"} for a in resp.json()["assets"])
+
+        resp = await client.get("/api/assets?fields=ip,password")
+        assert resp.status_code == 400
+
+    async def test_filters(self, client: AsyncClient, many_assets):
+        assets = await self._all_pages(client, "limit=4&site=HQ&category=iot&subnet=10.0.1.0/24")
+
+        expected = {f"10.0.1.{i}" for i in range(1, 20) if i % 3 == 0 and i % 2 == 1}
+        assert {a["ip"] for a in assets} == expected
+
+        # Not octet-aligned: narrowed in SQL, exact match per row
+        assets = await self._all_pages(client, "limit=1&subnet=10.0.1.0/30")
+        assert [a["ip"] for a in assets] == ["10.0.1.3", "10.0.1.1"]
+
+    async def test_invalid_cursor(self, client: AsyncClient, many_assets):
+        resp = await client.get("/api/assets?cursor=not-a-cursor")
+        assert resp.status_code == 400
+
+    async def test_ndjson_export(self, client: AsyncClient, many_assets):
+        resp = await client.get("/api/assets?format=ndjson&fields=id&site=Branch")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in resp.text.splitlines()]
+        assert sorted(r["id"] for r in rows) == [f"a-{i:03d}" for i in range(20, 31)]
+
+
+
+class TestResponseCaching:
+    async def test_etag_and_not_modified(self, client: AsyncClient, seeded_db):
+        resp = await client.get("/api/topology")
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+
+        resp = await client.get("/api/topology", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etag
+
+    async def test_inventory_write_invalidates(self, client: AsyncClient, seeded_db):
+        resp = await client.get("/api/data")
+        etag = resp.headers["etag"]
+        assert not any(a["manual_override"] for a in resp.json()["assets"])
+
+        await client.post("/api/assets/10.0.0.1/acknowledge")
+
+        resp = await client.get("/api/data", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        by_ip = {a["ip"]: a for a in resp.json()["assets"]}
+        assert by_ip["10.0.0.1"]["manual_category"] == "acknowledged"
+
+    async def test_params_keyed_separately(self, client: AsyncClient, seeded_db):
+        all_assets = (await client.get("/api/data")).json()["assets"]
+        none = (await client.get("/api/data?subnet=192.168.9.0/24")).json()["assets"]
+        assert len(all_assets) == 2
+        assert none == []
+
+
+    async def test_shared_compute_survives_first_caller_cancel(self, client: AsyncClient, seeded_db):
+        real_get_all_assets = services.get_all_assets
+        started = asyncio.Event()
+        compute_sessions = []
+        dedicated_sessions = []
+
+        async def slow_get_all_assets(session, **kwargs):
+            compute_sessions.append(session)
+            started.set()
+            await asyncio.sleep(0.05)
+            return await real_get_all_assets(session, **kwargs)
+
+        def tracking_factory():
+            factory = get_session_factory()
+
+            def _open():
+                session = factory()
+                dedicated_sessions.append(session)
+                return session
+
+            return _open
+
+        with patch("bigr.core.services.get_all_assets", side_effect=slow_get_all_assets), \
+                patch("bigr.dashboard.app.get_session_factory", tracking_factory):
+            first = asyncio.ensure_future(client.get("/api/data"))
+            await started.wait()
+            second = asyncio.ensure_future(client.get("/api/data"))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            resp = await second
+
+        assert resp.status_code == 200
+        assert len(resp.json()["assets"]) == 2
+        # One shared computation, on a session no request owns
+        assert compute_sessions == dedicated_sessions[:1]
+
+
+class TestChangeStream:
+    async def _open_stream(self, client: AsyncClient, url: str, **kwargs):
+        task = asyncio.ensure_future(client.get(url, **kwargs))
+        while event_bus.subscriber_count == 0:
+            await asyncio.sleep(0.01)
+        return task
+
+    async def test_scan_deltas_streamed(self, client: AsyncClient, seeded_db):
+        task = await self._open_stream(client, "/api/stream?topics=asset,scan")
+        async with get_session_factory()() as session:
+            await services.save_scan_async(session, {
+                "target": "10.0.0.0/24",
+                "scan_method": "hybrid",
+                "started_at": "2026-02-10T11:00:00Z",
+                "assets": [
+                    {"ip": "10.0.0.1", "mac": "aa:bb:cc:dd:ee:01", "hostname": "renamed"},
+                    {"ip": "10.0.0.9", "mac": "aa:bb:cc:dd:ee:09"},
+                ],
+            })
+        event_bus.disconnect_all()
+        resp = await task
+
+        assert resp.headers["content-type"].startswith("text/event-stream")
+        events = [
+            (block.split("event: ")[1].split("\n")[0], json.loads(block.split("data: ")[1]))
+            for block in resp.text.split("\n\n") if "data: " in block
+        ]
+        by_ip = {data["ip"]: data for topic, data in events if topic == "asset.changed"}
+        assert by_ip["10.0.0.9"]["change_type"] == "new_asset"
+        assert by_ip["10.0.0.1"]["fields"]["hostname"]["new"] == "renamed"
+        topic, summary = events[-1]
+        assert topic == "scan.saved"
+        assert (summary["new_assets"], summary["changed_assets"]) == (1, 1)
+
+    async def test_resume_from_last_event_id(self, client: AsyncClient, setup_db):
+        seen = event_bus.publish("shield.scan", {"status": "running"})
+        event_bus.publish("shield.scan", {"status": "completed"})
+        task = await self._open_stream(
+            client, "/api/stream", headers={"Last-Event-ID": seen.sse_id},
+        )
+        event_bus.disconnect_all()
+        resp = await task
+
+        assert f"id: {seen.sse_id}\n" not in resp.text
+        assert '"status":"completed"' in resp.text
+
+    async def test_id_from_previous_process_gets_resync(self, client: AsyncClient, setup_db):
+        event_bus.publish("shield.scan", {"status": "running"})
+        task = await self._open_stream(
+            client, "/api/stream", headers={"Last-Event-ID": "0badc0de-99999"},
+        )
+        event_bus.disconnect_all()
+        resp = await task
+
+        assert "event: resync\n" in resp.text
+        assert '"status":"running"' not in resp.text
+
+
 class TestChangesEndpoint:
     async def test_changes_with_data(self, client: AsyncClient, seeded_db):
         resp = await client.get("/api/changes")
@@ -2,15 +2,19 @@
 
 from datetime import datetime, timezone
 from pathlib import Path
+from unittest.mock import patch
 
 from bigr.db import (
     get_all_assets,
     get_asset_history,
     get_latest_scan,
+    get_port_baseline,
     get_scan_list,
     get_tags,
+    get_watcher_baseline,
     init_db,
     save_scan,
+    save_watcher_baseline,
     tag_asset,
     untag_asset,
 )
@@ -209,6 +213,72 @@ class TestSaveScan:
         assert "confidence_score" in changed_fields
 
 
+class TestSaveScanBulk:
+    def test_one_prefetch_and_batched_writes(self, tmp_path: Path):
+        """Existing rows are read in one query; writes are batched."""
+        import sqlite3
+
+        import bigr.db as db_module
+
+        db = tmp_path / "test.db"
+        assets = [Asset(ip=f"10.0.{i // 256}.{i % 256}", mac=f"m{i}") for i in range(500)]
+        save_scan(_make_scan_result(assets=assets), db_path=db)
+
+        statements: list[str] = []
+        real_connect = db_module._connect
+
+        def traced_connect(path=None):
+            conn = real_connect(path)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        for asset in assets[:250]:
+            asset.hostname = "renamed"
+        with patch.object(db_module, "_connect", traced_connect):
+            save_scan(_make_scan_result(assets=assets), db_path=db)
+
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 1
+        assert "PRAGMA table_info" not in " ".join(statements)
+
+        conn = sqlite3.connect(str(db))
+        renamed = conn.execute(
+            "SELECT COUNT(*) FROM asset_changes WHERE field_name = 'hostname'"
+        ).fetchone()[0]
+        conn.close()
+        assert renamed == 250
+        assert len(get_all_assets(db_path=db)) == 500
+
+    def test_schema_created_once_per_process(self, tmp_path: Path):
+        import bigr.db as db_module
+
+        db = tmp_path / "test.db"
+        with patch.object(db_module, "_create_schema", wraps=db_module._create_schema) as create:
+            init_db(db)
+            save_scan(_make_scan_result(), db_path=db)
+            get_all_assets(db_path=db)
+        assert create.call_count == 1
+
+    def test_recreated_after_file_removed(self, tmp_path: Path):
+        db = tmp_path / "test.db"
+        init_db(db)
+        db.unlink()
+        save_scan(_make_scan_result(), db_path=db)
+        assert len(get_all_assets(db_path=db)) == 2
+
+    def test_duplicate_asset_in_one_scan(self, tmp_path: Path):
+        db = tmp_path / "test.db"
+        dup = [
+            Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01", hostname="a"),
+            Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01", hostname="b"),
+        ]
+        save_scan(_make_scan_result(assets=dup), db_path=db)
+
+        assets = get_all_assets(db_path=db)
+        assert len(assets) == 1
+        assert assets[0]["hostname"] == "b"
+
+
 class TestGetLatestScan:
     def test_get_latest_scan(self, tmp_path: Path):
         db = tmp_path / "test.db"
@@ -263,6 +333,72 @@ class TestGetAllAssets:
         assert get_all_assets(db_path=db) == []
 
 
+class TestGetPortBaseline:
+    def test_latest_ports_per_ip(self, tmp_path: Path):
+        db = tmp_path / "test.db"
+        save_scan(_make_scan_result(), db_path=db)
+        second = _make_scan_result()
+        second.started_at = datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)
+        second.assets[0].open_ports = [22]
+        second.assets[0].raw_evidence["scanned_ports"] = [22, 443]
+        save_scan(second, db_path=db)
+
+        baseline = get_port_baseline(db_path=db)
+
+        assert baseline["192.168.1.1"] == {
+            "mac": "00:1e:bd:aa:bb:cc",
+            "open_ports": [22],
+            "scanned_ports": [22, 443],
+            "ports_checked_at": "2026-01-02T12:00:00+00:00",
+        }
+        assert baseline["192.168.1.50"]["open_ports"] == [80, 554]
+        assert baseline["192.168.1.50"]["scanned_ports"] == []
+
+    def test_carried_forward_keeps_checked_at(self, tmp_path: Path):
+        db = tmp_path / "test.db"
+        save_scan(_make_scan_result(), db_path=db)
+        partial = _make_scan_result()
+        partial.is_partial = True
+        partial.started_at = datetime(2026, 1, 2, 12, 0, 0, tzinfo=timezone.utc)
+        partial.assets[1].raw_evidence["ports_carried_forward"] = True
+        save_scan(partial, db_path=db)
+
+        baseline = get_port_baseline(db_path=db)
+
+        assert baseline["192.168.1.1"]["ports_checked_at"].startswith("2026-01-02")
+        assert baseline["192.168.1.50"]["ports_checked_at"].startswith("2026-01-01")
+        assert get_latest_scan(db_path=db)["is_partial"] is True
+
+
+class TestWatcherBaseline:
+    @staticmethod
+    def _record(ip: str, mac: str | None, content_hash: int) -> dict:
+        return {"ip": ip, "mac": mac, "content_hash": content_hash, "open_ports": "[22]"}
+
+    def test_roundtrip_per_subnet(self, tmp_path: Path):
+        db = tmp_path / "test.db"
+        save_watcher_baseline("10.0.0.0/24", [self._record("10.0.0.1", None, 1)], db_path=db)
+        save_watcher_baseline("10.0.1.0/24", [self._record("10.0.1.1", "m2", 2)], db_path=db)
+
+        assert get_watcher_baseline("10.0.0.0/24", db_path=db) == [self._record("10.0.0.1", None, 1)]
+        assert get_watcher_baseline("10.0.1.0/24", db_path=db)[0]["mac"] == "m2"
+        assert get_watcher_baseline("10.9.0.0/24", db_path=db) == []
+
+    def test_replaces_changed_and_drops_missing(self, tmp_path: Path):
+        db = tmp_path / "test.db"
+        save_watcher_baseline("net", [
+            self._record("10.0.0.1", "m1", 1),
+            self._record("10.0.0.2", "m2", 2),
+        ], db_path=db)
+
+        changed = {**self._record("10.0.0.1", "m1", 11), "open_ports": "[22, 80]"}
+        save_watcher_baseline("net", [changed, self._record("10.0.0.3", "m3", 3)], db_path=db)
+
+        by_ip = {r["ip"]: r for r in get_watcher_baseline("net", db_path=db)}
+        assert set(by_ip) == {"10.0.0.1", "10.0.0.3"}
+        assert by_ip["10.0.0.1"] == changed
+
+
 class TestGetScanList:
     def test_get_scan_list(self, tmp_path: Path):
         db = tmp_path / "test.db"
@@ -4,7 +4,14 @@ from datetime import datetime, timezone
 from pathlib import Path
 
 from bigr.db import init_db, save_scan
-from bigr.diff import AssetChange, DiffResult, diff_scans, get_changes_from_db
+from bigr.diff import (
+    AssetChange,
+    DiffResult,
+    asset_digest,
+    baseline_record,
+    diff_scans,
+    get_changes_from_db,
+)
 from bigr.models import Asset, BigrCategory, ScanMethod, ScanResult
 
 
@@ -120,6 +127,88 @@ class TestDiffChangedPorts:
         assert port_change.field == "open_ports"
 
 
+class TestDiffCarriedForward:
+    def test_carried_ports_merged_from_previous(self):
+        """Ports carried forward by an incremental scan are not diffed."""
+        previous = [_asset_dict(ip="10.0.0.1", open_ports=[22, 80])]
+        current = [_asset_dict(ip="10.0.0.1", open_ports=[22])]
+        current[0]["raw_evidence"] = {"ports_carried_forward": True}
+
+        result = diff_scans(current, previous)
+
+        assert not result.has_changes
+        assert result.unchanged_count == 1
+
+    def test_carried_asset_other_fields_still_diffed(self):
+        previous = [_asset_dict(ip="10.0.0.1", hostname="a")]
+        current = [_asset_dict(ip="10.0.0.1", hostname="b")]
+        current[0]["raw_evidence"] = {"ports_carried_forward": True}
+
+        result = diff_scans(current, previous)
+
+        assert [c.change_type for c in result.changed_assets] == ["hostname_change"]
+
+
+class TestBaselineRecord:
+    def test_record_is_compact_and_hashed(self):
+        asset = _asset_dict(ip="10.0.0.1", open_ports=[80, 22])
+        asset["raw_evidence"] = {"big": "x" * 1000}
+        record = baseline_record(asset)
+
+        assert set(record) == {
+            "ip", "mac", "content_hash",
+            "open_ports", "bigr_category", "vendor", "hostname", "confidence_score",
+        }
+        assert record["open_ports"] == "[22, 80]"
+        assert baseline_record(_asset_dict(ip="10.0.0.1", open_ports=[22, 80])) == record
+        assert baseline_record(_asset_dict(ip="10.0.0.1", open_ports=[22]))["content_hash"] != record["content_hash"]
+
+    def test_diff_against_records_matches_full_dicts(self):
+        previous = [
+            _asset_dict(ip="10.0.0.1", open_ports=[22, 80]),
+            _asset_dict(ip="10.0.0.2", mac="aa:bb:cc:dd:ee:02"),
+        ]
+        current = [_asset_dict(ip="10.0.0.1", open_ports=[22], hostname="renamed")]
+
+        full = diff_scans(current, previous)
+        compact = diff_scans(current, [baseline_record(a) for a in previous])
+
+        assert compact.changed_assets == full.changed_assets
+        assert [a["ip"] for a in compact.removed_assets] == ["10.0.0.2"]
+        assert compact.unchanged_count == full.unchanged_count
+
+
+class TestDiffDigestFastPath:
+    def test_digest_ignores_untracked_fields(self):
+        a = _asset_dict(ip="10.0.0.1", open_ports=[80, 22])
+        b = {**_asset_dict(ip="10.0.0.1", open_ports=[22, 80]), "raw_evidence": {"x": 1}}
+        assert asset_digest(a) == asset_digest(b)
+        assert asset_digest(a) == baseline_record(a)["content_hash"]
+        assert asset_digest(a) != asset_digest(_asset_dict(ip="10.0.0.1", hostname="other"))
+
+    def test_equal_digest_skips_field_compare(self):
+        """A matching precomputed digest is trusted without field comparison."""
+        current = [_asset_dict(ip="10.0.0.1", hostname="b")]
+        previous = [{**_asset_dict(ip="10.0.0.1", hostname="a"), "content_hash": asset_digest(current[0])}]
+
+        result = diff_scans(current, previous)
+
+        assert not result.has_changes
+        assert result.unchanged_count == 1
+
+    def test_input_order_unless_ordered(self):
+        previous = [_asset_dict(ip="10.0.0.9"), _asset_dict(ip="10.0.0.5")]
+        current = [_asset_dict(ip="10.0.0.3", mac=None), _asset_dict(ip="10.0.0.2")]
+
+        unordered = diff_scans(current, previous)
+        ordered = diff_scans(current, previous, ordered=True)
+
+        assert [a["ip"] for a in unordered.new_assets] == ["10.0.0.3", "10.0.0.2"]
+        assert [a["ip"] for a in unordered.removed_assets] == ["10.0.0.9", "10.0.0.5"]
+        assert [a["ip"] for a in ordered.new_assets] == ["10.0.0.2", "10.0.0.3"]
+        assert [a["ip"] for a in ordered.removed_assets] == ["10.0.0.5", "10.0.0.9"]
+
+
 class TestDiffChangedCategory:
     def test_diff_changed_category(self):
         """Same asset with different bigr_category should be detected."""
@@ -0,0 +1,190 @@
+"""Tests for the in-process change feed (bigr.core.events)."""
+
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from bigr.core import events, services
+from bigr.core.events import RESYNC_TOPIC, EventBus, topic_matches
+from bigr.guardian.stats import StatsTracker
+from bigr.shield.models import FindingSeverity, ShieldFinding
+from bigr.shield.orchestrator import ShieldOrchestrator
+
+
+async def _drain(sub, n):
+    return [await sub.get(timeout=1) for _ in range(n)]
+
+
+class TestEventBus:
+    """Fan-out, topic filters, replay and overflow."""
+
+    async def test_publish_reaches_matching_subscribers(self):
+        bus = EventBus()
+        everything = bus.subscribe()
+        assets = bus.subscribe(["asset"])
+
+        bus.publish("asset.changed", {"ip": "10.0.0.1"})
+        bus.publish("shield.scan", {"status": "running"})
+
+        got = await _drain(everything, 2)
+        assert [e.topic for e in got] == ["asset.changed", "shield.scan"]
+        assert got[0].id < got[1].id
+        assert (await assets.get(timeout=1)).data == {"ip": "10.0.0.1"}
+        with pytest.raises(TimeoutError):
+            await assets.get(timeout=0.01)
+
+    async def test_publish_from_another_thread(self):
+        bus = EventBus()
+        sub = bus.subscribe()
+        t = threading.Thread(target=bus.publish, args=("scan.saved", {"n": 1}))
+        t.start()
+        t.join()
+        assert (await sub.get(timeout=1)).topic == "scan.saved"
+
+    async def test_resume_after_last_event_id(self):
+        bus = EventBus()
+        first = bus.publish("a")
+        bus.publish("b")
+        bus.publish("c")
+
+        sub = bus.subscribe(last_event_id=first.id)
+        assert [e.topic for e in await _drain(sub, 2)] == ["b", "c"]
+
+    async def test_resume_too_old_gets_resync(self):
+        bus = EventBus(backlog_size=2)
+        for topic in ("a", "b", "c", "d"):
+            bus.publish(topic)
+
+        sub = bus.subscribe(last_event_id=1)
+        event = await sub.get(timeout=1)
+        assert event.topic == RESYNC_TOPIC
+        assert event.id == bus.last_id
+
+    async def test_resume_beyond_last_id_gets_resync(self):
+        """An id from before a restart can be larger than anything issued since."""
+        bus = EventBus()
+        bus.publish("a")
+
+        sub = bus.subscribe(last_event_id=50)
+        event = await sub.get(timeout=1)
+        assert event.topic == RESYNC_TOPIC
+        assert event.id == bus.last_id
+
+    async def test_sse_id_carries_epoch(self):
+        bus = EventBus()
+        first = bus.publish("a")
+        bus.publish("b")
+        assert first.to_sse().startswith(f"id: {bus.epoch}-{first.id}\n".encode())
+
+        resumed = bus.subscribe(last_event_id=first.sse_id)
+        assert (await resumed.get(timeout=1)).topic == "b"
+
+        restarted = EventBus()
+        restarted.publish("c")
+        restarted.publish("d")
+        stale = restarted.subscribe(last_event_id=first.sse_id)
+        event = await stale.get(timeout=1)
+        assert event.topic == RESYNC_TOPIC
+        assert event.sse_id == f"{restarted.epoch}-2"
+
+    async def test_overflow_collapses_to_resync(self):
+        bus = EventBus()
+        with patch.object(events, "SUBSCRIBER_QUEUE_SIZE", 3):
+            sub = bus.subscribe()
+        for i in range(10):
+            bus.publish("asset.changed", {"i": i})
+
+        assert (await sub.get(timeout=1)).topic == RESYNC_TOPIC
+        bus.publish("scan.saved")
+        assert (await sub.get(timeout=1)).topic == "scan.saved"
+
+    async def test_disconnect_all_ends_iteration(self):
+        bus = EventBus()
+        sub = bus.subscribe()
+        bus.publish("a")
+        bus.disconnect_all()
+
+        assert [e.topic async for e in sub] == ["a"]
+        assert bus.subscriber_count == 0
+
+    def test_topic_matches(self):
+        assert topic_matches("asset.changed", ["asset"])
+        assert topic_matches("asset.changed", ["asset.changed"])
+        assert not topic_matches("assets.x", ["asset"])
+        assert topic_matches(RESYNC_TOPIC, ["asset"])
+        assert topic_matches("anything", None)
+
+
+class TestScanDeltaEvents:
+    async def test_asset_deltas_replayed_without_subscribers(self):
+        scan = SimpleNamespace(id="s1", target="10.0.0.0/24", scan_method="hybrid",
+                               total_assets=1, site_name=None, agent_id=None)
+        changes = [(("10.0.0.9", "aa:bb:cc:dd:ee:09"), "new_asset", None, None, None)]
+        with patch.object(events, "event_bus", EventBus()) as bus, \
+                patch("bigr.core.services.publish", bus.publish):
+            services._publish_scan_deltas(scan, changes)  # nobody listening
+            sub = bus.subscribe(last_event_id=0)
+            got = await _drain(sub, 2)
+
+        assert [e.topic for e in got] == ["asset.changed", "scan.saved"]
+        assert got[0].data["ip"] == "10.0.0.9"
+
+
+class TestGuardianStatsEvents:
+    async def test_throttled_and_only_with_subscribers(self):
+        tracker = StatsTracker(publish_interval=3600)
+        with patch.object(events, "event_bus", EventBus()) as bus, \
+                patch("bigr.guardian.stats.event_bus", bus):
+            tracker.record_query("a.com", "allow", "")  # nobody listening
+            sub = bus.subscribe(["guardian"])
+            tracker.record_query("ads.com", "block", "blocklist")
+            tracker.record_query("b.com", "allow", "")  # within interval
+
+            event = await sub.get(timeout=1)
+            assert event.topic == "guardian.stats"
+            assert event.data["current_period"]["blocked_queries"] == 1
+            assert "top_blocked_domains" not in event.data
+            with pytest.raises(TimeoutError):
+                await sub.get(timeout=0.01)
+            assert bus.last_id == 1
+
+    async def test_summary_unchanged(self):
+        tracker = StatsTracker()
+        tracker.record_query("ads.com", "block", "blocklist")
+        summary = tracker.get_stats_summary()
+        assert summary["lifetime"]["blocked_queries"] == 1
+        assert summary["top_blocked_domains"] == [{"domain": "ads.com", "count": 1}]
+
+
+class TestShieldScanEvents:
+    async def test_progress_and_findings_published(self):
+        class _Module:
+            def check_available(self):
+                return True
+
+            async def scan(self, target):
+                return [ShieldFinding(module="headers", severity=FindingSeverity.HIGH,
+                                      title="Missing HSTS", target_ip=target)]
+
+        orchestrator = ShieldOrchestrator()
+        orchestrator._modules = {"headers": _Module()}
+        scan = await orchestrator.create_scan("10.0.0.5", modules=["headers"])
+
+        with patch.object(events, "event_bus", EventBus()) as bus:
+            sub = bus.subscribe(["shield"])
+            await orchestrator.run_scan(scan.id)
+            got = await _drain(sub, 4)
+
+        assert [(e.topic, e.data.get("status")) for e in got] == [
+            ("shield.scan", "running"),
+            ("shield.finding", None),
+            ("shield.scan", "running"),
+            ("shield.scan", "completed"),
+        ]
+        assert got[1].data["title"] == "Missing HSTS"
+        assert got[2].data["modules_done"] == 1
+        assert got[3].data["findings_count"] == 1
@@ -0,0 +1,276 @@
+"""Tests for the hybrid scan orchestrator in bigr.scanner.hybrid."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+from bigr.models import Asset, ScanEvent, ScanEventKind, ScanMethod
+from bigr.scanner.hybrid import (
+    ScanProgressLogger,
+    batch_scan_events,
+    iter_hybrid_scan,
+    run_hybrid_scan,
+    select_rescan_due,
+    update_port_baseline,
+)
+from bigr.scanner.targets import TargetSet
+
+
+def _passive() -> list[Asset]:
+    return [
+        Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01", hostname="router"),
+        Asset(ip="10.0.0.5", mac="aa:bb:cc:dd:ee:05"),
+    ]
+
+
+def _active():
+    yield Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01", scan_method=ScanMethod.ACTIVE)
+    yield Asset(ip="10.0.0.9", mac="aa:bb:cc:dd:ee:09", scan_method=ScanMethod.ACTIVE)
+
+
+@patch("bigr.scanner.hybrid.discover_mdns_services", return_value=[])
+class TestRunHybridScan:
+    """Port scanning is one deduplicated job across both phases."""
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.hybrid.iter_arp_sweep", side_effect=lambda target: _active())
+    @patch("bigr.scanner.hybrid.run_passive_scan", side_effect=lambda target_ips: _passive())
+    @patch("bigr.scanner.hybrid.is_root", return_value=True)
+    def test_hosts_scanned_once(self, _root, _passive_scan, _sweep, mock_probe, _mdns):
+        probed: list[tuple[str, int]] = []
+
+        async def fake_probe(ip, port, timeout=2.0):
+            probed.append((ip, port))
+            return port == 22, None
+
+        mock_probe.side_effect = fake_probe
+
+        result = run_hybrid_scan("10.0.0.0/24", ports=[22, 80], host_parallelism=5, port_parallelism=3)
+
+        assert sorted(probed) == [
+            (ip, port) for ip in ("10.0.0.1", "10.0.0.5", "10.0.0.9") for port in (22, 80)
+        ]
+        by_ip = {a.ip: a for a in result.assets}
+        assert set(by_ip) == {"10.0.0.1", "10.0.0.5", "10.0.0.9"}
+        assert by_ip["10.0.0.1"].scan_method == ScanMethod.HYBRID
+        assert by_ip["10.0.0.1"].hostname == "router"
+        assert all(a.open_ports == [22] for a in result.assets)
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.hybrid.iter_arp_sweep")
+    @patch("bigr.scanner.hybrid.run_passive_scan", side_effect=lambda target_ips: _passive())
+    @patch("bigr.scanner.hybrid.is_root", return_value=False)
+    def test_non_root_skips_sweep(self, _root, _passive_scan, mock_sweep, mock_probe, _mdns):
+        async def fake_probe(ip, port, timeout=2.0):
+            return port == 22, None
+
+        mock_probe.side_effect = fake_probe
+
+        result = run_hybrid_scan("10.0.0.0/24", ports=[22, 80], host_parallelism=5, port_parallelism=3)
+
+        mock_sweep.assert_not_called()
+        assert sorted({call.args[0] for call in mock_probe.call_args_list}) == ["10.0.0.1", "10.0.0.5"]
+        assert len(result.assets) == 2
+        assert all(a.open_ports == [22] for a in result.assets)
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.hybrid.iter_arp_sweep", side_effect=lambda target: _active())
+    @patch("bigr.scanner.hybrid.run_passive_scan", side_effect=lambda target_ips: _passive())
+    @patch("bigr.scanner.hybrid.is_root", return_value=True)
+    def test_on_event_callback(self, _root, _passive_scan, _sweep, mock_probe, _mdns):
+        async def fake_probe(ip, port, timeout=2.0):
+            return True, 0.001
+
+        mock_probe.side_effect = fake_probe
+        events: list[ScanEvent] = []
+
+        run_hybrid_scan("10.0.0.0/24", ports=[22], on_event=events.append)
+
+        kinds = [e.kind for e in events]
+        assert kinds.count(ScanEventKind.HOST_DISCOVERED) == 4
+        assert kinds.count(ScanEventKind.PORTS_FOUND) == 3
+        assert kinds[-1] == ScanEventKind.COMPLETED
+        ports_found = [e.asset for e in events if e.kind == ScanEventKind.PORTS_FOUND]
+        assert all(a.open_ports == [22] for a in ports_found)
+        assert all(a.raw_evidence["rtt_ms"] == 1.0 for a in ports_found)
+
+
+# ---------------------------------------------------------------------------
+# TestIterHybridScan
+# ---------------------------------------------------------------------------
+
+
+@patch("bigr.scanner.hybrid.discover_mdns_services", return_value=[])
+@patch("bigr.scanner.hybrid.is_root", return_value=False)
+class TestHostnameTargets:
+    """Hostname targets are resolved, not rejected."""
+
+    @patch("bigr.scanner.hybrid.run_passive_scan", return_value=[])
+    @patch("bigr.scanner.targets.socket.getaddrinfo",
+           return_value=[(None, None, None, "", ("10.0.0.5", 0))])
+    def test_hostname_resolved(self, _lookup, mock_passive, _root, _mdns):
+        result = run_hybrid_scan("nas.local", mode="passive")
+
+        targets = mock_passive.call_args.kwargs["target_ips"]
+        assert list(targets) == ["10.0.0.5"]
+        assert result.target == "nas.local"
+
+    @patch("bigr.scanner.hybrid.run_passive_scan", return_value=[])
+    @patch("bigr.scanner.targets.socket.getaddrinfo", side_effect=OSError("no such host"))
+    def test_unresolvable_scans_nothing(self, _lookup, mock_passive, _root, _mdns):
+        result = run_hybrid_scan("nope.invalid", mode="passive")
+
+        assert list(mock_passive.call_args.kwargs["target_ips"]) == []
+        assert result.assets == []
+
+
+@patch("bigr.scanner.hybrid.discover_mdns_services", return_value=[])
+class TestIterHybridScan:
+    """Events stream out while the scan is still running."""
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.hybrid.run_passive_scan", side_effect=lambda target_ips: _passive())
+    @patch("bigr.scanner.hybrid.is_root", return_value=False)
+    async def test_discovery_precedes_ports(self, _root, _passive_scan, mock_probe, _mdns):
+        async def fake_probe(ip, port, timeout=2.0):
+            return False, None
+
+        mock_probe.side_effect = fake_probe
+
+        events = [e async for e in iter_hybrid_scan("10.0.0.0/24", mode="passive", ports=[22])]
+
+        for ip in ("10.0.0.1", "10.0.0.5"):
+            kinds = [e.kind for e in events if e.asset is not None and e.asset.ip == ip]
+            assert kinds == [ScanEventKind.HOST_DISCOVERED, ScanEventKind.PORTS_FOUND]
+        assert events[-1].result.scan_method == ScanMethod.PASSIVE
+        assert events[-1].to_dict()["kind"] == "completed"
+
+    async def test_batches(self, _mdns):
+        async def _events():
+            for i in range(5):
+                yield ScanEvent(ScanEventKind.HOST_DISCOVERED, asset=Asset(ip=f"10.0.0.{i}"))
+            yield ScanEvent(ScanEventKind.COMPLETED)
+
+        batches = [b async for b in batch_scan_events(_events(), max_batch=2, max_delay=60)]
+
+        assert [len(b) for b in batches] == [2, 2, 2]
+        assert batches[-1][-1].kind == ScanEventKind.COMPLETED
+
+    async def test_batch_flushed_when_stream_stalls(self, _mdns):
+        release = asyncio.Event()
+
+        async def _events():
+            yield ScanEvent(ScanEventKind.HOST_DISCOVERED, asset=Asset(ip="10.0.0.1"))
+            await release.wait()
+            yield ScanEvent(ScanEventKind.COMPLETED)
+
+        batches = batch_scan_events(_events(), max_batch=50, max_delay=0.01)
+        first = await asyncio.wait_for(anext(batches), timeout=1)
+        assert [e.asset.ip for e in first] == ["10.0.0.1"]
+        release.set()
+        assert [e.kind for e in await anext(batches)] == [ScanEventKind.COMPLETED]
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.hybrid.run_passive_scan", side_effect=lambda target_ips: _passive())
+    @patch("bigr.scanner.hybrid.is_root", return_value=False)
+    def test_run_with_progress_sink(self, _root, _passive_scan, mock_probe, _mdns):
+        async def fake_probe(ip, port, timeout=2.0):
+            return False, None
+
+        mock_probe.side_effect = fake_probe
+        log = MagicMock()
+        progress = ScanProgressLogger("10.0.0.0/24", log)
+
+        result = run_hybrid_scan("10.0.0.0/24", mode="passive", ports=[22], on_batch=progress)
+
+        assert len(result.assets) == 2
+        assert progress.discovered == progress.port_scanned == {"10.0.0.1", "10.0.0.5"}
+        log.info.assert_called()
+
+
+# ---------------------------------------------------------------------------
+# TestIncrementalScan
+# ---------------------------------------------------------------------------
+
+
+@patch("bigr.scanner.hybrid.discover_mdns_services", return_value=[])
+class TestIncrementalScan:
+    """Only new or changed hosts are port-scanned against a baseline."""
+
+    @patch("bigr.scanner.active.async_tcp_probe")
+    @patch("bigr.scanner.hybrid.iter_arp_sweep", side_effect=lambda target: _active())
+    @patch("bigr.scanner.hybrid.run_passive_scan", side_effect=lambda target_ips: _passive())
+    @patch("bigr.scanner.hybrid.is_root", return_value=True)
+    def test_unchanged_hosts_carried_forward(self, _root, _passive_scan, _sweep, mock_probe, _mdns):
+        probed: set[str] = set()
+
+        async def fake_probe(ip, port, timeout=2.0):
+            probed.add(ip)
+            return port == 22, None
+
+        mock_probe.side_effect = fake_probe
+        baseline = {
+            # unchanged
+            "10.0.0.1": {"mac": "aa:bb:cc:dd:ee:01", "open_ports": [80], "scanned_ports": [80, 443],
+                         "ports_checked_at": "2026-01-02"},
+            # MAC changed
+            "10.0.0.5": {"mac": "aa:bb:cc:dd:ee:55", "open_ports": [443], "ports_checked_at": "2026-01-02"},
+        }
+
+        result = run_hybrid_scan("10.0.0.0/24", ports=[22], baseline=baseline, rescan_fraction=0)
+
+        assert probed == {"10.0.0.5", "10.0.0.9"}
+        by_ip = {a.ip: a for a in result.assets}
+        assert by_ip["10.0.0.1"].open_ports == [80]
+        assert by_ip["10.0.0.1"].raw_evidence["ports_carried_forward"] is True
+        assert by_ip["10.0.0.5"].open_ports == [22]
+        assert "ports_carried_forward" not in by_ip["10.0.0.5"].raw_evidence
+        assert by_ip["10.0.0.1"].raw_evidence["scanned_ports"] == [80, 443]
+        assert by_ip["10.0.0.5"].raw_evidence["scanned_ports"] == [22]
+        assert result.is_partial
+
+    def test_rotation_picks_stalest(self, _mdns):
+        baseline = {
+            f"10.0.0.{i}": {"mac": None, "open_ports": [], "ports_checked_at": f"2026-01-{i:02d}"}
+            for i in range(1, 11)
+        }
+        baseline["10.0.0.7"]["ports_checked_at"] = None
+        baseline["192.168.0.1"] = {"mac": None, "open_ports": [], "ports_checked_at": None}
+
+        due = select_rescan_due(baseline, TargetSet.parse("10.0.0.0/24"), fraction=0.2)
+
+        assert due == {"10.0.0.7", "10.0.0.1"}
+
+    def test_update_port_baseline(self, _mdns):
+        baseline = {"10.0.0.1": {"mac": "m1", "open_ports": [22], "ports_checked_at": "t0"}}
+        assets = [
+            {"ip": "10.0.0.1", "mac": "m1", "open_ports": [22],
+             "raw_evidence": {"ports_carried_forward": True}},
+            {"ip": "10.0.0.2", "mac": "m2", "open_ports": [80], "raw_evidence": {}},
+        ]
+
+        update_port_baseline(baseline, assets, "t1")
+
+        assert baseline["10.0.0.1"]["ports_checked_at"] == "t0"
+        assert baseline["10.0.0.2"] == {"mac": "m2", "open_ports": [80], "ports_checked_at": "t1"}
+
+
+class TestMdnsListenerSnapshot:
+    """A running mDNS listener replaces the per-scan listening window."""
+
+    @patch("bigr.scanner.hybrid.discover_mdns_services")
+    @patch("bigr.scanner.hybrid.run_passive_scan", side_effect=lambda target_ips: _passive())
+    @patch("bigr.scanner.hybrid.is_root", return_value=False)
+    def test_snapshot_used(self, _root, _passive_scan, mock_discover):
+        from bigr.scanner.mdns import MdnsListener, MdnsService
+
+        listener = MdnsListener()
+        listener.record(MdnsService(name="tv", service_type="_airplay._tcp.local.", ip="10.0.0.5", port=7000))
+
+        with patch("bigr.scanner.hybrid.get_mdns_listener", return_value=listener):
+            result = run_hybrid_scan("10.0.0.0/24", mode="passive")
+
+        mock_discover.assert_not_called()
+        by_ip = {a.ip: a for a in result.assets}
+        assert by_ip["10.0.0.5"].raw_evidence["mdns_services"][0]["name"] == "tv"
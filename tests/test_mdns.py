@@ -11,7 +11,7 @@ from bigr.classifier.rules_engine import (
     load_rules,
 )
 from bigr.models import Asset
-from bigr.scanner.mdns import MdnsService, enrich_assets_with_mdns
+from bigr.scanner.mdns import MdnsListener, MdnsService, enrich_assets_with_mdns
 
 
 class TestMdnsServiceDataclass:
@@ -133,6 +133,74 @@ class TestEnrichAssetsWithMdns:
         assert result[0].hostname == "nas.local."
 
 
+class TestMdnsListener:
+    """Long-lived listener keeps a TTL'd service table."""
+
+    @staticmethod
+    def _fake_zc(ip: str = "192.168.1.20") -> MagicMock:
+        info = MagicMock()
+        info.parsed_addresses.return_value = [ip]
+        info.port = 8009
+        info.server = "chromecast.local."
+        info.properties = {b"fn": b"Living Room"}
+        zc = MagicMock()
+        zc.get_service_info.return_value = info
+        return zc
+
+    def test_add_update_remove(self):
+        listener = MdnsListener()
+        zc = self._fake_zc()
+        listener.add_service(zc, "_googlecast._tcp.local.", "tv._googlecast._tcp.local.")
+        listener.update_service(zc, "_googlecast._tcp.local.", "tv._googlecast._tcp.local.")
+
+        (svc,) = listener.snapshot()
+        assert (svc.ip, svc.port, svc.properties) == ("192.168.1.20", 8009, {"fn": "Living Room"})
+        assert list(listener.services_by_ip()) == ["192.168.1.20"]
+
+        listener.remove_service(zc, "_googlecast._tcp.local.", "tv._googlecast._tcp.local.")
+        assert listener.snapshot() == []
+
+    def test_ttl_expiry(self):
+        listener = MdnsListener(ttl=60)
+        with patch("bigr.scanner.mdns.time.monotonic", return_value=1000.0):
+            listener.record(MdnsService(name="a", service_type="_ssh._tcp.local.", ip="10.0.0.1", port=22))
+        with patch("bigr.scanner.mdns.time.monotonic", return_value=1059.0):
+            assert len(listener.snapshot()) == 1
+        with patch("bigr.scanner.mdns.time.monotonic", return_value=1061.0):
+            assert listener.snapshot() == []
+
+    def test_ttl_refreshed_from_zeroconf_cache(self):
+        """Unchanged re-announcements keep a service alive past the TTL."""
+        listener = MdnsListener(ttl=60)
+        live, expired = MagicMock(), MagicMock()
+        live.is_expired.return_value = False
+        expired.is_expired.return_value = True
+        listener._zc = MagicMock()
+        listener._zc.cache.entries_with_name.side_effect = (
+            lambda name: [live] if name == "tv" else [expired]
+        )
+        with patch("bigr.scanner.mdns.time.monotonic", return_value=1000.0):
+            listener.record(MdnsService(name="tv", service_type="_hap._tcp.local.", ip="10.0.0.1", port=80))
+            listener.record(MdnsService(name="gone", service_type="_hap._tcp.local.", ip="10.0.0.2", port=80))
+        with patch("bigr.scanner.mdns.time.monotonic", return_value=1100.0):
+            assert [s.name for s in listener.snapshot()] == ["tv"]
+        listener._zc = None
+        with patch("bigr.scanner.mdns.time.monotonic", return_value=1159.0):
+            assert [s.name for s in listener.snapshot()] == ["tv"]
+        with patch("bigr.scanner.mdns.time.monotonic", return_value=1161.0):
+            assert listener.snapshot() == []
+
+    def test_enrich_reads_running_listener(self):
+        listener = MdnsListener()
+        listener.record(MdnsService(
+            name="nas", service_type="_smb._tcp.local.", ip="10.0.0.5", port=445, hostname="nas.local.",
+        ))
+        assets = [Asset(ip="10.0.0.5")]
+        with patch("bigr.scanner.mdns.get_mdns_listener", return_value=listener):
+            enrich_assets_with_mdns(assets)
+        assert assets[0].hostname == "nas.local."
+
+
 class TestServiceScoringPrinter:
     def test_ipp_printer_scores_iot(self):
         """IPP printer service should score high for IoT."""
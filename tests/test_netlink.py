@@ -0,0 +1,190 @@
+"""Tests for the rtnetlink neighbor table reader in bigr.scanner.netlink."""
+
+from __future__ import annotations
+
+import socket
+import struct
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from bigr.scanner.netlink import (
+    NDA_DST,
+    NDA_LLADDR,
+    NLMSG_DONE,
+    NLMSG_ERROR,
+    RTM_DELNEIGH,
+    RTM_NEWNEIGH,
+    Neighbor,
+    NeighborMonitor,
+    dump_neighbors,
+    netlink_available,
+    parse_neighbor_messages,
+)
+from bigr.scanner.passive import scan_netlink_neighbors
+
+
+def _attr(rta_type: int, payload: bytes) -> bytes:
+    length = 4 + len(payload)
+    return struct.pack("=HH", length, rta_type) + payload + b"\x00" * ((-length) % 4)
+
+
+def _neigh_msg(
+    msg_type: int, family: int, ip: str, mac: bytes | None, state: int = 0x02, ifindex: int = 1,
+) -> bytes:
+    body = struct.pack("=BBHiHBB", family, 0, 0, ifindex, state, 0, 0)
+    body += _attr(NDA_DST, socket.inet_pton(family, ip))
+    if mac is not None:
+        body += _attr(NDA_LLADDR, mac)
+    return struct.pack("=IHHII", 16 + len(body), msg_type, 0, 1, 0) + body
+
+
+def _done() -> bytes:
+    return struct.pack("=IHHII", 20, NLMSG_DONE, 0, 1, 0) + b"\x00" * 4
+
+
+MAC = b"\xaa\xbb\xcc\xdd\xee\x01"
+
+
+# ---------------------------------------------------------------------------
+# TestParseNeighborMessages
+# ---------------------------------------------------------------------------
+
+
+class TestParseNeighborMessages:
+    """Decoding of RTM_NEWNEIGH / RTM_DELNEIGH messages."""
+
+    def test_ipv4_and_ipv6(self):
+        data = (
+            _neigh_msg(RTM_NEWNEIGH, socket.AF_INET, "10.0.0.1", MAC, state=0x04)
+            + _neigh_msg(RTM_NEWNEIGH, socket.AF_INET6, "fe80::1", MAC)
+            + _done()
+        )
+        messages, done = parse_neighbor_messages(data)
+
+        assert done
+        assert [(t, n.ip, n.mac, n.state) for t, n in messages] == [
+            (RTM_NEWNEIGH, "10.0.0.1", "aa:bb:cc:dd:ee:01", "stale"),
+            (RTM_NEWNEIGH, "fe80::1", "aa:bb:cc:dd:ee:01", "reachable"),
+        ]
+        assert messages[0][1].ifindex == 1
+
+    def test_incomplete_entry_not_usable(self):
+        messages, done = parse_neighbor_messages(
+            _neigh_msg(RTM_NEWNEIGH, socket.AF_INET, "10.0.0.2", None, state=0x01)
+        )
+        assert not done
+        assert messages[0][1].mac is None
+        assert not messages[0][1].usable
+
+    def test_bridge_entries_skipped(self):
+        body = struct.pack("=BBHiHBB", 7, 0, 0, 1, 0x02, 0, 0) + _attr(NDA_LLADDR, MAC)
+        data = struct.pack("=IHHII", 16 + len(body), RTM_NEWNEIGH, 0, 1, 0) + body
+        assert parse_neighbor_messages(data) == ([], False)
+
+    def test_error_raises(self):
+        data = struct.pack("=IHHII", 20, NLMSG_ERROR, 0, 1, 0) + struct.pack("=i", -1)
+        with pytest.raises(OSError):
+            parse_neighbor_messages(data)
+
+
+@pytest.mark.skipif(not netlink_available(), reason="rtnetlink is Linux-only")
+class TestDumpNeighbors:
+    """A real RTM_GETNEIGH dump against the running kernel."""
+
+    def test_dump_returns_neighbors(self):
+        neighbors = dump_neighbors()
+        assert all(isinstance(n, Neighbor) for n in neighbors)
+        assert all(n.family in (socket.AF_INET, socket.AF_INET6) for n in neighbors)
+
+
+class TestScanNetlinkNeighbors:
+    """Neighbor entries become passive-scan assets."""
+
+    @patch("bigr.scanner.netlink.dump_neighbors")
+    def test_dual_stack_merged_by_mac(self, mock_dump):
+        mock_dump.return_value = [
+            Neighbor("fe80::1", "aa:bb:cc:dd:ee:01", 2, "eth0", "stale", socket.AF_INET6),
+            Neighbor("10.0.0.1", "aa:bb:cc:dd:ee:01", 2, "eth0", "reachable", socket.AF_INET),
+            Neighbor("fe80::9", "aa:bb:cc:dd:ee:09", 2, "eth0", "reachable", socket.AF_INET6),
+            Neighbor("10.0.0.5", None, 2, "eth0", "incomplete", socket.AF_INET),
+            Neighbor("224.0.0.1", "01:00:5e:00:00:01", 2, "eth0", "noarp", socket.AF_INET),
+        ]
+
+        assets = scan_netlink_neighbors()
+
+        assert [(a.ip, a.mac) for a in assets] == [
+            ("10.0.0.1", "aa:bb:cc:dd:ee:01"),
+            ("fe80::9", "aa:bb:cc:dd:ee:09"),
+        ]
+        assert assets[0].raw_evidence == {
+            "source": "netlink_neigh",
+            "interface": "eth0",
+            "neighbor_state": "reachable",
+            "ipv6_addresses": ["fe80::1"],
+        }
+
+    @patch("bigr.scanner.netlink.dump_neighbors", side_effect=OSError("no netlink"))
+    def test_unavailable_returns_none(self, _dump):
+        assert scan_netlink_neighbors() is None
+
+
+# ---------------------------------------------------------------------------
+# TestNeighborMonitor
+# ---------------------------------------------------------------------------
+
+
+class TestNeighborMonitor:
+    """Kernel updates are folded into add/remove events."""
+
+    def _neighbor(self, mac: str | None = "aa:bb:cc:dd:ee:01", state: str = "reachable") -> Neighbor:
+        return Neighbor("10.0.0.1", mac, 2, "eth0", state, socket.AF_INET)
+
+    def test_state_changes_folded(self):
+        monitor = NeighborMonitor(lambda event: None)
+
+        added = monitor.handle(RTM_NEWNEIGH, self._neighbor())
+        assert added is not None and added.kind == "added"
+        assert monitor.handle(RTM_NEWNEIGH, self._neighbor(state="stale")) is None
+        assert monitor.handle(RTM_NEWNEIGH, self._neighbor(mac=None, state="incomplete")) is None
+
+        changed = monitor.handle(RTM_NEWNEIGH, self._neighbor(mac="aa:bb:cc:dd:ee:02"))
+        assert changed is not None and changed.kind == "added"
+
+    def test_removed_on_delete_or_failure(self):
+        monitor = NeighborMonitor(lambda event: None)
+        monitor.handle(RTM_NEWNEIGH, self._neighbor())
+
+        removed = monitor.handle(RTM_DELNEIGH, self._neighbor())
+        assert removed is not None and removed.kind == "removed"
+        assert monitor.handle(RTM_DELNEIGH, self._neighbor()) is None
+
+        monitor.handle(RTM_NEWNEIGH, self._neighbor())
+        failed = monitor.handle(RTM_NEWNEIGH, self._neighbor(mac=None, state="failed"))
+        assert failed is not None and failed.kind == "removed"
+
+    @pytest.mark.skipif(not netlink_available(), reason="rtnetlink is Linux-only")
+    def test_start_stop(self):
+        monitor = NeighborMonitor(lambda event: None)
+        if not monitor.start():
+            pytest.skip("netlink multicast subscription not permitted")
+        try:
+            assert monitor.is_running
+        finally:
+            monitor.stop()
+        assert not monitor.is_running
+
+    @pytest.mark.parametrize("error", [OSError("dump failed"), ValueError("bad message")])
+    def test_failed_start_closes_socket(self, error):
+        sock = MagicMock()
+        with patch("bigr.scanner.netlink.netlink_available", return_value=True), \
+                patch("bigr.scanner.netlink.socket.socket", return_value=sock), \
+                patch("bigr.scanner.netlink.dump_neighbors", side_effect=error):
+            monitor = NeighborMonitor(lambda event: None)
+            if isinstance(error, OSError):
+                assert monitor.start() is False
+            else:
+                with pytest.raises(ValueError):
+                    monitor.start()
+        sock.close.assert_called_once()
+        assert not monitor.is_running
@@ -0,0 +1,190 @@
+"""Tests for passive-scan hostname enrichment in bigr.scanner.passive."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from bigr.models import Asset
+from bigr.scanner.passive import (
+    EnrichmentCache,
+    _nbstat_query,
+    _parse_nbstat_name,
+    async_enrich_hostnames,
+    async_query_netbios,
+    run_passive_scan,
+)
+
+
+def _nbstat_response(query: bytes, name: str) -> bytes:
+    """Build a minimal NBSTAT response echoing the query's transaction ID."""
+    header = query[:2] + b"\x84\x00\x00\x00\x00\x01\x00\x00\x00\x00"
+    body = query[12:12 + 34] + b"\x00\x21\x00\x01" + b"\x00\x00\x00\x00" + b"\x00\x41"
+    return header + body + b"\x01" + name.ljust(15).encode("ascii") + b"\x00\x04\x00"
+
+
+@pytest.fixture()
+def nbstat_responder():
+    """UDP responder on localhost answering every NBSTAT query."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(0.2)
+    received: list[bytes] = []
+    stop = threading.Event()
+
+    def _serve():
+        while not stop.is_set():
+            try:
+                data, addr = sock.recvfrom(1024)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            received.append(data)
+            sock.sendto(_nbstat_response(data, "WORKSTATION"), addr)
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    thread.start()
+    yield sock.getsockname()[1], received
+    stop.set()
+    thread.join(timeout=1)
+    sock.close()
+
+
+# ---------------------------------------------------------------------------
+# TestEnrichmentCache
+# ---------------------------------------------------------------------------
+
+
+class TestEnrichmentCache:
+    """TTL cache of per-IP lookup results."""
+
+    def test_miss_then_hit(self):
+        cache = EnrichmentCache()
+        assert cache.get("10.0.0.1") == (False, None)
+        cache.put("10.0.0.1", "host.local")
+        assert cache.get("10.0.0.1") == (True, "host.local")
+
+    def test_negative_result_cached(self):
+        cache = EnrichmentCache()
+        cache.put("10.0.0.1", None)
+        assert cache.get("10.0.0.1") == (True, None)
+
+    def test_expiry(self):
+        cache = EnrichmentCache(ttl=10, negative_ttl=1)
+        with patch("bigr.scanner.passive.time.monotonic", return_value=100.0):
+            cache.put("10.0.0.1", "a")
+            cache.put("10.0.0.2", None)
+        with patch("bigr.scanner.passive.time.monotonic", return_value=105.0):
+            assert cache.get("10.0.0.1") == (True, "a")
+            assert cache.get("10.0.0.2") == (False, None)
+        with patch("bigr.scanner.passive.time.monotonic", return_value=111.0):
+            assert cache.get("10.0.0.1") == (False, None)
+
+    def test_max_size_evicts_oldest(self):
+        cache = EnrichmentCache(max_size=2)
+        cache.put("10.0.0.1", "a")
+        cache.put("10.0.0.2", "b")
+        cache.put("10.0.0.3", "c")
+        assert len(cache) == 2
+        assert cache.get("10.0.0.1") == (False, None)
+
+
+# ---------------------------------------------------------------------------
+# TestNetbios
+# ---------------------------------------------------------------------------
+
+
+class TestNetbios:
+    """Batched NBSTAT queries over one UDP socket."""
+
+    def test_query_carries_transaction_id(self):
+        assert _nbstat_query(0x1234)[:2] == b"\x12\x34"
+        assert _nbstat_query(1)[12] == 0x20
+
+    def test_parse_name(self):
+        assert _parse_nbstat_name(_nbstat_response(_nbstat_query(7), "PRINTER")) == "PRINTER"
+        assert _parse_nbstat_name(b"\x00" * 20) is None
+
+    async def test_batch_over_single_socket(self, nbstat_responder):
+        port, received = nbstat_responder
+        result = await async_query_netbios(["127.0.0.1"], timeout=1.0, port=port)
+        assert result == {"127.0.0.1": "WORKSTATION"}
+        assert len(received) == 1
+
+    async def test_unanswered_hosts_time_out_together(self):
+        result = await async_query_netbios(["127.0.0.1", "127.0.0.2"], timeout=0.2, port=9)
+        assert result == {"127.0.0.1": None, "127.0.0.2": None}
+
+    async def test_ipv6_hosts_skipped(self, nbstat_responder):
+        port, received = nbstat_responder
+        start = time.monotonic()
+        result = await async_query_netbios(["127.0.0.1", "fe80::1"], timeout=2.0, port=port)
+        assert result == {"127.0.0.1": "WORKSTATION", "fe80::1": None}
+        assert len(received) == 1
+        assert time.monotonic() - start < 1.0
+
+
+# ---------------------------------------------------------------------------
+# TestEnrichHostnames
+# ---------------------------------------------------------------------------
+
+
+class TestEnrichHostnames:
+    """PTR + NetBIOS enrichment with caching."""
+
+    async def test_ptr_then_netbios_fallback(self):
+        assets = [Asset(ip="10.0.0.1"), Asset(ip="10.0.0.2"), Asset(ip="10.0.0.3", hostname="known")]
+        ptr = AsyncMock(return_value={"10.0.0.1": "router.lan", "10.0.0.2": None})
+        nbns = AsyncMock(return_value={"10.0.0.1": None, "10.0.0.2": "DESKTOP-1"})
+
+        with patch("bigr.scanner.passive.async_resolve_hostnames", ptr), \
+                patch("bigr.scanner.passive.async_query_netbios", nbns):
+            await async_enrich_hostnames(
+                assets, hostname_cache=EnrichmentCache(), netbios_cache=EnrichmentCache(),
+            )
+
+        assert ptr.call_args.args[0] == ["10.0.0.1", "10.0.0.2"]
+        assert [a.hostname for a in assets] == ["router.lan", "DESKTOP-1", "known"]
+        assert assets[1].raw_evidence["netbios_name"] == "DESKTOP-1"
+
+    async def test_cache_persists_across_cycles(self):
+        hostname_cache = EnrichmentCache()
+        netbios_cache = EnrichmentCache()
+        ptr = AsyncMock(return_value={"10.0.0.1": "router.lan"})
+        nbns = AsyncMock(return_value={"10.0.0.1": None})
+
+        with patch("bigr.scanner.passive.async_resolve_hostnames", ptr), \
+                patch("bigr.scanner.passive.async_query_netbios", nbns):
+            for _ in range(3):
+                asset = Asset(ip="10.0.0.1")
+                await async_enrich_hostnames(
+                    [asset], hostname_cache=hostname_cache, netbios_cache=netbios_cache,
+                )
+                assert asset.hostname == "router.lan"
+
+        assert ptr.await_count == 1
+        assert nbns.await_count == 1
+
+
+class TestRunPassiveScan:
+    """Only target hosts are enriched."""
+
+    @patch("bigr.scanner.passive.enrich_hostnames")
+    @patch("bigr.scanner.passive.scan_netlink_neighbors", return_value=None)
+    @patch("bigr.scanner.passive.scan_proc_net_arp", return_value=[])
+    @patch("bigr.scanner.passive.scan_arp_table")
+    def test_filter_before_enrichment(self, mock_arp, _proc, _netlink, mock_enrich):
+        mock_arp.return_value = [
+            Asset(ip="10.0.0.1", mac="aa:bb:cc:dd:ee:01"),
+            Asset(ip="172.16.0.1", mac="aa:bb:cc:dd:ee:02"),
+        ]
+
+        assets = run_passive_scan(target_ips=["10.0.0.1"])
+
+        assert [a.ip for a in assets] == ["10.0.0.1"]
+        assert [a.ip for a in mock_enrich.call_args.args[0]] == ["10.0.0.1"]
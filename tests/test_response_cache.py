@@ -0,0 +1,109 @@
+"""Tests for the versioned dashboard response cache (bigr.core.cache)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from bigr.core.cache import (
+    CachedResponse,
+    ResponseCache,
+    bump_inventory_generation,
+    etag_matches,
+    inventory_generation,
+)
+
+
+def _render(result):
+    return None if isinstance(result, Exception) else json.dumps(result).encode()
+
+
+class TestResponseCache:
+    """Generation-tagged entries, single-flight and uncached errors."""
+
+    async def test_hit_until_generation_bump(self):
+        cache = ResponseCache()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            return {"n": calls}
+
+        first = await cache.get("k", compute, _render)
+        second = await cache.get("k", compute, _render)
+        assert second is first
+        assert calls == 1
+
+        before = inventory_generation()
+        assert bump_inventory_generation() == before + 1
+        third = await cache.get("k", compute, _render)
+        assert calls == 2
+        assert third.body == b'{"n": 2}'
+        assert third.etag != first.etag
+
+    async def test_single_flight(self):
+        cache = ResponseCache()
+        calls = 0
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {"ok": True}
+
+        waiters = [asyncio.ensure_future(cache.get("k", compute, _render)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters)
+
+        assert calls == 1
+        assert all(r is results[0] for r in results)
+        assert cache.misses == 1
+
+    async def test_write_during_compute_not_cached(self):
+        cache = ResponseCache()
+
+        async def compute():
+            bump_inventory_generation()
+            return {"stale": True}
+
+        entry = await cache.get("k", compute, _render)
+        assert isinstance(entry, CachedResponse)
+        assert cache.lookup("k") is None
+
+    async def test_unrenderable_result_passed_through(self):
+        cache = ResponseCache()
+        error = RuntimeError("boom")
+
+        async def compute():
+            return error
+
+        assert await cache.get("k", compute, _render) is error
+        assert cache.lookup("k") is None
+
+    async def test_max_age_and_lru(self):
+        cache = ResponseCache(max_entries=2, max_age=0.0)
+
+        async def compute():
+            return {}
+
+        await cache.get("k", compute, _render)
+        await asyncio.sleep(0.01)
+        assert cache.lookup("k") is None
+
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            await cache.get(key, compute, _render)
+        assert cache.lookup("a") is None
+        assert cache.lookup("c") is not None
+
+
+class TestEtagMatches:
+    def test_matching(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('W/"abc", "def"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"def"', '"abc"')
+        assert not etag_matches(None, '"abc"')
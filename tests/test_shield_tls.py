@@ -387,3 +387,44 @@ class TestTLSScanDNSFailure:
         assert len(findings) == 1
         assert "DNS" in findings[0].title
         assert findings[0].severity == FindingSeverity.HIGH
+
+
+class TestTLSScanNetworkTarget:
+    """Multi-host targets are harvested concurrently instead of resolved as a hostname."""
+
+    @pytest.mark.asyncio
+    async def test_cidr_target_harvests_certificates(self):
+        from unittest.mock import AsyncMock
+
+        from bigr.scanner.tls import CertificateInfo, CertScanResult
+
+        expired = CertificateInfo(ip="10.0.0.2", port=443, cn="old", is_expired=True, days_until_expiry=-3)
+        harvest = AsyncMock(return_value=CertScanResult(certificates=[expired], total_scanned=2))
+
+        mod = TLSCheckModule()
+        with patch("bigr.scanner.tls.async_scan_all_certificates", harvest), \
+             patch("bigr.shield.modules.tls_check.socket.create_connection") as mock_conn:
+            findings = await mod.scan("10.0.0.0/30")
+
+        mock_conn.assert_not_called()
+        assert [a["ip"] for a in harvest.call_args.args[0]] == ["10.0.0.1", "10.0.0.2"]
+        assert [f.title for f in findings] == ["Certificate Expired"]
+        assert findings[0].severity == FindingSeverity.CRITICAL
+        assert mod.last_certificates[0]["cn"] == "old"
+
+    def test_certificate_findings_share_single_host_checks(self):
+        from bigr.scanner.tls import CertificateInfo
+        from bigr.shield.modules.tls_check import _certificate_findings
+
+        cert = CertificateInfo(
+            ip="10.0.0.2", port=8443, cn="dev", is_self_signed=True, key_size=1024,
+            valid_to="2026-11-01T00:00:00+00:00", days_until_expiry=12,
+        )
+        findings = _certificate_findings(cert)
+
+        assert [f.title for f in findings] == [
+            "Certificate Expiring Soon", "Self-Signed Certificate", "Weak Certificate Key Size",
+        ]
+        assert findings[0].remediation == "Renew the TLS certificate before 2026-11-01."
+        assert all((f.target_ip, f.target_port) == ("10.0.0.2", 8443) for f in findings)
+        assert findings[2].evidence == {"key_bits": 1024}
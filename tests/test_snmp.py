@@ -2,13 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
+import bisect
+import socket
 import sqlite3
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from bigr.scanner.snmp import (
+    OID_DOT1D_BASE_PORT_IF_INDEX,
+    OID_DOT1D_TP_FDB_PORT,
+    OID_IF_NAME,
+    SnmpClient,
+    SnmpError,
     SnmpMacTableReader,
     SwitchConfig,
     SwitchMacEntry,
@@ -16,6 +25,83 @@ from bigr.scanner.snmp import (
     enrich_assets_with_switch_info,
     normalize_snmp_mac,
 )
+from bigr.scanner.snmp import (
+    _PDU_GET_BULK,
+    _PDU_RESPONSE,
+    _TAG_END_OF_MIB_VIEW,
+    _TAG_INTEGER,
+    _TAG_OCTET_STRING,
+    _decode_message,
+    _encode_message,
+    _oid_key,
+)
+
+
+class _SnmpAgentStub:
+    """GETBULK-only SNMPv2c agent on localhost backed by a sorted OID table."""
+
+    def __init__(self, table: dict[str, tuple[int, object]], community: str = "public"):
+        self.community = community
+        self.oids = sorted(table, key=_oid_key)
+        self.keys = [_oid_key(o) for o in self.oids]
+        self.table = table
+        self.requests = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    def _bulk(self, start: str, max_repetitions: int) -> list[tuple[str, int, object]]:
+        varbinds: list[tuple[str, int, object]] = []
+        idx = bisect.bisect_right(self.keys, _oid_key(start))
+        for _ in range(max_repetitions):
+            if idx >= len(self.oids):
+                varbinds.append((start, _TAG_END_OF_MIB_VIEW, None))
+                break
+            oid = self.oids[idx]
+            varbinds.append((oid, *self.table[oid]))
+            idx += 1
+        return varbinds
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data, addr = self.sock.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            community, pdu, request_id, _non_rep, max_rep, varbinds = _decode_message(data)
+            self.requests += 1
+            if community != self.community or pdu != _PDU_GET_BULK:
+                continue  # agents silently drop bad communities
+            reply = _encode_message(community, _PDU_RESPONSE, request_id, self._bulk(varbinds[0][0], max_rep))
+            self.sock.sendto(reply, addr)
+
+    def __enter__(self) -> _SnmpAgentStub:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join(timeout=1)
+        self.sock.close()
+
+
+def _switch_table(mac_count: int) -> dict[str, tuple[int, object]]:
+    """FDB, bridge-port and ifName rows for a 48-port access switch."""
+    table: dict[str, tuple[int, object]] = {"1.3.6.1.2.1.1.5.0": (_TAG_OCTET_STRING, b"sw1")}
+    for i in range(mac_count):
+        mac = (0x001E_BD00_0000 + i).to_bytes(6, "big")
+        suffix = ".".join(str(b) for b in mac)
+        table[f"{OID_DOT1D_TP_FDB_PORT}.{suffix}"] = (_TAG_INTEGER, i % 48 + 1)
+    for port in range(1, 49):
+        table[f"{OID_DOT1D_BASE_PORT_IF_INDEX}.{port}"] = (_TAG_INTEGER, 10000 + port)
+        table[f"{OID_IF_NAME}.{10000 + port}"] = (_TAG_OCTET_STRING, f"Gi1/0/{port}".encode())
+    table["1.3.6.1.2.1.31.1.1.1.6.10001"] = (0x46, 12345)  # ifHCInOctets, past ifName
+    return table
 
 
 # ---------------------------------------------------------------------------
@@ -201,6 +287,119 @@ class TestSnmpMacTableReader:
         assert reader.mac_table == [mock_entry]
 
 
+# ---------------------------------------------------------------------------
+# TestSnmpGetBulk
+# ---------------------------------------------------------------------------
+
+
+class TestSnmpGetBulk:
+    """Real GETBULK walks against a local agent stub."""
+
+    def test_message_roundtrip(self):
+        message = _encode_message("c", _PDU_GET_BULK, 42, [(OID_IF_NAME, 0x05, None)], 0, 25)
+        assert _decode_message(message) == ("c", _PDU_GET_BULK, 42, 0, 25, [(OID_IF_NAME, 0x05, None)])
+
+    def test_malformed_value_raises_snmp_error(self):
+        message = _encode_message("c", _PDU_RESPONSE, 7, [(OID_IF_NAME, _TAG_OCTET_STRING, b"\x7f")])
+        # Retag the one-byte string as an IpAddress, which needs four bytes
+        message = message.replace(b"\x04\x01\x7f", b"\x40\x01\x7f")
+        with pytest.raises(SnmpError, match="Malformed"):
+            _decode_message(message)
+
+    async def test_walk_stops_at_subtree_end(self):
+        with _SnmpAgentStub(_switch_table(0)) as agent:
+            async with SnmpClient("127.0.0.1", port=agent.port, rate_limit=0) as client:
+                rows = await client.walk(OID_IF_NAME, max_repetitions=10)
+        assert len(rows) == 48
+        assert rows[0] == (f"{OID_IF_NAME}.10001", b"Gi1/0/1")
+        assert agent.requests == 5
+
+    def test_large_fdb_in_few_round_trips(self):
+        with _SnmpAgentStub(_switch_table(2000)) as agent:
+            reader = SnmpMacTableReader(
+                SwitchConfig(host="127.0.0.1", label="Access"),
+                port=agent.port, max_repetitions=250, rate_limit=0,
+            )
+            entries = reader.read_mac_table()
+
+        assert len(entries) == 2000
+        assert entries[0].mac == "00:1e:bd:00:00:00"
+        assert entries[0].port_name == "Gi1/0/1"
+        assert entries[47].port_index == 48
+        # 8 full FDB pages + 1 that runs past the table, 1 bridge-port, 1 ifName
+        assert agent.requests == 11
+
+    def test_wrong_community_times_out(self):
+        with _SnmpAgentStub(_switch_table(1), community="secret") as agent:
+            reader = SnmpMacTableReader(
+                SwitchConfig(host="127.0.0.1"), port=agent.port, timeout=0.1, retries=1, rate_limit=0,
+            )
+            with pytest.raises(SnmpError, match="no response after 2 attempts"):
+                reader.read_mac_table()
+
+    def test_v3_rejected(self):
+        reader = SnmpMacTableReader(SwitchConfig(host="127.0.0.1", version="3"))
+        with pytest.raises(SnmpError, match="not supported"):
+            reader.read_mac_table()
+
+    async def test_rate_limit_spaces_requests(self):
+        with _SnmpAgentStub(_switch_table(0)) as agent:
+            async with SnmpClient("127.0.0.1", port=agent.port, rate_limit=50) as client:
+                loop = asyncio.get_running_loop()
+                started = loop.time()
+                await client.walk(OID_IF_NAME, max_repetitions=10)
+                elapsed = loop.time() - started
+        assert elapsed >= 4 * 0.02
+
+
+class TestScanAllSwitches:
+    """Switches are polled concurrently and failures are skipped."""
+
+    def test_parallel_polling(self, tmp_path):
+        from bigr.scanner.switch_map import get_switches, save_switch, scan_all_switches
+
+        db = tmp_path / "test.db"
+        for i in range(6):
+            save_switch(SwitchConfig(host=f"10.0.0.{i}", label=f"sw{i}"), db_path=db)
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_read(self):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if self.switch.host == "10.0.0.3":
+                raise SnmpError("timeout")
+            return [SwitchMacEntry(
+                mac="aa:bb:cc:dd:ee:ff", switch_host=self.switch.host,
+                switch_label=self.switch.label, port_index=1, port_name="Gi0/1",
+            )]
+
+        with patch.object(SnmpMacTableReader, "async_read_mac_table", fake_read):
+            entries = scan_all_switches(db_path=db, max_concurrency=4)
+
+        assert peak == 4
+        assert [e.switch_host for e in entries] == [f"10.0.0.{i}" for i in (0, 1, 2, 4, 5)]
+        polled = {s["host"]: s for s in get_switches(db_path=db)}
+        assert polled["10.0.0.0"]["mac_count"] == 1
+        assert polled["10.0.0.3"]["last_polled"] is None
+
+    def test_unexpected_error_skips_only_that_switch(self):
+        from bigr.scanner.switch_map import async_scan_switches
+
+        async def fake_read(self):
+            if self.switch.host == "10.0.0.1":
+                raise KeyError("bad row")
+            return []
+
+        configs = [SwitchConfig(host=f"10.0.0.{i}") for i in range(3)]
+        with patch.object(SnmpMacTableReader, "async_read_mac_table", fake_read):
+            assert asyncio.run(async_scan_switches(configs)) == [[], None, []]
+
+
 # ---------------------------------------------------------------------------
 # TestEnrichAssetsWithSwitchInfo
 # ---------------------------------------------------------------------------
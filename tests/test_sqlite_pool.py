@@ -0,0 +1,106 @@
+"""Tests for the per-thread SQLite connection pool (bigr.sqlite_pool)."""
+
+from __future__ import annotations
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from bigr import sqlite_pool
+from bigr.sqlite_pool import close_connections, get_connection
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    close_connections()
+    yield
+    close_connections()
+
+
+class TestGetConnection:
+    """Connections are reused per thread and file, with the tuned profile."""
+
+    def test_reused_within_thread(self, tmp_path):
+        db = tmp_path / "a.db"
+        first = get_connection(db)
+        first.close()
+        second = get_connection(db)
+        assert second is first
+        second.execute("SELECT 1")  # still open
+
+    def test_pragma_profile(self, tmp_path):
+        conn = get_connection(tmp_path / "a.db")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -32768
+
+    def test_per_thread(self, tmp_path):
+        db = tmp_path / "a.db"
+        main = get_connection(db)
+        other: list = []
+        t = threading.Thread(target=lambda: other.append(get_connection(db)))
+        t.start()
+        t.join()
+        assert other[0] is not main
+
+    def test_close_rolls_back_uncommitted(self, tmp_path):
+        db = tmp_path / "a.db"
+        conn = get_connection(db)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.close()
+
+        conn = get_connection(db)
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+    def test_nested_checkout_keeps_transaction(self, tmp_path):
+        db = tmp_path / "a.db"
+        outer = get_connection(db)
+        outer.execute("CREATE TABLE t (x INTEGER)")
+        outer.commit()
+        outer.execute("INSERT INTO t VALUES (1)")
+        inner = get_connection(db)
+        inner.close()
+        assert outer.in_transaction
+        outer.commit()
+        outer.close()
+        assert get_connection(db).execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+    def test_reopened_after_file_replaced(self, tmp_path):
+        db = tmp_path / "a.db"
+        conn = get_connection(db)
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.close()
+        for suffix in ("", "-wal", "-shm"):
+            (tmp_path / f"a.db{suffix}").unlink(missing_ok=True)
+
+        fresh = get_connection(db)
+        assert fresh is not conn
+        assert fresh.execute("SELECT name FROM sqlite_master").fetchall() == []
+        assert db.exists()
+
+    def test_lru_eviction(self, tmp_path):
+        with patch.object(sqlite_pool, "MAX_CONNECTIONS_PER_THREAD", 2):
+            first = get_connection(tmp_path / "1.db")
+            get_connection(tmp_path / "2.db")
+            get_connection(tmp_path / "3.db")
+            assert get_connection(tmp_path / "1.db") is not first
+
+    def test_periodic_checkpoint(self, tmp_path):
+        db = tmp_path / "a.db"
+        conn = get_connection(db)
+        statements: list[str] = []
+        conn.set_trace_callback(statements.append)
+        conn.close()
+
+        get_connection(db).close()
+        assert not any("wal_checkpoint" in s for s in statements)
+        with patch.object(sqlite_pool, "CHECKPOINT_INTERVAL", 0.0):
+            get_connection(db).close()
+        assert any("wal_checkpoint" in s for s in statements)
@@ -0,0 +1,150 @@
+"""Tests for compact scan target sets (bigr.scanner.targets)."""
+
+from __future__ import annotations
+
+import ipaddress
+import socket
+from unittest.mock import patch
+
+import pytest
+
+from bigr.models import Asset
+from bigr.scanner.passive import run_passive_scan
+from bigr.scanner.targets import TargetSet, split_target_spec
+from bigr.shield.modules.port_scan import _nmap_target_args
+from bigr.shield.orchestrator import _detect_target_type
+
+
+class TestParse:
+    """Parsing of CIDRs, ranges, single IPs and exclusions."""
+
+    def test_cidr_matches_hosts(self):
+        ts = TargetSet.parse("192.168.1.0/24")
+        expected = [str(ip) for ip in ipaddress.ip_network("192.168.1.0/24").hosts()]
+        assert list(ts) == expected
+        assert len(ts) == 254
+
+    def test_small_networks_match_hosts(self):
+        for cidr in ("10.0.0.0/31", "10.0.0.7/32", "10.0.0.0/30"):
+            expected = [str(ip) for ip in ipaddress.ip_network(cidr).hosts()]
+            assert list(TargetSet.parse(cidr)) == expected
+
+    def test_single_ip(self):
+        assert list(TargetSet.parse("10.1.2.3")) == ["10.1.2.3"]
+
+    def test_range(self):
+        ts = TargetSet.parse("10.0.0.250-10.0.1.2")
+        assert list(ts) == ["10.0.0.250", "10.0.0.251", "10.0.0.252", "10.0.0.253",
+                            "10.0.0.254", "10.0.0.255", "10.0.1.0", "10.0.1.1", "10.0.1.2"]
+
+    def test_multi_cidr_merged(self):
+        ts = TargetSet.parse("10.0.0.0/24, 10.0.0.128/25, 10.0.2.0/24")
+        assert len(list(ts.ranges())) == 2
+        assert len(ts) == 254 + 254
+
+    def test_exclusions(self):
+        ts = TargetSet.parse("10.0.0.0/16,!10.0.5.0/24,!10.0.0.1")
+        assert "10.0.5.10" not in ts
+        assert "10.0.0.1" not in ts
+        assert "10.0.4.255" in ts
+        assert "10.0.6.1" in ts
+        assert len(ts) == 65534 - 256 - 1
+
+    def test_exclude_argument(self):
+        ts = TargetSet.parse("10.0.0.0/24", exclude="10.0.0.0/25")
+        assert list(ts)[0] == "10.0.0.128"
+
+    def test_ipv6(self):
+        ts = TargetSet.parse("fd00::/126, 10.0.0.1")
+        assert list(ts) == ["10.0.0.1", "fd00::1", "fd00::2", "fd00::3"]
+        assert "fd00::2" in ts
+        assert "fd00::9" not in ts
+
+    @pytest.mark.parametrize("bad", ["", "not-an-ip", "10.0.0.0/33", "!10.0.0.0/24", "10.0.0.1-fd00::1"])
+    def test_invalid(self, bad):
+        with pytest.raises(ValueError):
+            TargetSet.parse(bad)
+
+    def test_split_spec(self):
+        assert split_target_spec(" a , !b, c,!d ", exclude="e") == (["a", "c"], ["b", "d", "e"])
+
+
+class TestResolve:
+    """Hostname items are looked up; address specs are parsed as-is."""
+
+    @staticmethod
+    def _addrinfo(*ips):
+        return [(None, None, None, "", (ip, 0)) for ip in ips]
+
+    def test_hostname_resolved(self):
+        with patch("bigr.scanner.targets.socket.getaddrinfo",
+                   return_value=self._addrinfo("10.0.0.7", "10.0.0.7", "fd00::7")):
+            ts = TargetSet.resolve("nas.local, 10.0.1.0/30, !10.0.1.2")
+        assert list(ts) == ["10.0.0.7", "10.0.1.1", "fd00::7"]
+        assert str(ts) == "nas.local, 10.0.1.0/30, !10.0.1.2"
+
+    def test_addresses_not_looked_up(self):
+        with patch("bigr.scanner.targets.socket.getaddrinfo") as lookup:
+            assert list(TargetSet.resolve("10.0.0.1")) == ["10.0.0.1"]
+        lookup.assert_not_called()
+
+    def test_unresolvable(self):
+        with patch("bigr.scanner.targets.socket.getaddrinfo",
+                   side_effect=socket.gaierror("Name or service not known")):
+            with pytest.raises(ValueError, match="Cannot resolve target 'nope.invalid'"):
+                TargetSet.resolve("nope.invalid")
+
+
+class TestMembershipAndIteration:
+    """Binary-search membership and lazy iteration."""
+
+    def test_membership(self):
+        ts = TargetSet.parse("10.0.0.0/8")
+        assert "10.200.3.4" in ts
+        assert ipaddress.ip_address("10.1.1.1") in ts
+        assert "11.0.0.1" not in ts
+        assert "garbage" not in ts
+        assert 42 not in ts
+
+    def test_lazy_iteration(self):
+        it = iter(TargetSet.parse("10.0.0.0/8"))
+        assert next(it) == "10.0.0.1"
+        assert next(it) == "10.0.0.2"
+
+    def test_fully_excluded_is_empty(self):
+        ts = TargetSet.parse("10.0.0.1,!10.0.0.0/24")
+        assert not ts
+        assert list(ts) == []
+
+    def test_only_version(self):
+        ts = TargetSet.parse("10.0.0.0/30,2001:db8::/64")
+        assert list(ts.only_version(4)) == ["10.0.0.1", "10.0.0.2"]
+        assert ts.only_version(6).size == 2**64 - 1
+        assert not TargetSet.parse("10.0.0.1").only_version(6)
+
+
+class TestConsumers:
+    """TargetSet is accepted by the passive filter and shield targets."""
+
+    @patch("bigr.scanner.passive.enrich_hostnames")
+    @patch("bigr.scanner.passive.scan_netlink_neighbors", return_value=None)
+    @patch("bigr.scanner.passive.scan_proc_net_arp", return_value=[])
+    @patch("bigr.scanner.passive.scan_arp_table")
+    def test_passive_filter(self, mock_arp, _proc, _netlink, _enrich):
+        mock_arp.return_value = [
+            Asset(ip="10.0.0.5", mac="aa:bb:cc:dd:ee:01"),
+            Asset(ip="10.0.5.5", mac="aa:bb:cc:dd:ee:02"),
+        ]
+        assets = run_passive_scan(target_ips=TargetSet.parse("10.0.0.0/16,!10.0.5.0/24"))
+        assert [a.ip for a in assets] == ["10.0.0.5"]
+
+    def test_shield_target_type(self):
+        assert _detect_target_type("10.0.0.0/24,!10.0.0.5") == "cidr"
+        assert _detect_target_type("10.0.0.1-10.0.0.9") == "cidr"
+        assert _detect_target_type("my-host.example.com") == "domain"
+
+    def test_nmap_args(self):
+        assert _nmap_target_args("example.com") == ["example.com"]
+        assert _nmap_target_args("10.0.0.0/24, 10.0.1.0/24,!10.0.0.5") == [
+            "10.0.0.0/24", "10.0.1.0/24", "--exclude", "10.0.0.5",
+        ]
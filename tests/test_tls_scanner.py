@@ -2,8 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import shutil
+import socket
 import sqlite3
+import ssl
+import subprocess
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -13,13 +19,62 @@ from bigr.scanner.tls import (
     CertificateInfo,
     CertScanResult,
     TLS_PORTS,
+    _decode_der_cert,
+    _parsed_certs,
+    _ports_for_asset,
+    async_fetch_certificate,
+    async_scan_all_certificates,
     calculate_days_until_expiry,
+    expiry_from_valid_to,
     get_expiring_certs,
     is_cert_self_signed,
     parse_certificate,
 )
 
 
+@pytest.fixture(scope="module")
+def tls_server(tmp_path_factory):
+    """Local TLS server presenting a self-signed certificate (CN=bigr-test)."""
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl CLI not available")
+    workdir = tmp_path_factory.mktemp("tls")
+    cert, key = workdir / "cert.pem", workdir / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "10",
+         "-subj", "/CN=bigr-test", "-keyout", str(key), "-out", str(cert)],
+        check=True, capture_output=True,
+    )
+    ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    ctx.load_cert_chain(cert, key)
+
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    server.settimeout(0.2)
+    stop = threading.Event()
+
+    def _serve():
+        while not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                with ctx.wrap_socket(conn, server_side=True):
+                    pass
+            except (OSError, ssl.SSLError):
+                conn.close()
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    thread.start()
+    yield server.getsockname()[1]
+    stop.set()
+    thread.join(timeout=1)
+    server.close()
+
+
 # ---------------------------------------------------------------------------
 # TestCertificateInfo
 # ---------------------------------------------------------------------------
@@ -385,6 +440,138 @@ class TestGetExpiringCerts:
         assert get_expiring_certs([], days=30) == []
 
 
+# ---------------------------------------------------------------------------
+# TestCertificateHarvest
+# ---------------------------------------------------------------------------
+
+
+class TestCertificateHarvest:
+    """Concurrent certificate harvesting."""
+
+    async def test_fetch_self_signed(self, tls_server):
+        cert = await async_fetch_certificate("127.0.0.1", tls_server, timeout=2.0)
+        assert cert is not None
+        assert cert.cn == "bigr-test"
+        assert cert.is_self_signed
+        assert 8 <= cert.days_until_expiry <= 10
+        assert (cert.key_algorithm, cert.key_size) == ("RSA", 2048)
+        assert cert.signature_algorithm == "sha256"
+
+    async def test_closed_port_returns_none(self):
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        assert await async_fetch_certificate("127.0.0.1", port, timeout=1.0) is None
+
+    async def test_waits_for_connection_close(self, tls_server):
+        waited = []
+        real_open = asyncio.open_connection
+
+        async def tracking_open(*args, **kwargs):
+            reader, writer = await real_open(*args, **kwargs)
+            real_wait_closed = writer.wait_closed
+
+            async def wait_closed():
+                await real_wait_closed()
+                waited.append(writer)
+
+            writer.wait_closed = wait_closed
+            return reader, writer
+
+        with patch("bigr.scanner.tls.asyncio.open_connection", side_effect=tracking_open):
+            assert await async_fetch_certificate("127.0.0.1", tls_server, timeout=2.0) is not None
+        assert len(waited) == 1
+
+    async def test_harvest_summary(self, tls_server):
+        result = await async_scan_all_certificates(
+            [{"ip": "127.0.0.1"}, {"ip": ""}], ports=[tls_server], timeout=2.0,
+        )
+        assert result.total_scanned == 1
+        assert result.total_certs_found == 1
+        assert result.self_signed_count == 1
+        assert result.expiring_soon_count == 1
+
+    async def test_concurrency_limits(self):
+        in_flight: dict[str, int] = {}
+        peak = {"total": 0, "host": 0}
+
+        async def fake_fetch(ip, port, timeout=3.0):
+            in_flight[ip] = in_flight.get(ip, 0) + 1
+            peak["total"] = max(peak["total"], sum(in_flight.values()))
+            peak["host"] = max(peak["host"], in_flight[ip])
+            await asyncio.sleep(0.01)
+            in_flight[ip] -= 1
+            return None
+
+        assets = [{"ip": f"10.0.0.{i}"} for i in range(1, 21)]
+        with patch("bigr.scanner.tls.async_fetch_certificate", side_effect=fake_fetch):
+            result = await async_scan_all_certificates(
+                assets, max_concurrency=6, host_concurrency=2,
+            )
+
+        assert result.total_scanned == 20
+        assert peak["total"] == 6
+        assert peak["host"] == 2
+
+    async def test_assets_pulled_lazily(self):
+        pulled = 0
+        finished = 0
+        max_ahead = 0
+
+        def _assets():
+            nonlocal pulled
+            for i in range(1000):
+                pulled += 1
+                yield {"ip": f"10.0.{i // 250}.{i % 250 + 1}"}
+
+        async def fake_fetch(ip, port, timeout=3.0):
+            nonlocal finished, max_ahead
+            max_ahead = max(max_ahead, pulled - finished)
+            await asyncio.sleep(0)
+            if port == 443:
+                finished += 1
+            return None
+
+        with patch("bigr.scanner.tls.async_fetch_certificate", side_effect=fake_fetch):
+            result = await async_scan_all_certificates(
+                _assets(), ports=[443], max_concurrency=8, host_concurrency=2,
+            )
+
+        assert result.total_scanned == 1000
+        assert max_ahead <= 4  # one asset per host worker
+
+    async def test_parse_cached_by_fingerprint(self, tls_server):
+        _parsed_certs.clear()
+        with patch("bigr.scanner.tls._decode_der_cert", wraps=_decode_der_cert) as decode:
+            first = await async_fetch_certificate("127.0.0.1", tls_server, timeout=2.0)
+            second = await async_fetch_certificate("localhost", tls_server, timeout=2.0)
+
+        assert decode.call_count == 1
+        assert first.cert_fingerprint == second.cert_fingerprint
+        assert len(first.cert_fingerprint) == 64
+        assert (first.ip, second.ip) == ("127.0.0.1", "localhost")
+
+    def test_expiry_from_valid_to(self):
+        assert expiry_from_valid_to(None) == (None, False)
+        assert expiry_from_valid_to("2000-01-01T00:00:00+00:00")[1] is True
+
+    def test_known_closed_ports_skipped(self):
+        scanned = {
+            "ip": "10.0.0.1", "open_ports": [22, 8443],
+            "raw_evidence": {"scanned_ports": [22, 443, 8443, 8080]},
+        }
+        assert _ports_for_asset(scanned, None) == [636, 993, 995, 8443, 8883, 9443]
+        # Explicitly requested ports are tried even if probed closed
+        assert _ports_for_asset(scanned, [443, 8883]) == [443, 8443, 8883]
+
+    def test_unprobed_ports_not_skipped(self):
+        # Hybrid scan without recorded probes (e.g. --ports or carried forward)
+        hybrid = {"ip": "10.0.0.1", "scan_method": "hybrid", "open_ports": [22]}
+        assert _ports_for_asset(hybrid, None) == sorted(TLS_PORTS)
+        partial = {"ip": "10.0.0.1", "open_ports": [], "scanned_ports": [22, 80]}
+        assert _ports_for_asset(partial, None) == sorted(TLS_PORTS)
+
+
 # ---------------------------------------------------------------------------
 # TestCertificatesDb
 # ---------------------------------------------------------------------------
@@ -451,6 +638,40 @@ class TestCertificatesDb:
         assert count == 1
         assert row[0] == "new.com"
 
+    def test_unchanged_fingerprint_only_bumps_last_checked(self, tmp_path):
+        """A cert with a known fingerprint is not re-stored, only touched."""
+        from bigr.db import get_certificates_by_fingerprint, save_certificate
+
+        db_path = tmp_path / "test.db"
+        fp = "ab" * 32
+        save_certificate(
+            CertificateInfo(ip="10.0.0.1", port=443, cn="a.com", days_until_expiry=90, cert_fingerprint=fp),
+            db_path=db_path,
+        )
+        save_certificate(
+            CertificateInfo(ip="10.0.0.1", port=443, cn="ignored", days_until_expiry=89, cert_fingerprint=fp),
+            db_path=db_path,
+        )
+        save_certificate(
+            CertificateInfo(ip="10.0.0.2", port=8443, cn="a.com", cert_fingerprint=fp),
+            db_path=db_path,
+        )
+
+        shared = get_certificates_by_fingerprint(fp, db_path=db_path)
+        assert [(c["ip"], c["port"]) for c in shared] == [("10.0.0.1", 443), ("10.0.0.2", 8443)]
+        assert shared[0]["cn"] == "a.com"
+        assert shared[0]["days_until_expiry"] == 89
+
+    def test_changed_fingerprint_restores_row(self, tmp_path):
+        from bigr.db import get_certificates, save_certificate
+
+        db_path = tmp_path / "test.db"
+        save_certificate(CertificateInfo(ip="10.0.0.1", port=443, cn="a.com", cert_fingerprint="aa"), db_path=db_path)
+        save_certificate(CertificateInfo(ip="10.0.0.1", port=443, cn="b.com", cert_fingerprint="bb"), db_path=db_path)
+
+        (row,) = get_certificates(db_path=db_path)
+        assert (row["cn"], row["cert_fingerprint"]) == ("b.com", "bb")
+
     def test_get_certificates(self, tmp_path):
         """Retrieve all certificates."""
         from bigr.db import get_certificates, init_db, save_certificate
@@ -277,6 +277,27 @@ class TestWatcherAlertIntegration:
         watcher._run_single_cycle()
         assert mock_channel.send.call_count > 0
 
+    def test_change_detection_survives_restart(self, tmp_path):
+        """A new watcher diffs against the baseline persisted by the last one."""
+        scans = iter([
+            [{"ip": "192.168.1.1", "mac": "aa:bb:cc:dd:ee:01", "open_ports": [80]}],
+            [{"ip": "192.168.1.1", "mac": "aa:bb:cc:dd:ee:01", "open_ports": [80, 443]}],
+        ])
+
+        def _make() -> WatcherDaemon:
+            return WatcherDaemon(
+                targets=[{"subnet": "192.168.1.0/24", "interval_seconds": 0}],
+                bigr_dir=tmp_path,
+                scan_func=lambda subnet: next(scans),
+                db_path=tmp_path / "bigr.db",
+            )
+
+        _make()._run_single_cycle()
+        restarted = _make()
+        restarted._run_single_cycle()
+
+        assert restarted.scan_history[0]["changes_count"] == 1
+
     def test_watcher_per_target_interval(self, tmp_path):
         """Targets with different intervals should be scanned independently."""
         pid_path = tmp_path / "watcher.pid"
@@ -391,3 +412,183 @@ class TestWatcherAlertIntegration:
         # Second cycle should skip (9999s interval not elapsed)
         watcher._run_single_cycle()
         assert scan_mock.call_count == 0
+
+    def test_new_neighbor_makes_target_due(self, tmp_path):
+        """A netlink 'added' event inside a target triggers an early scan."""
+        from bigr.scanner.netlink import Neighbor, NeighborEvent
+
+        scan_mock = MagicMock(return_value=[])
+        watcher = WatcherDaemon(
+            targets=[
+                {"subnet": "10.0.0.0/24", "interval_seconds": 9999},
+                {"subnet": "10.0.1.0/24", "interval_seconds": 9999},
+            ],
+            bigr_dir=tmp_path,
+            pid_path=tmp_path / "watcher.pid",
+            log_path=tmp_path / "watcher.log",
+            scan_func=scan_mock,
+        )
+        watcher._run_single_cycle()
+        scan_mock.reset_mock()
+
+        neighbor = Neighbor("10.0.1.7", "aa:bb:cc:dd:ee:07", 2, "eth0", "reachable", 2)
+        watcher._on_neighbor_event(NeighborEvent("removed", neighbor))
+        watcher._run_single_cycle()
+        assert scan_mock.call_count == 0
+
+        watcher._on_neighbor_event(NeighborEvent("added", neighbor))
+        watcher._run_single_cycle()
+        scan_mock.assert_called_once_with("10.0.1.0/24")
+
+
+# ---------------------------------------------------------------------------
+# TestWatcherScheduler
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def run_loop_in_thread():
+    """Run a watcher's _run_loop in a thread without mDNS/netlink side effects."""
+    import threading
+
+    started: list[tuple[WatcherDaemon, threading.Thread]] = []
+
+    def _start(watcher: WatcherDaemon) -> WatcherDaemon:
+        watcher._running = True
+        thread = threading.Thread(target=watcher._run_loop, daemon=True)
+        thread.start()
+        started.append((watcher, thread))
+        return watcher
+
+    with patch("bigr.scanner.mdns.start_mdns_listener"), \
+            patch("bigr.scanner.mdns.stop_mdns_listener"), \
+            patch("bigr.scanner.netlink.NeighborMonitor"):
+        yield _start
+        for watcher, thread in started:
+            watcher.stop()
+            thread.join(timeout=5)
+
+
+def _wait_for(predicate, timeout: float = 3.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestWatcherScheduler:
+    """Heap-driven scheduling with concurrent workers."""
+
+    def _watcher(self, tmp_path, targets, scan_func, **kwargs) -> WatcherDaemon:
+        return WatcherDaemon(
+            targets=targets,
+            bigr_dir=tmp_path,
+            pid_path=tmp_path / "watcher.pid",
+            log_path=tmp_path / "watcher.log",
+            scan_func=scan_func,
+            **kwargs,
+        )
+
+    def test_slow_target_does_not_block_others(self, tmp_path, run_loop_in_thread):
+        import threading
+
+        release = threading.Event()
+        calls: list[str] = []
+
+        def scan(subnet):
+            calls.append(subnet)
+            if subnet == "10.0.0.0/22":
+                release.wait(5)
+            return []
+
+        watcher = run_loop_in_thread(self._watcher(
+            tmp_path,
+            [
+                {"subnet": "10.0.0.0/22", "interval_seconds": 60},
+                {"subnet": "10.1.0.0/24", "interval_seconds": 0.05},
+            ],
+            scan, max_workers=2, jitter=0,
+        ))
+
+        assert _wait_for(lambda: calls.count("10.1.0.0/24") >= 3)
+        assert calls.count("10.0.0.0/22") == 1
+        assert watcher.schedule_stats["in_flight"] == ["10.0.0.0/22"]
+        release.set()
+
+    def test_overrun_counts_missed_deadlines(self, tmp_path, run_loop_in_thread):
+        def scan(subnet):
+            time.sleep(0.25)
+            return []
+
+        watcher = run_loop_in_thread(self._watcher(
+            tmp_path, [{"subnet": "10.0.0.0/24", "interval_seconds": 0.1}], scan, jitter=0,
+        ))
+
+        assert _wait_for(lambda: watcher.schedule_stats["missed_deadlines"] >= 2)
+        stats = watcher.schedule_stats["targets"]["10.0.0.0/24"]
+        assert stats["runs"] >= 1
+        assert stats["interval_seconds"] == 0.1
+
+    def test_request_scan_wakes_loop(self, tmp_path, run_loop_in_thread):
+        scan_mock = MagicMock(return_value=[])
+        watcher = run_loop_in_thread(self._watcher(
+            tmp_path, [{"subnet": "10.0.0.0/24", "interval_seconds": 3600}], scan_mock, jitter=0,
+        ))
+        assert _wait_for(lambda: scan_mock.call_count == 1)
+
+        watcher.request_scan("10.0.0.0/24")
+
+        assert _wait_for(lambda: scan_mock.call_count == 2)
+        next_due = watcher.schedule_stats["targets"]["10.0.0.0/24"]["next_due_at"]
+        assert next_due > time.time() + 3000
+
+    def test_request_scan_during_regular_slot(self, tmp_path, run_loop_in_thread):
+        import threading
+
+        release = threading.Event()
+        calls: list[str] = []
+
+        def scan(subnet):
+            calls.append(subnet)
+            if len(calls) == 2:
+                release.wait(5)  # the one-off scan overlaps the next slot
+            return []
+
+        watcher = run_loop_in_thread(self._watcher(
+            tmp_path, [{"subnet": "10.0.0.0/24", "interval_seconds": 0.2}], scan, jitter=0,
+        ))
+        assert _wait_for(lambda: len(calls) == 1 and not watcher.schedule_stats["in_flight"])
+
+        watcher.request_scan("10.0.0.0/24")
+        assert _wait_for(lambda: len(calls) == 2)
+        time.sleep(0.3)  # the regular slot comes due while the one-off runs
+        release.set()
+
+        assert _wait_for(lambda: len(calls) >= 4)
+        assert watcher.schedule_stats["targets"]["10.0.0.0/24"]["next_due_at"] is not None
+
+    def test_jitter_bounds(self, tmp_path):
+        watcher = self._watcher(tmp_path, [], MagicMock(), jitter=0.1)
+        offsets = [watcher._jittered(1000.0, 60) - 1000.0 for _ in range(200)]
+        assert all(0 <= o <= 6 for o in offsets)
+        assert max(offsets) > 0
+
+    def test_single_cycle_runs_due_targets_concurrently(self, tmp_path):
+        import threading
+
+        barrier = threading.Barrier(3, timeout=2)
+
+        def scan(subnet):
+            barrier.wait()  # only passes if all three run at once
+            return []
+
+        watcher = self._watcher(
+            tmp_path,
+            [{"subnet": f"10.0.{i}.0/24", "interval_seconds": 60} for i in range(3)],
+            scan, max_workers=3,
+        )
+        watcher._run_single_cycle()
+
+        assert watcher.scan_count == 3
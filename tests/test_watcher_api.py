@@ -118,3 +118,25 @@ class TestWatcherAPI:
         assert resp.status_code == 200
         data = resp.json()
         assert data["status"] == "not_running"
+
+    def test_schedule_no_watcher(self, client):
+        resp = client.get("/api/watcher/schedule")
+        assert resp.status_code == 200
+        assert resp.json()["targets"] == {}
+
+    def test_schedule_reports_missed_deadlines(self, client, tmp_path):
+        from bigr.watcher import WatcherDaemon
+
+        watcher = WatcherDaemon(
+            targets=[{"subnet": "10.0.0.0/24", "interval_seconds": 60}],
+            bigr_dir=tmp_path,
+            scan_func=MagicMock(return_value=[]),
+            max_workers=2,
+        )
+        watcher._record_dispatch("10.0.0.0/24", 4.5)
+        set_watcher(watcher)
+
+        data = client.get("/api/watcher/schedule").json()
+        assert data["max_workers"] == 2
+        assert data["missed_deadlines"] == 1
+        assert data["targets"]["10.0.0.0/24"]["max_lag_seconds"] == 4.5